@@ -99,10 +99,11 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			"volumeAdjust" : "boolean(default=True)",
 		}
 		self.simulation = libaudioverse.Simulation(block_size = 1024)
-		self.make_sound_objects()
+		# Let play_object set properties without waiting for the block being mixed.
+		self.simulation.queue_property_writes = True
 		self.hrtf_panner = libaudioverse.HrtfNode(self.simulation, "default")
-		self.hrtf_panner.should_crossfade = False
 		self.hrtf_panner.connect_simulation(0)
+		self.make_sound_objects()
 		# Hook to keep NVDA from announcing roles.
 		self._NVDA_getSpeechTextForProperties = speech.getSpeechTextForProperties
 		speech.getSpeechTextForProperties = self._hook_getSpeechTextForProperties
@@ -124,6 +125,9 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			buffer = libaudioverse.Buffer(self.simulation)
 			buffer.load_from_file(path)
 			libaudioverse_object.buffer = buffer
+			# Sounds stay connected and are paused until played, so that playing one is only property writes.
+			libaudioverse_object.state = libaudioverse.NodeStates.paused
+			libaudioverse_object.connect(0, self.hrtf_panner, 0)
 			sounds[key] = libaudioverse_object
 
 	def shouldNukeRoleSpeech(self):
@@ -186,14 +190,14 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			angle_x = clamp(angle_x, -90.0, 90.0)
 			angle_y = clamp(angle_y, -90.0, 90.0)
 			#In theory, this can be made faster if we remember which is last, but that shouldn't matter here
-			with self.simulation:
-				for i, j in sounds.iteritems():
-					j.disconnect(0)
-				sounds[role].connect(0, self.hrtf_panner, 0)	
-				sounds[role].position = 0.0
-				self.hrtf_panner.azimuth = angle_x
-				self.hrtf_panner.elevation = angle_y
-				self.hrtf_panner.mul =self._compute_volume()
+			#None of these wait for the block being mixed: if the simulation is busy, they're queued for the next one.
+			for i, j in sounds.iteritems():
+				j.state = libaudioverse.NodeStates.paused
+			sounds[role].position = 0.0
+			sounds[role].state = libaudioverse.NodeStates.playing
+			self.hrtf_panner.azimuth = angle_x
+			self.hrtf_panner.elevation = angle_y
+			self.hrtf_panner.mul =self._compute_volume()
 
 	def event_becomeNavigatorObject(self, obj, nextHandler):
 		self.play_object(obj)
@@ -50,6 +50,17 @@ class NoBackendError: public AudioIOError {
 	NoBackendError(): AudioIOError("No audio_io backend is available on the current system.") {}
 };
 
+/**What an output device knows about its own timing.  Times are in seconds.*/
+class OutputDeviceStatistics {
+	public:
+	//The latency the device is aiming for, and the bounds it keeps it within.
+	//Underruns raise min_latency.
+	double predicted_latency = 0.0, min_latency = 0.0, max_latency = 0.0;
+	int underruns = 0;
+	//How long recent passes took, including calling the callback, oldest first.
+	std::vector<double> callback_times;
+};
+
 /**A physical output.*/
 class OutputDevice {
 	public:
@@ -57,6 +68,8 @@ class OutputDevice {
 	//These are usually accessed via shared pointers. This function makes sure that the output device is stopped, blocking until it stops.
 	//TODO: we need to be able to restart them.
 	virtual void stop() = 0;
+	//Safe to call from any thread.  Backends which don't measure anything return zeros.
+	virtual OutputDeviceStatistics getStatistics() { return OutputDeviceStatistics(); }
 };
 
 class OutputDeviceFactory {
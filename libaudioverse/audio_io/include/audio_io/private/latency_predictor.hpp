@@ -1,4 +1,6 @@
+#include <audio_io/audio_io.hpp>
 #include <chrono>
+#include <mutex>
 namespace audio_io {
 namespace implementation {
 
@@ -24,6 +26,8 @@ class LatencyPredictor {
 	double predictLatency();
 	//Uses predictLatency.
 	int predictLatencyInBlocks(int blockFrames, int sr);
+	//Safe to call from any thread.
+	OutputDeviceStatistics getStatistics();
 	private:
 	void doPrediction();
 	double* history;
@@ -31,6 +35,10 @@ class LatencyPredictor {
 	double min_allowed_latency, max_allowed_latency;
 	double last_predicted_latency;
 	std::chrono::high_resolution_clock::time_point pass_start_time;
+	//The history starts full of the start latency, so we count passes to know how much of it was measured.
+	int passes = 0, underruns = 0;
+	//Protects everything for getStatistics.  Only the device's thread ever writes.
+	std::mutex mutex;
 };
 
 }
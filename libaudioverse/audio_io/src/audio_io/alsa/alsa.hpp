@@ -18,6 +18,7 @@ class AlsaOutputDevice: public OutputDeviceImplementation {
 	AlsaOutputDevice(std::function<void(float*, int)> callback, std::string name, int sr, int channels, int blockSize, float minLatency, float startLatency, float maxLatency);
 	~AlsaOutputDevice();
 	void stop();
+	OutputDeviceStatistics getStatistics() override;
 	private:
 	void workerThreadFunction();
 	std::thread worker_thread;
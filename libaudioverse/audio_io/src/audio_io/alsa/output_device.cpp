@@ -120,6 +120,10 @@ AlsaOutputDevice::~AlsaOutputDevice() {
 	delete latency_predictor;
 }
 
+OutputDeviceStatistics AlsaOutputDevice::getStatistics() {
+	return latency_predictor->getStatistics();
+}
+
 void AlsaOutputDevice::stop() {
 	if(stopped == false) {
 		if(worker_thread.joinable()) {
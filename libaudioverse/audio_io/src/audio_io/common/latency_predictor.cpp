@@ -1,6 +1,7 @@
 #include <audio_io/private/latency_predictor.hpp>
 #include <chrono>
 #include <algorithm>
+#include <mutex>
 #include <math.h>
 
 namespace audio_io {
@@ -24,12 +25,16 @@ void LatencyPredictor::beginPass() {
 void LatencyPredictor::endPass() {
 	auto delta = std::chrono::high_resolution_clock::now()-pass_start_time;
 	double timeInSeconds = delta.count()*decltype(delta)::period::num/(double)decltype(delta)::period::den;
+	std::lock_guard<std::mutex> guard(mutex);
+	passes++;
 	history[write_pointer] = timeInSeconds;
 	write_pointer = (write_pointer + 1)%history_length;
 	doPrediction();
 }
 
 void LatencyPredictor::hadUnderrun() {
+	std::lock_guard<std::mutex> guard(mutex);
+	underruns++;
 	double proposed = latency_increment_for_underrun+last_predicted_latency;
 	if(proposed > max_allowed_latency) proposed = max_allowed_latency;
 	min_allowed_latency = proposed;
@@ -53,6 +58,18 @@ int LatencyPredictor::predictLatencyInBlocks(int blockFrames, int sr) {
 	return blocks;
 }
 
+OutputDeviceStatistics LatencyPredictor::getStatistics() {
+	std::lock_guard<std::mutex> guard(mutex);
+	OutputDeviceStatistics stats;
+	stats.predicted_latency = last_predicted_latency;
+	stats.min_latency = min_allowed_latency;
+	stats.max_latency = max_allowed_latency;
+	stats.underruns = underruns;
+	int measured = std::min(passes, history_length);
+	for(int i = measured; i > 0; i--) stats.callback_times.push_back(history[(write_pointer-i+history_length)%history_length]);
+	return stats;
+}
+
 void LatencyPredictor::doPrediction() {
 	/*Rationale:
 	The maximum is close to the average callback time if there is not a spike.
@@ -113,6 +113,10 @@ WasapiOutputDevice::~WasapiOutputDevice() {
 	delete latency_predictor;
 }
 
+OutputDeviceStatistics WasapiOutputDevice::getStatistics() {
+	return latency_predictor->getStatistics();
+}
+
 void WasapiOutputDevice::stop() {
 	if(stopped) return;
 	logInfo("Wasapi device shutting down.");
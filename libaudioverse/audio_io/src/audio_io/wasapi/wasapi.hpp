@@ -27,6 +27,7 @@ class WasapiOutputDevice: public OutputDeviceImplementation {
 	WasapiOutputDevice(std::function<void(float*, int)> callback, std::shared_ptr<IMMDevice> device, int inputFrames, int inputChannels, int inputSr, double minLatency, double startLatency, double maxLatency);
 	~WasapiOutputDevice();
 	void stop() override;
+	OutputDeviceStatistics getStatistics() override;
 	private:
 	void wasapiMixingThreadFunction();
 	std::thread wasapi_mixing_thread;
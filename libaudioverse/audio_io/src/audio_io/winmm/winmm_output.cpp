@@ -67,6 +67,7 @@ class WinmmOutputDevice: public  OutputDeviceImplementation {
 	WinmmOutputDevice(std::function<void(float*, int)> getBuffer, unsigned int blockSize, unsigned int channels, unsigned int maxChannels, UINT_PTR which, unsigned int sourceSr, unsigned int targetSr, float minLatency, float startLatency, float maxLatency);
 	~WinmmOutputDevice();
 	void stop() override;
+	OutputDeviceStatistics getStatistics() override;
 	void winmm_mixer();
 	//Allocates or gets a recycled buffer from the unneeded queue.
 	std::tuple<WAVEHDR*, short*> getWinmmBuffer();
@@ -125,6 +126,10 @@ WinmmOutputDevice::~WinmmOutputDevice() {
 	stop();
 }
 
+OutputDeviceStatistics WinmmOutputDevice::getStatistics() {
+	return latency_predictor.getStatistics();
+}
+
 void WinmmOutputDevice::stop() {
 	if(stopped) return;
 	logInfo("Winmm device shutting down.");
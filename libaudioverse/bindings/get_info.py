@@ -15,6 +15,9 @@ compiler_cxx_flags: Flags used with C++ files.
 linker_flags: Flags for the linker.
 build_type: The build type.
 root_dir: Absolute path to the root of the repository.
+
+Parsing the headers is slow, so the parsed headers and metadata are cached in build/get_info_cache.pickle.
+The cache is keyed by hashes of the headers and of the .y files: touching metadata only reloads the metadata, and touching headers reparses everything.
 """
 
 from pycparser import *
@@ -29,8 +32,13 @@ from . import metadata_handler
 import copy
 import os
 import re
+import glob
+import hashlib
+import pickle
 
 all_info_cache=None
+#Bump this if the format of the cached data changes in a way that the hashes below won't notice.
+disk_cache_version = 1
 
 #this is a helper class representing a type.
 #base is int, etc.
@@ -115,6 +123,57 @@ def make_ast():
     ast = parser.parse(text)
     return ast
 
+def hash_files(paths):
+    """Hash the names and contents of the specified files.  The files are sorted first, so order doesn't matter."""
+    hasher = hashlib.sha256()
+    for path in sorted(paths):
+        hasher.update(os.path.relpath(path, get_root_directory()).replace('\\', '/').encode('utf8'))
+        with open(path, 'rb') as f:
+            hasher.update(hashlib.sha256(f.read()).digest())
+    return hasher.hexdigest()
+
+def compute_cache_keys():
+    """Returns (header_key, metadata_key).
+    The header key covers everything that goes into the AST, including this module.
+    The metadata key additionally covers the .y files and the metadata handler, so that metadata can be reloaded without reparsing."""
+    root_directory = get_root_directory()
+    bindings_directory = os.path.join(root_directory, 'bindings')
+    headers = glob.glob(os.path.join(root_directory, 'include', 'libaudioverse', '*.h'))
+    headers.append(os.path.join(bindings_directory, 'get_info.py'))
+    header_key = "{}-{}-{}".format(disk_cache_version, sys.version_info[0], hash_files(headers))
+    yaml_files = glob.glob(os.path.join(root_directory, 'metadata', '*.y')) + glob.glob(os.path.join(root_directory, 'metadata', 'nodes', '*.y'))
+    yaml_files.append(os.path.join(bindings_directory, 'metadata_handler.py'))
+    metadata_key = header_key + "-" + hash_files(yaml_files)
+    return header_key, metadata_key
+
+def get_disk_cache_path():
+    return os.path.join(get_root_directory(), "build", "get_info_cache.pickle")
+
+def load_disk_cache():
+    """Returns the cache as a dict, or an empty dict if there isn't a usable one."""
+    try:
+        with open(get_disk_cache_path(), 'rb') as f:
+            cache = pickle.load(f)
+    except Exception:
+        #Missing, truncated, or pickled by an incompatible version of something.  Either way, rebuild it.
+        return dict()
+    return cache if isinstance(cache, dict) else dict()
+
+def save_disk_cache(cache):
+    path = get_disk_cache_path()
+    if not os.path.isdir(os.path.dirname(path)):
+        return
+    #Write to a temporary file and rename, so that concurrent builds never see half a cache.
+    temporary_path = path + ".{}.tmp".format(os.getpid())
+    with open(temporary_path, 'wb') as f:
+        pickle.dump(cache, f, protocol = 2)
+    try:
+        os.rename(temporary_path, path)
+    except OSError:
+        #Windows won't rename over an existing file.
+        os.remove(path)
+        os.rename(temporary_path, path)
+
 def extract_enums(ast):
     """Returns a dict of enum constant names to their values as integers."""
     #we don't allow declaring nested types, so we know that all enums are at the top level-that is, they are to be found in ast.ext.
@@ -192,11 +251,8 @@ def extract_functions(ast, typedefs):
         functions[name] = compute_function_info(func = function.type, typedefs =typedefs, name= name)
     return functions
 
-def get_all_info():
-    global all_info_cache
-    if all_info_cache is not None:
-        return copy.deepcopy(all_info_cache)
-
+def compute_header_info():
+    """Everything which comes from parsing binding.h."""
     ast=make_ast()
     constants_by_enum = extract_enums(ast=ast)
     constants = collections.OrderedDict()
@@ -212,14 +268,32 @@ def get_all_info():
 
     typedefs = extract_typedefs(ast)
     #export this in one dict so that we have a way to add it to parent scripts.
-    all_info = {
+    return {
     'functions' : extract_functions(ast = ast, typedefs = typedefs),
     'typedefs': typedefs,
     'constants' : constants,
     'constants_by_enum': constants_by_enum
     }
 
-    metadata = metadata_handler.make_metadata(all_info)
+def get_all_info():
+    global all_info_cache
+    if all_info_cache is not None:
+        return copy.deepcopy(all_info_cache)
+
+    header_key, metadata_key = compute_cache_keys()
+    disk_cache = load_disk_cache()
+    if disk_cache.get('header_key') == header_key:
+        all_info = disk_cache['header_info']
+    else:
+        all_info = compute_header_info()
+        disk_cache = {'header_key': header_key, 'header_info': copy.deepcopy(all_info)}
+    if disk_cache.get('metadata_key') == metadata_key:
+        metadata = disk_cache['metadata']
+    else:
+        metadata = metadata_handler.make_metadata(all_info)
+        disk_cache['metadata_key'] = metadata_key
+        disk_cache['metadata'] = copy.deepcopy(metadata)
+        save_disk_cache(disk_cache)
     all_info['metadata'] = metadata
 
     #We can extract the "important" enums by looking for all properties with a value_enum key and grabbing its value.
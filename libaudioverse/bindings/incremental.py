@@ -0,0 +1,155 @@
+"""Incremental, parallel rendering of Jinja2 templates.
+
+Generators describe their outputs as a dict of output names to template names, and provide a module-level setup function which turns an all_info dict into a Jinja2 environment and a context.
+The inputs of an output are the sources of its template and of everything that template includes or imports, the values of the context variables those templates reference, and the Python code that builds the context.
+Outputs whose inputs hash the same as last time are read back from build/codegen_cache instead of being rendered.
+If more than one output is stale, they are rendered in a process pool.
+
+Every render is recorded in timings; scripts print these when passed --timings.
+"""
+import os
+import os.path
+import glob
+import copy
+import hashlib
+import json
+import pickle
+import time
+import multiprocessing
+import jinja2
+from jinja2 import meta
+from . import get_info
+
+#Tuples of (generator, template, status, seconds).
+timings = []
+
+def get_cache_directory(name):
+    return os.path.join(get_info.get_root_directory(), "build", "codegen_cache", name)
+
+def template_dependencies(env, template_name):
+    """Returns (sources, variables): the (name, source) pairs for the template and everything it pulls in, and the context variables they reference.
+    Returns (None, None) if a template is included by a computed name, which we can't follow."""
+    sources = []
+    variables = set()
+    pending = [template_name]
+    seen = set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        source = env.loader.get_source(env, name)[0]
+        ast = env.parse(source)
+        sources.append((name, source))
+        variables |= meta.find_undeclared_variables(ast)
+        for i in meta.find_referenced_templates(ast):
+            if i is None:
+                return None, None
+            pending.append(i)
+    return sorted(sources), sorted(variables)
+
+def compute_key(env, context, template_name, code_hash):
+    """Hash everything an output depends on.  Returns None if the output must always be rendered."""
+    sources, variables = template_dependencies(env, template_name)
+    if sources is None:
+        return None
+    hasher = hashlib.sha256()
+    hasher.update(code_hash.encode('utf8'))
+    for name, source in sources:
+        hasher.update(name.encode('utf8'))
+        hasher.update(source.encode('utf8'))
+    for name in variables:
+        value = context.get(name, None)
+        #Filters and helper functions are covered by code_hash.
+        if callable(value):
+            continue
+        hasher.update(name.encode('utf8'))
+        try:
+            hasher.update(pickle.dumps(value, protocol = 2))
+        except Exception:
+            return None
+    return hasher.hexdigest()
+
+def compute_code_hash(extra_code):
+    """The bindings package and any generator-specific files."""
+    bindings_directory = os.path.split(os.path.abspath(__file__))[0]
+    code = glob.glob(os.path.join(bindings_directory, "*.py")) + list(extra_code)
+    return get_info.hash_files([os.path.abspath(i) for i in code])
+
+#The setup function's result, in worker processes.
+worker_state = None
+
+def initialize_worker(setup, info):
+    global worker_state
+    worker_state = setup(info)
+
+def render_one(env, context, output, template_name):
+    start = time.time()
+    text = env.get_template(template_name).render(context)
+    return output, text, time.time()-start
+
+def render_in_worker(job):
+    env, context = worker_state
+    return render_one(env, context, *job)
+
+def render_templates(name, setup, info, templates, extra_code = (), processes = None):
+    """Render templates, a dict of output names to template names, and return a dict of output names to rendered text.
+    name is the generator's name, used for the cache directory and in timings.
+    setup must be a module-level function which accepts all_info and returns (environment, context).  It may modify all_info.  Worker processes call it again.
+    extra_code is a list of Python files which should invalidate every output when they change, usually the generator itself.
+    processes is the size of the pool, defaulting to the number of CPUs. 1 renders everything in this process."""
+    env, context = setup(copy.deepcopy(info))
+    code_hash = compute_code_hash(extra_code)
+    cache_directory = get_cache_directory(name)
+    manifest_path = os.path.join(cache_directory, "manifest.json")
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (IOError, OSError, ValueError):
+        manifest = dict()
+    results = dict()
+    keys = dict()
+    stale = []
+    for output, template_name in sorted(templates.items()):
+        key = compute_key(env, context, template_name, code_hash)
+        cached_path = os.path.join(cache_directory, hashlib.sha256(output.encode('utf8')).hexdigest())
+        if key is not None and manifest.get(output) == key and os.path.exists(cached_path):
+            with open(cached_path, 'rb') as f:
+                results[output] = f.read().decode('utf8')
+            timings.append((name, template_name, "cached", 0.0))
+        else:
+            keys[output] = key
+            stale.append((output, template_name))
+    if len(stale) > 1 and processes != 1:
+        pool = multiprocessing.Pool(processes = min(len(stale), processes or multiprocessing.cpu_count()),
+            initializer = initialize_worker, initargs = (setup, info))
+        try:
+            rendered = pool.map(render_in_worker, stale)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        rendered = [render_one(env, context, output, template_name) for output, template_name in stale]
+    if rendered and not os.path.exists(cache_directory):
+        os.makedirs(cache_directory)
+    for output, text, seconds in rendered:
+        results[output] = text
+        timings.append((name, templates[output], "rendered", seconds))
+        if keys[output] is None:
+            manifest.pop(output, None)
+            continue
+        with open(os.path.join(cache_directory, hashlib.sha256(output.encode('utf8')).hexdigest()), 'wb') as f:
+            f.write(text.encode('utf8'))
+        manifest[output] = keys[output]
+    if rendered:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent = 4, sort_keys = True)
+    return results
+
+def print_timings():
+    """Print how long every template took, slowest first."""
+    total = 0.0
+    for generator, template, status, seconds in sorted(timings, key = lambda x: -x[3]):
+        print("{:<12}{:<40}{:<10}{:.3f}s".format(generator, template, status, seconds))
+        total += seconds
+    print("{} templates, {} rendered, {:.3f}s rendering.".format(len(timings), len([i for i in timings if i[2] == "rendered"]), total))
@@ -1,10 +1,11 @@
 import jinja2
 from collections import OrderedDict
 import re
-from .. import transformers, get_info, doc_helper
+from .. import transformers, get_info, doc_helper, incremental
 from . import doc_filters
 import os
 import os.path
+import glob
 import subprocess
 import sys
 import platform
@@ -46,6 +47,31 @@ def ctypes_function_helper(func, typedef_prefix):
     argstr = ", ".join([retstr] + [ctypes_string(i.type, 0, typedef_prefix) for i in func.args])
     return "ctypes.CFUNCTYPE(" + argstr + ")"
 
+#Types which the cffi backend can pass by value.  Pointers to all of these but the typedefs are treated as arrays.
+cffi_scalar_types = {'int', 'unsigned int', 'float', 'double', 'LavError', 'LavHandle'}
+
+def cffi_eligible(func):
+    """True if every argument of func can go through the cffi backend.
+    Callbacks and void pointers stay on ctypes because the rest of the bindings build their callbacks with ctypes."""
+    for arg in func.args:
+        t = arg.type
+        if isinstance(t.base, get_info.FunctionInfo):
+            return False
+        if 'destination' in arg.name:
+            if (t.indirection == 1 and t.base in cffi_scalar_types) or (t.indirection == 2 and t.base == 'char'):
+                continue
+            return False
+        if t.indirection == 0 and t.base in cffi_scalar_types:
+            continue
+        if t.indirection == 1 and t.base in {'char', 'int', 'unsigned int', 'float', 'double', 'LavHandle'}:
+            continue
+        return False
+    return True
+
+def cffi_type(typeinfo, offset = 0):
+    """The C spelling of a type for ffi.new and ffi.cast, less offset levels of indirection."""
+    return (typeinfo.base+" "+"*"*(typeinfo.indirection-offset)).strip()
+
 def post_generate(dir):
     """Make a wheel and build docs if running in Windows."""
     if platform.system() == 'Windows':
@@ -62,9 +88,8 @@ def post_generate(dir):
     else:
         print("Python bindings: Running on a non-windows platform. Skipping wheel and docs generation.")
 
-def make_python(info):
-    #get our directory.
-    source_dir = os.path.split(__file__)[0]
+def setup_environment(info):
+    """Build the Jinja2 environment and context for the templates.  This runs once per worker when rendering in parallel."""
     #prepare our docs:
     doc_helper.prepare_docs(info,
     node=doc_filters.node, param=doc_filters.param, enum = doc_filters.enum,
@@ -79,11 +104,22 @@ def make_python(info):
     env = jinja2.Environment(loader = jinja2.PackageLoader(__package__, ""), undefined = jinja2.StrictUndefined, trim_blocks = True)
     env.filters.update(transformers.get_jinja2_filters(info))
     env.filters['ctypes_string'] = ctypes_string
-    return {
-        'libaudioverse/_lav.py' : env.get_template('libaudioverse/_lav.py.t').render(context).encode('utf8'),
-        'libaudioverse/_libaudioverse.py' : env.get_template('libaudioverse/_libaudioverse.py.t').render(context).encode('utf8'),
-        'libaudioverse/__init__.py': env.get_template('libaudioverse/__init__.py.t').render(context).encode('utf8'),
-        'setup.py': env.get_template('setup.py.t').render(context).encode('utf8'),
+    env.filters['cffi_type'] = cffi_type
+    env.tests['cffi_eligible'] = cffi_eligible
+    return env, context
+
+def make_python(info):
+    #get our directory.
+    source_dir = os.path.split(__file__)[0]
+    rendered = incremental.render_templates('python', setup_environment, info, {
+        'libaudioverse/_lav.py': 'libaudioverse/_lav.py.t',
+        'libaudioverse/_libaudioverse.py': 'libaudioverse/_libaudioverse.py.t',
+        'libaudioverse/_cffi_bindings.py': 'libaudioverse/_cffi_bindings.py.t',
+        'libaudioverse/__init__.py': 'libaudioverse/__init__.py.t',
+        'setup.py': 'setup.py.t',
+    }, extra_code = glob.glob(os.path.join(source_dir, "*.py")))
+    files = dict((name, text.encode('utf8')) for name, text in rendered.items())
+    files.update({
         'setup.cfg': open(os.path.join(source_dir, 'setup.cfg'), 'rb').read(),
         'README.rst': pypandoc.convert(os.path.join(info['root_dir'], 'readme.md'), 'rst').encode("utf8"),
         'dll_location': 'libaudioverse',
@@ -93,4 +129,5 @@ def make_python(info):
             'docs',
         ],
         'post_generate': post_generate,
-    }
+    })
+    return files
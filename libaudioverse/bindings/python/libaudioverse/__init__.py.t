@@ -6,12 +6,20 @@ from __future__ import absolute_import
 from . import _lav
 from . import _libaudioverse
 import weakref
+import array
 import collections
+try:
+    import collections.abc as collections_abc
+except ImportError:
+    #Python 2 keeps the abstract base classes in collections.
+    collections_abc = collections
+import concurrent.futures
 import ctypes
 import enum
 import functools
 import threading
 import logging
+import six
 import six.moves
 import glob
 import os.path
@@ -144,6 +152,27 @@ class _CallbackWrapper(object):
         if self.remove_from_set:
             self.remove_from_set.remove(self)
 
+#Callbacks for loads in progress, which must live until Libaudioverse calls them.
+_pending_buffer_loads = set()
+_pending_buffer_loads_lock = threading.Lock()
+
+class _BufferLoadedCallback(object):
+
+    def __init__(self, buffer, future):
+        self.buffer = buffer
+        self.future = future
+
+    def __call__(self, handle, error, userdata):
+        try:
+            if error == _libaudioverse.Lav_ERROR_NONE:
+                self.future.set_result(self.buffer)
+            else:
+                #We're on the thread that recorded the error, so the exception can find its message.
+                self.future.set_exception(_lav.make_error_from_code(error))
+        finally:
+            with _pending_buffer_loads_lock:
+                _pending_buffer_loads.discard(self)
+
 class DeviceInfo(object):
     r"""Represents info on a audio device.
     
@@ -168,6 +197,147 @@ def enumerate_devices():
         infos.append(info)
     return infos
 
+def get_buffer_cache_stats():
+    r"""Returns a dict describing the process-wide cache of decoded files used by Buffer.load_from_file.
+
+    The keys are hits, misses, evictions, entries, megabytes and limit.  Megabytes and limit are in megabytes.
+
+    Wraps Lav_bufferCacheGetStatistics and Lav_bufferCacheGetLimit."""
+    hits, misses, evictions, entries, megabytes = _lav.buffer_cache_get_statistics()
+    return {
+        'hits': hits,
+        'misses': misses,
+        'evictions': evictions,
+        'entries': entries,
+        'megabytes': megabytes,
+        'limit': _lav.buffer_cache_get_limit(),
+    }
+
+def set_buffer_cache_limit(megabytes):
+    r"""Set the most memory the buffer cache may hold.  0 keeps nothing that isn't in use.
+
+    Wraps Lav_bufferCacheSetLimit."""
+    _lav.buffer_cache_set_limit(megabytes)
+
+def clear_buffer_cache():
+    r"""Drop everything held by the buffer cache.  Buffers keep the data they are using.
+
+    Wraps Lav_bufferCacheClear."""
+    _lav.buffer_cache_clear()
+
+def set_buffer_cache_dir(path):
+    r"""Keep decoded files in a directory, so that later processes map them instead of decoding them again.
+    
+    Files are stored at the simulation's sampling rate and reused only if the source's path, size and modification time still match.
+    Pass None to stop using the directory.  The directory is created if needed.
+    Nothing removes old files automatically; call trim_buffer_cache_dir, for example at startup.
+    
+    Wraps Lav_bufferCacheSetDirectory."""
+    _lav.buffer_cache_set_directory(path if path is not None else "")
+
+def trim_buffer_cache_dir(megabytes):
+    r"""Delete the least recently used files in the buffer cache directory until it holds at most megabytes.  Returns the megabytes freed.
+    
+    Wraps Lav_bufferCacheTrimDirectory."""
+    return _lav.buffer_cache_trim_directory(megabytes)
+
+def get_hrtf_cache_stats():
+    r"""Returns a dict describing the caches of HRTF responses, summed over every loaded dataset.
+
+    The keys are hits, misses, hit_rate, evictions, entries, limit and quantization.  Hit_rate is hits over lookups, or 0.0 before the first lookup.  Quantization is in degrees.
+
+    Wraps Lav_hrtfCacheGetStatistics, Lav_hrtfCacheGetLimit and Lav_hrtfCacheGetQuantization."""
+    hits, misses, evictions, entries = _lav.hrtf_cache_get_statistics()
+    lookups = hits+misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': float(hits)/lookups if lookups else 0.0,
+        'evictions': evictions,
+        'entries': entries,
+        'limit': _lav.hrtf_cache_get_limit(),
+        'quantization': _lav.hrtf_cache_get_quantization(),
+    }
+
+def set_hrtf_cache_limit(entries):
+    r"""Set the most angles each HRTF dataset caches responses for.  0 disables the cache.
+
+    Wraps Lav_hrtfCacheSetLimit."""
+    _lav.hrtf_cache_set_limit(entries)
+
+def set_hrtf_cache_quantization(degrees):
+    r"""Set the step in degrees to which angles are rounded before looking up HRTF responses.  0 disables the cache.
+
+    Wraps Lav_hrtfCacheSetQuantization."""
+    _lav.hrtf_cache_set_quantization(degrees)
+
+def clear_hrtf_cache():
+    r"""Drop every cached HRTF response.
+
+    Wraps Lav_hrtfCacheClear."""
+    _lav.hrtf_cache_clear()
+
+def preload_hrtf(path = "default", sample_rate = 44100):
+    r"""Load an HRTF dataset for simulations at sample_rate and keep it loaded until unpin_hrtf.
+
+    Nodes share one copy of each dataset, which is otherwise freed with the last node using it.  Call this at startup to avoid loading and resampling the dataset while creating panners later.
+
+    Wraps Lav_hrtfPreload."""
+    _lav.hrtf_preload(path, sample_rate)
+
+def unpin_hrtf(path = "default", sample_rate = 44100):
+    r"""Let a dataset loaded with preload_hrtf be freed once no node is using it.
+
+    Wraps Lav_hrtfUnpin."""
+    _lav.hrtf_unpin(path, sample_rate)
+
+def get_kernel_backends():
+    r"""Returns the names of the kernel backends this processor supports, least capable first.
+
+    Wraps Lav_kernelsGetBackendCount and Lav_kernelsGetBackendName."""
+    return [_lav.kernels_get_backend_name(i) for i in six.moves.range(_lav.kernels_get_backend_count())]
+
+def get_kernel_backend():
+    r"""Returns the name of the kernel backend in use, one of get_kernel_backends().
+
+    Wraps Lav_kernelsGetBackend."""
+    return _lav.kernels_get_backend()
+
+def set_kernel_backend(name):
+    r"""Use a different kernel backend for the whole process.  Initialization picks the most capable one.
+
+    Wraps Lav_kernelsSetBackend."""
+    _lav.kernels_set_backend(name)
+
+def _contiguous_view(value, formats):
+    """Returns a flat memoryview of value if it is a C-contiguous buffer of 4-byte items in one of formats, otherwise None."""
+    if not six.PY3:
+        return None
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return None
+    if view.format not in formats or view.itemsize != 4 or not view.c_contiguous:
+        return None
+    return view.cast('B').cast(view.format)
+
+def _int32_buffer(value):
+    return _contiguous_view(value, ('i', 'l'))
+
+def _float32_buffer(value):
+    """Returns value as a flat buffer of 32-bit floats, without copying if possible.
+    Sequences of numbers and sequences of sequences of numbers are flattened."""
+    view = _contiguous_view(value, ('f', ))
+    if view is not None:
+        return view
+    flat = array.array('f')
+    for i in value:
+        if isinstance(i, collections_abc.Iterable):
+            flat.extend(i)
+        else:
+            flat.append(i)
+    return flat
+
 @functools.total_ordering
 class _HandleComparer(object):
 
@@ -208,11 +378,34 @@ For full details of this class, see the Libaudioverse manual."""
             self.handle = handle
             self._lock = self._state['lock']
 
-    def set_output_device(self, identifier = "default", channels=2):
+    def set_output_device(self, identifier = "default", channels=2, min_latency = 0.0, start_latency = 0.1, max_latency = 0.2):
         r"""Sets the output device.
-        Use -1 for default system audio. 0 and greater are specific audio devices.
-        To enumerate devices, use enumerate_devices."""
-        _lav.simulation_set_output_device(self, identifier, channels)
+        Use "default" for default system audio. Identifiers from enumerate_devices select specific audio devices.
+        
+        The latencies are in seconds, and are hints: the backend starts at start_latency and then aims just above its recent processing times, staying between min_latency and max_latency.
+        Underruns raise min_latency.  See get_latency_stats.
+        
+        Wraps Lav_simulationSetOutputDeviceWithLatency."""
+        _lav.simulation_set_output_device_with_latency(self, identifier, channels, min_latency, start_latency, max_latency)
+
+    def get_latency_stats(self):
+        r"""Returns a dict describing how the output device is managing latency.  Times are in seconds.
+
+        The keys are latency and latency_blocks (what the device is aiming for, the latter in blocks of this simulation), min_latency and max_latency (the bounds it keeps within), underruns, and callback_times.
+        callback_times lists how long recent passes through the device took, oldest first, including computing the audio.
+        Everything is 0 without an output device.
+
+        Wraps Lav_simulationGetLatencyStatistics and Lav_simulationGetCallbackTime."""
+        with self:
+            latency, latency_blocks, min_latency, max_latency, underruns, callbacks = _lav.simulation_get_latency_statistics(self)
+            return {
+                'latency': latency,
+                'latency_blocks': latency_blocks,
+                'min_latency': min_latency,
+                'max_latency': max_latency,
+                'underruns': underruns,
+                'callback_times': [_lav.simulation_get_callback_time(self, i) for i in six.moves.range(callbacks)],
+            }
 
     def clear_output_device(self):
         r"""Clears the output device, stopping audio and allowing use of get_block again."""
@@ -233,6 +426,58 @@ For full details of this class, see the Libaudioverse manual."""
             _lav.simulation_get_block(self.handle, channels, may_apply_mixing_matrix, buff_ptr)
             return list(buff)
 
+    def render(self, duration = None, frames = None, channels = 2, out = None, may_apply_mixing_matrix = True):
+        r"""Render audio as fast as possible, returning interleaved 32-bit floats.
+
+        Give the length either as duration in seconds or as frames.
+        If out is provided, it must be a writable, contiguous buffer of 32-bit floats with room for at least frames*channels samples, for example a numpy array of dtype float32 or an array.array('f').
+        Audio is written into it directly and it is returned.  Otherwise, a new array.array('f') is returned.
+
+        All whole blocks are computed by one call to Lav_simulationGetBlocks, during which the GIL is released.
+        The simulation only advances by whole blocks: if frames is not a multiple of the block size, the rest of the last block is computed and thrown away.
+        As with get_block, calling this on a simulation configured to output audio is an error."""
+        with self._lock:
+            block_size = _lav.simulation_get_block_size(self.handle)
+            if (duration is None) == (frames is None):
+                raise ValueError("Specify exactly one of duration or frames.")
+            if frames is None:
+                frames = int(round(duration*_lav.simulation_get_sr(self.handle)))
+            samples = frames*channels
+            if out is None:
+                out = array.array('f', [0.0])*samples
+            elif six.PY3 and memoryview(out).format != 'f':
+                raise ValueError("out must contain 32-bit floats.")
+            target = (ctypes.c_float*samples).from_buffer(out)
+            whole_blocks = frames//block_size
+            if whole_blocks:
+                _lav.simulation_get_blocks(self.handle, channels, may_apply_mixing_matrix, whole_blocks, ctypes.cast(target, ctypes.POINTER(ctypes.c_float)))
+            remaining = samples-whole_blocks*block_size*channels
+            if remaining:
+                last = (ctypes.c_float*(block_size*channels))()
+                _lav.simulation_get_blocks(self.handle, channels, may_apply_mixing_matrix, 1, ctypes.cast(last, ctypes.POINTER(ctypes.c_float)))
+                ctypes.memmove(ctypes.addressof(target)+(samples-remaining)*ctypes.sizeof(ctypes.c_float), last, remaining*ctypes.sizeof(ctypes.c_float))
+            return out
+
+    def render_iter(self, duration = None, frames = None, chunk_frames = None, channels = 2, may_apply_mixing_matrix = True):
+        r"""Render audio as fast as possible in chunks, yielding an array.array('f') of interleaved samples for each.
+
+        The total length is given as duration in seconds or as frames.  If neither is given, this renders forever.
+        chunk_frames defaults to one second and is rounded up to a multiple of the block size, so that only the last chunk can be shorter.
+        See render for details."""
+        block_size = _lav.simulation_get_block_size(self.handle)
+        sr = _lav.simulation_get_sr(self.handle)
+        if duration is not None and frames is not None:
+            raise ValueError("Specify at most one of duration or frames.")
+        if duration is not None:
+            frames = int(round(duration*sr))
+        chunk_frames = chunk_frames or sr
+        chunk_frames = (chunk_frames+block_size-1)//block_size*block_size
+        while frames is None or frames > 0:
+            count = chunk_frames if frames is None else min(chunk_frames, frames)
+            yield self.render(frames = count, channels = channels, may_apply_mixing_matrix = may_apply_mixing_matrix)
+            if frames is not None:
+                frames -= count
+
     #context manager support.
     def __enter__(self):
         r"""Lock the simulation."""
@@ -282,17 +527,161 @@ For full details of this class, see the Libaudioverse manual."""
         This function wraps Lav_simulationWriteFile."""
         _lav.simulation_write_file(self, path, channels, duration, may_apply_mixing_matrix)
 
+    @property
+    def time(self):
+        r"""The simulation's time in seconds, which advances by one block every time a block is computed.  Read-only.
+
+        This is the clock BufferNode.play_at and BufferNode.stop_at use.
+        It is not the time passed to block callbacks, which counts from when the callback was set.
+
+        This wraps Lav_simulationGetCurrentTime."""
+        return _lav.simulation_get_current_time(self)
+
     @property
     def threads(self):
-        r"""The number of threads the simulation is using for processing.
+        r"""The number of threads the simulation is using for processing, or "auto".
         
-        This wraps Lav_simulationGetThreads and Lav_simulationSetThreads."""
-        return _lav.simulation_get_threads(self)
+        When set to "auto", Libaudioverse picks the thread count from the measured cost of the graph.  get_planner_stats reports the count it chose.
+        This wraps Lav_simulationGetThreads and Lav_simulationSetThreads, where "auto" is 0."""
+        threads = _lav.simulation_get_threads(self)
+        return "auto" if threads == 0 else threads
         
     @threads.setter
     def threads(self, value):
+        if value == "auto":
+            value = 0
         _lav.simulation_set_threads(self, value)
 
+    def get_planner_stats(self):
+        r"""Returns a dict describing how the simulation has been scheduling its graph.
+
+        The keys are ticks, replans, culled_jobs, threads, time, barrier_wait_time, bins and histograms.
+        bins is a list with a dict per stage of the current schedule, holding ticks, jobs, time, max_time and barrier_wait_time.
+        histograms maps the names of the PlannerHistograms members (width, time and barrier_wait) to lists of counts.
+        If barrier_wait_time is a large part of time*threads, more threads won't help.
+
+        This wraps Lav_simulationGetPlannerStatistics and friends; see the C API documentation for the details."""
+        with self:
+            ticks, replans, bins, culled_jobs, threads, time, barrier_wait_time = _lav.simulation_get_planner_statistics(self)
+            stats = {
+                'ticks': ticks,
+                'replans': replans,
+                'culled_jobs': culled_jobs,
+                'threads': threads,
+                'time': time,
+                'barrier_wait_time': barrier_wait_time,
+                'bins': [],
+                'histograms': dict(),
+            }
+            for i in six.moves.range(bins):
+                bin_ticks, jobs, bin_time, max_time, bin_barrier_wait_time = _lav.simulation_get_planner_bin_statistics(self, i)
+                stats['bins'].append({'ticks': bin_ticks, 'jobs': jobs, 'time': bin_time, 'max_time': max_time, 'barrier_wait_time': bin_barrier_wait_time})
+            for histogram in PlannerHistograms:
+                length = _lav.simulation_get_planner_histogram_length(self, histogram)
+                stats['histograms'][histogram.name] = [_lav.simulation_read_planner_histogram(self, histogram, i) for i in six.moves.range(length)]
+            return stats
+
+    def reset_planner_stats(self):
+        r"""Reset the statistics returned by get_planner_stats."""
+        _lav.simulation_reset_planner_statistics(self)
+
+    @property
+    def profiling(self):
+        r"""Whether nodes record how long they take to process.  Off by default, in which case it costs nothing.
+
+        This wraps Lav_simulationGetProfiling and Lav_simulationSetProfiling."""
+        return bool(_lav.simulation_get_profiling(self))
+
+    @profiling.setter
+    def profiling(self, value):
+        _lav.simulation_set_profiling(self, value)
+
+    @property
+    def queue_property_writes(self):
+        r"""Whether property writes that would wait for the audio thread are queued instead.  Off by default.
+
+        When on, setting a property while a block is being computed returns immediately, and the write lands at the start of the next block.
+        Until then, reading the property may give the old value, and errors such as values out of range are dropped rather than raised.
+        get_property_queue_stats counts what happened to queued writes.
+
+        This wraps Lav_simulationGetPropertyQueueEnabled and Lav_simulationSetPropertyQueueEnabled."""
+        return bool(_lav.simulation_get_property_queue_enabled(self))
+
+    @queue_property_writes.setter
+    def queue_property_writes(self, value):
+        _lav.simulation_set_property_queue_enabled(self, value)
+
+    def get_property_queue_stats(self):
+        r"""Returns a dict with the keys queued, applied, rejected and pending, counting property writes that went through the queue.
+
+        Wraps Lav_simulationGetPropertyQueueStatistics."""
+        queued, applied, rejected = _lav.simulation_get_property_queue_statistics(self)
+        return {
+            'queued': queued,
+            'applied': applied,
+            'rejected': rejected,
+            'pending': queued-applied-rejected,
+        }
+
+    @property
+    def skip_silence(self):
+        r"""Whether nodes which would only output silence skip their blocks.  On by default.
+
+        Filters, panners and similar nodes stop computing once their inputs have been silent for longer than their tail and their output has died away, and start again as soon as anything connected to them makes sound.
+        Buffer nodes stop once they end or are stopped, and start again when their position is set or play_at is called.
+        get_silence_stats counts the skipped blocks.
+
+        This wraps Lav_simulationGetSilenceSkipping and Lav_simulationSetSilenceSkipping."""
+        return bool(_lav.simulation_get_silence_skipping(self))
+
+    @skip_silence.setter
+    def skip_silence(self, value):
+        _lav.simulation_set_silence_skipping(self, value)
+
+    def get_silence_stats(self):
+        r"""Returns a dict with the keys skipped and processed, counting node ticks skipped because of silence and node ticks that were computed.
+
+        Wraps Lav_simulationGetSilenceStatistics."""
+        skipped, processed = _lav.simulation_get_silence_statistics(self)
+        return {
+            'skipped': skipped,
+            'processed': processed,
+        }
+
+    def reset_silence_stats(self):
+        r"""Sets the counts returned by get_silence_stats to 0."""
+        _lav.simulation_reset_silence_statistics(self)
+
+    def get_node_profile(self):
+        r"""Returns a snapshot of the per-node profile as a dict keyed by node handle.
+
+        Each value is a dict with the keys node, type (a member of ObjectTypes), calls, culled, total_time, max_time and mean_time.
+        calls counts the ticks for which the node ran and culled the ticks for which it didn't.  Times are in seconds.
+        Counters only advance while profiling is True.
+
+        This wraps Lav_simulationSnapshotProfile and Lav_simulationGetProfileEntry."""
+        with self:
+            profile = dict()
+            for i in six.moves.range(_lav.simulation_snapshot_profile(self)):
+                handle, calls, culled, total_time, max_time = _lav.simulation_get_profile_entry(self, i)
+                if handle.handle == 0:
+                    continue
+                node = _resurrect(handle)
+                profile[handle.handle] = {
+                    'node': node,
+                    'type': ObjectTypes(_lav.handle_get_type(handle)),
+                    'calls': calls,
+                    'culled': culled,
+                    'total_time': total_time,
+                    'max_time': max_time,
+                    'mean_time': total_time/calls if calls else 0.0,
+                }
+            return profile
+
+    def reset_node_profile(self):
+        r"""Clear the counters returned by get_node_profile."""
+        _lav.simulation_reset_profile(self)
+
 _types_to_classes[ObjectTypes.simulation] = Simulation
 
 #Buffer objects.
@@ -319,9 +708,37 @@ Use load_from_file to read a file or load_from_array to load an iterable."""
     def load_from_file(self, path):
         r"""Load an audio file.
         
+        Decoded files are shared between all buffers in the process, so loading the same file again is cheap.  See get_buffer_cache_stats.
         Wraps Lav_bufferLoadFromFile."""
         _lav.buffer_load_from_file(self, path)
 
+    def load_from_file_async(self, path, callback = None):
+        r"""Load an audio file without blocking, returning a concurrent.futures.Future.
+        
+        The buffer empties immediately and the file is decoded on a pool of Libaudioverse worker threads, so many files can load at once.
+        Buffer nodes already using this buffer are silent until loading finishes, then play the new data from the beginning.
+        The future's result is this buffer.  If loading fails, the future holds the Libaudioverse error instead.
+        If callback is given, it is called with the future when loading finishes.
+        Both it and any callbacks added to the future run on a Libaudioverse worker thread.
+        
+        Wraps Lav_bufferLoadFromFileAsync."""
+        future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+        if callback is not None:
+            future.add_done_callback(callback)
+        wrapped = _BufferLoadedCallback(self, future)
+        ct = _libaudioverse.LavBufferLoadedCallback(wrapped)
+        wrapped.ctypes = ct
+        with _pending_buffer_loads_lock:
+            _pending_buffer_loads.add(wrapped)
+        try:
+            _lav.buffer_load_from_file_async(self, path, ct, None)
+        except:
+            with _pending_buffer_loads_lock:
+                _pending_buffer_loads.discard(wrapped)
+            raise
+        return future
+
     def load_from_array(self, sr, channels, frames, data):
         r"""Load from an array of interleaved floats.
         
@@ -506,7 +923,7 @@ class VectorProperty(LibaudioverseProperty):
     #Override setter:
     @LibaudioverseProperty.value.setter
     def value(self, val):
-        if not isinstance(val, collections.Sized):
+        if not isinstance(val, collections_abc.Sized):
             raise ValueError("Expected a collections.sized subclass")
         if len(val) != self._length:
             raise ValueError("Expected a {}-element list".format(self._length))
@@ -655,6 +1072,8 @@ class GenericNode(_HandleComparer):
 
 _types_to_classes[ObjectTypes.generic_node] = GenericNode
 
+{#Extra functions whose methods are written out below rather than generated.#}
+{%set hand_written_functions = ["Lav_environmentNodeUpdateSources", "Lav_bufferNodePlayAt", "Lav_bufferTimelineNodeScheduleMany", "Lav_bufferTimelineNodeSetHrtf"]%}
 {%for node_name in constants.keys()|regexp_filter("Lav_OBJTYPE_\w+_NODE")|remove_filter("Lav_OBJTYPE_GENERIC_NODE")%}
 {%set friendly_name = node_name|strip_prefix("Lav_OBJTYPE_")|strip_suffix("_NODE")|lower|underscores_to_camelcase(True)%}
 {%set constructor_name = "Lav_create" + friendly_name + "Node"%}
@@ -686,7 +1105,7 @@ class {{friendly_name}}Node(GenericNode):
 
 {%endfor%}
 
-{%for func_name, func_info in metadata['nodes'].get(node_name, dict()).get('extra_functions', dict()).items()%}
+{%for func_name, func_info in metadata['nodes'].get(node_name, dict()).get('extra_functions', dict()).items() if func_name not in hand_written_functions%}
 {%set friendly_func_name = func_info['name']%}
 {%set func = functions[func_name]%}
 {%set lav_func = func.name|without_lav|camelcase_to_underscores%}
@@ -697,6 +1116,58 @@ class {{friendly_name}}Node(GenericNode):
 
 {%endfor%}
 
+{%if node_name == "Lav_OBJTYPE_ENVIRONMENT_NODE"%}
+    def update_sources(self, sources, positions, orientations = None):
+        r"""{{metadata['nodes'][node_name]['extra_functions']['Lav_environmentNodeUpdateSources']['doc_description']}}
+        sources is a sequence of SourceNode objects or integer handles, or a buffer of 32-bit integer handles.
+        positions and orientations may be contiguous buffers of 32-bit floats, such as numpy arrays of dtype float32, which are passed to Libaudioverse without copying.
+        Otherwise they may be flat sequences of numbers or sequences of 3-tuples and 6-tuples respectively."""
+        handles = _int32_buffer(sources)
+        if handles is None:
+            handles = array.array('i', [getattr(getattr(i, 'handle', i), 'handle', i) for i in sources])
+        count = len(handles)
+        positions = _float32_buffer(positions)
+        if len(positions) != count*3:
+            raise ValueError("Expected {} position components for {} sources, got {}.".format(count*3, count, len(positions)))
+        if orientations is not None:
+            orientations = _float32_buffer(orientations)
+            if len(orientations) != count*6:
+                raise ValueError("Expected {} orientation components for {} sources, got {}.".format(count*6, count, len(orientations)))
+        _lav.environment_node_update_sources(self, count, handles, positions, orientations)
+
+{%endif%}
+{%if node_name == "Lav_OBJTYPE_BUFFER_TIMELINE_NODE"%}
+    def set_hrtf(self, path = "default"):
+        r"""{{metadata['nodes'][node_name]['extra_functions']['Lav_bufferTimelineNodeSetHrtf']['doc_description']}}"""
+        _lav.buffer_timeline_node_set_hrtf(self, path)
+
+    def schedule_many(self, voices):
+        r"""Schedule many buffers at once.
+
+        voices is a sequence of tuples (buffer, time, pitch_bend, gain, azimuth, elevation), in which everything after time may be left off.
+        Times are relative to now.  Azimuths and elevations need set_hrtf to have been called.
+
+        Wraps Lav_bufferTimelineNodeScheduleMany."""
+        voices = list(voices)
+        count = len(voices)
+        handles = array.array('i', [getattr(getattr(i[0], 'handle', i[0]), 'handle', i[0]) for i in voices])
+        times = array.array('d', [i[1] for i in voices])
+        pitch_bends = array.array('f', [i[2] if len(i) > 2 else 1.0 for i in voices])
+        gains = array.array('f', [i[3] if len(i) > 3 else 1.0 for i in voices])
+        azimuths, elevations = None, None
+        if any(len(i) > 4 for i in voices):
+            azimuths = array.array('f', [i[4] if len(i) > 4 else 0.0 for i in voices])
+            elevations = array.array('f', [i[5] if len(i) > 5 else 0.0 for i in voices])
+        _lav.buffer_timeline_node_schedule_many(self, count, handles, times, pitch_bends, gains, azimuths, elevations)
+
+{%endif%}
+{%if node_name == "Lav_OBJTYPE_BUFFER_NODE"%}
+    def play_at(self, time, offset = 0.0):
+        r"""{{metadata['nodes'][node_name]['extra_functions']['Lav_bufferNodePlayAt']['doc_description']}}
+        time is in the same clock as Simulation.time, and offset is in seconds."""
+        _lav.buffer_node_play_at(self, time, offset)
+
+{%endif%}
 {%for callback_name, callback_info in metadata['nodes'].get(node_name, dict()).get('callbacks', dict()).items()%}
 {%set libaudioverse_function_name = "_lav."+friendly_name|camelcase_to_underscores+"_node_set_"+callback_name+"_callback"%}
 {%set tmp = functions["Lav_"+friendly_name[0].lower()+friendly_name[1:]+"NodeSet"+callback_name|underscores_to_camelcase(True)+"Callback"]%}
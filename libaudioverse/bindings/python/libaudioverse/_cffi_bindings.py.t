@@ -0,0 +1,52 @@
+#Optional cffi declarations for the functions which don't involve callbacks.
+#This is ABI mode: nothing is compiled, and the library is opened with dlopen from the same path as ctypes used.
+#Calls through cffi are several times cheaper than through ctypes, so _lav prefers this module when cffi is installed.
+from __future__ import absolute_import
+import ctypes
+from . import _libaudioverse
+
+cdef = """
+{%for n, t in typedefs.items() if t.base is string%}
+typedef {{t|cffi_type}} {{n}};
+{%endfor%}
+{%for name, info in functions.items() if info is cffi_eligible%}
+{{info|function_to_string}};
+{%endfor%}
+"""
+
+try:
+    import cffi
+    ffi = cffi.FFI()
+    ffi.cdef(cdef)
+    lib = ffi.dlopen(_libaudioverse.libaudioverse_module._name)
+except Exception:
+    #Either cffi isn't installed or it couldn't load the library.  _lav falls back to ctypes.
+    ffi = None
+    lib = None
+
+#Formats which memoryview reports for each C type.  Buffers in any other format are copied.
+buffer_formats = {
+    'float': {'f'},
+    'double': {'d'},
+    'int': {'i', 'l'} if ctypes.sizeof(ctypes.c_long) == 4 else {'i'},
+    'unsigned int': {'I', 'L'} if ctypes.sizeof(ctypes.c_ulong) == 4 else {'I'},
+    'LavHandle': {'i', 'l'} if ctypes.sizeof(ctypes.c_long) == 4 else {'i'},
+}
+
+def convert_pointer(c_type, value):
+    """Converts value to a c_type*.
+    ctypes pointers and arrays are used in place, which lets the rest of the bindings keep building output buffers with ctypes.
+    Contiguous buffers of the right type are also used in place; anything else is copied."""
+    if value is None:
+        return ffi.NULL
+    if isinstance(value, ctypes._Pointer):
+        return ffi.cast(c_type+" *", ctypes.cast(value, ctypes.c_void_p).value)
+    if isinstance(value, ctypes.Array):
+        return ffi.cast(c_type+" *", ctypes.addressof(value))
+    try:
+        view = memoryview(value)
+        if view.format in buffer_formats.get(c_type, ()) and view.c_contiguous:
+            return ffi.from_buffer(c_type+"[]", value)
+    except TypeError:
+        pass
+    return ffi.new(c_type+"[]", list(value))
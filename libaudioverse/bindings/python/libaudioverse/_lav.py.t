@@ -4,10 +4,25 @@
 from __future__ import absolute_import
 import ctypes
 import collections
+try:
+    import collections.abc as collections_abc
+except ImportError:
+    #Python 2 keeps the abstract base classes in collections.
+    collections_abc = collections
 import functools
 from . import _libaudioverse
+from . import _cffi_bindings
+import os
 import six
 
+#Functions without callbacks go through cffi when it's available, as it's much cheaper per call.
+#Setting LIBAUDIOVERSE_PYTHON_BACKEND to ctypes forces ctypes everywhere, which is mostly useful for debugging and benchmarking.
+#Either way, the ctypes version of function foo is available as _ctypes_foo and the cffi version as _cffi_foo.
+if _cffi_bindings.lib is not None and os.getenv('LIBAUDIOVERSE_PYTHON_BACKEND', 'cffi') != 'ctypes':
+    backend = 'cffi'
+else:
+    backend = 'ctypes'
+
 #These are not from libaudioverse.
 #Implement a method by which the public libaudioverse module may register its exception classes for error code translation.
 class PythonBindingsCouldNotTranslateErrorCodeError(Exception):
@@ -58,15 +73,15 @@ def reverse_handle(handle):
 
 {%macro autopointerize(arglist)%}
 {%for arg in arglist%}
-{%if arg.type.base == 'LavHandle'%}
+{%if arg.type.base == 'LavHandle' and arg.type.indirection == 0%}
     {{arg.name}} = getattr({{arg.name}}, 'handle', {{arg.name}})
     {{arg.name}} = getattr({{arg.name}}, 'handle', {{arg.name}})
 {%elif arg.type.indirection == 1 and arg.type.base == 'char'%}
     {{arg.name}} = {{arg.name}}.encode('utf8') #All strings are contractually UTF8 when entering Libaudioverse.
 {%elif arg.type.indirection == 1%}
-    if isinstance({{arg.name}}, collections.Sized):
+    if isinstance({{arg.name}}, collections_abc.Sized):
         if not (isinstance({{arg.name}}, six.binary_type) or isinstance({{arg.name}}, six.text_type)):
-            {{arg.name}}_t = {{arg.type|ctypes_string(1)}}*len({{arg.name}})
+            {{arg.name}}_t = {{arg.type|ctypes_string(1, '_libaudioverse.')}}*len({{arg.name}})
             #Try to use the buffer interfaces, if we can.
             try:
                 {{arg.name}} = {{arg.name}}_t.from_buffer({{arg.name}})
@@ -76,11 +91,50 @@ def reverse_handle(handle):
                     {{arg.name}}_new[i] = j
                 {{arg.name}} = {{arg.name}}_new
         else:
-            {{arg.name}} = ctypes.cast(ctypes.create_string_buffer({{arg.name}}, len({{arg.name}})), {{arg.type|ctypes_string}})
+            {{arg.name}} = ctypes.cast(ctypes.create_string_buffer({{arg.name}}, len({{arg.name}})), {{arg.type|ctypes_string(0, '_libaudioverse.')}})
 {%endif-%}
 {%endfor-%}
 {%endmacro%}
 
+{%macro cffi_autopointerize(arglist)%}
+{%for arg in arglist%}
+{%if arg.type.base == 'LavHandle' and arg.type.indirection == 0%}
+    {{arg.name}} = getattr({{arg.name}}, 'handle', {{arg.name}})
+    {{arg.name}} = getattr({{arg.name}}, 'handle', {{arg.name}})
+{%elif arg.type.indirection == 1 and arg.type.base == 'char'%}
+    {{arg.name}} = {{arg.name}}.encode('utf8') #All strings are contractually UTF8 when entering Libaudioverse.
+{%elif arg.type.indirection == 1%}
+    {{arg.name}} = _cffi_bindings.convert_pointer('{{arg.type|cffi_type(1)}}', {{arg.name}})
+{%endif-%}
+{%endfor-%}
+{%endmacro%}
+
+{%macro cffi_function(func_name, func_info, friendly_name)%}
+{%set input_arg_names = func_info.input_args|map(attribute='name')|list%}
+{%set output_arg_names = func_info.output_args|map(attribute='name')|list%}
+def _cffi_{{friendly_name}}({{input_arg_names|join(', ')}}):
+{%if func_info.input_args|length%}{{cffi_autopointerize(func_info.input_args)}}{%endif%}
+{%for i in func_info.output_args%}
+    {{i.name}} = _cffi_bindings.ffi.new('{{i.type|type_to_string}}')
+{%endfor%}
+    err = _cffi_bindings.lib.{{func_name}}({{(input_arg_names+output_arg_names)|join(', ')}})
+    if err != _libaudioverse.Lav_ERROR_NONE:
+        raise make_error_from_code(err)
+{%if func_info.output_args|length%}
+    return {%for i in func_info.output_args -%}
+{%- if i.type.base=='LavHandle' and i.type.indirection == 1 -%}
+    reverse_handle({{i.name}}[0])
+{%-elif i.type.base == 'char' and i.type.indirection == 2-%}
+    _cffi_bindings.ffi.string({{i.name}}[0]).decode('utf8')
+{%- else -%}
+    {{i.name}}[0]
+{%-endif-%}
+{%-if not loop.last%}, {%endif-%}
+{%-endfor%}
+
+{%endif%}
+{%endmacro%}
+
 {%for func_name, func_info in functions.items()%}
 {%set friendly_name = func_name|without_lav|camelcase_to_underscores%}
 {%set input_arg_names = func_info.input_args|map(attribute='name')|list%}
@@ -114,4 +168,11 @@ def {{friendly_name}}({{input_arg_names|join(', ')}}):
 {%endif%}
 
 
+{%if func_info is cffi_eligible%}
+{{cffi_function(func_name, func_info, friendly_name)}}
+_ctypes_{{friendly_name}} = {{friendly_name}}
+if backend == 'cffi':
+    {{friendly_name}} = _cffi_{{friendly_name}}
+
+{%endif%}
 {%endfor%}
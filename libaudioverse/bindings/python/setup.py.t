@@ -29,5 +29,7 @@ setup(
     install_requires = ['six'],
     extras_require = { #This comes from wheel docs, but by the PEP explaining environment markers shouldn't work. But it does.
         ':python_version <= "3.4"': ['enum34'],
+        ':python_version < "3"': ['futures'], #concurrent.futures, for Buffer.load_from_file_async.
+        'cffi': ['cffi>=1.12'], #Optional faster backend for native calls.  See _cffi_bindings.py.
     }
 )
@@ -1,11 +1,15 @@
 import os.path
 import os
 import sys
+import glob
+import jinja2
 repository_root = os.path.split(os.path.split(os.path.abspath(__file__))[0])[0]
 sys.path = [repository_root] + sys.path
 import bindings.doc_helper
-from .c_api import make_c_api
-from .node_reference import make_node_reference
+import bindings.incremental
+import bindings.transformers
+from .c_api import make_c_api, c_api_context
+from .node_reference import make_node_reference, node_reference_context
 from .enumerations import make_enumerations
 from . import asciidoc_filters
 
@@ -13,3 +17,23 @@ def prepare_docs(all_info):
     bindings.doc_helper.prepare_docs(all_info,
     enum =asciidoc_filters.enum, node = asciidoc_filters.node, param = asciidoc_filters.param, codelit=asciidoc_filters.codelit,
     latex = asciidoc_filters.latex)
+
+def setup_environment(all_info):
+    """The environment and context shared by all of the generated documentation.  Worker processes call this again when rendering in parallel."""
+    prepare_docs(all_info)
+    env = jinja2.Environment(loader=jinja2.PackageLoader(__package__, ""), undefined=jinja2.StrictUndefined, trim_blocks=True)
+    env.filters.update(bindings.transformers.get_jinja2_filters(all_info))
+    env.filters.update(asciidoc_filters.bound_filters(all_info))
+    context = dict()
+    context.update(all_info)
+    context.update(c_api_context(all_info))
+    context.update(node_reference_context(all_info))
+    return env, context
+
+def render_docs(all_info):
+    """Returns a dict of asciidoc file names to their contents, rendering only those whose inputs changed."""
+    return bindings.incremental.render_templates('docs', setup_environment, all_info, {
+        'node_reference.asciidoc': 'node_reference.t',
+        'c_api.asciidoc': 'c_api.t',
+        'enumerations.asciidoc': 'enumerations.t',
+    }, extra_code = glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py")))
@@ -13,7 +13,8 @@ def verify_all_parameters_documented(info, docs):
             if p.name not in docs[func.name]['params']:
                 raise ValueError("{}: undocumented param {}".format(func.name, p.name))
 
-def make_c_api(all_info):
+def c_api_context(all_info):
+    """The additions to the context needed by c_api.t."""
     functions_by_category=dict()
     for i in all_info['metadata']['function_categories']:
         functions_by_category[i['name']] =[]
@@ -25,11 +26,14 @@ def make_c_api(all_info):
     for i, j in functions_by_category.items():
         j.sort() #alphabetize all of them
         verify_all_parameters_documented(all_info, all_info['metadata']['functions'])
+    return {'functions_by_category': functions_by_category}
+
+def make_c_api(all_info):
     env = jinja2.Environment(loader=jinja2.PackageLoader(__package__, ""), undefined=jinja2.StrictUndefined, trim_blocks=True)
     env.filters.update(transformers.get_jinja2_filters(all_info))
     env.filters.update(asciidoc_filters.bound_filters(all_info))
     context=dict()
     context.update(all_info)
-    context['functions_by_category'] = functions_by_category
+    context.update(c_api_context(all_info))
     template=env.get_template("c_api.t")
     return template.render(context)
@@ -2,6 +2,15 @@ from bindings import get_info, transformers, doc_helper
 import jinja2
 from . import asciidoc_filters
 
+def node_reference_context(all_info):
+    """The additions to the context needed by node_reference.t."""
+    sorted_nodes= list(all_info['metadata']['nodes'].items())
+    sorted_nodes.sort(key = lambda x: x[1]['doc_name'].lower())
+    sorted_nodes= [i[0] for i in sorted_nodes]
+    sorted_nodes.remove('Lav_OBJTYPE_GENERIC_NODE')
+    sorted_nodes = ['Lav_OBJTYPE_GENERIC_NODE'] + sorted_nodes
+    return {'sorted_nodes': sorted_nodes, 'nodes': all_info['metadata']['nodes']}
+
 def make_node_reference(all_info):
     env = jinja2.Environment(loader = jinja2.PackageLoader(__package__, ""), undefined = jinja2.StrictUndefined, trim_blocks = True)
     env.filters.update(transformers.get_jinja2_filters(all_info))
@@ -9,11 +18,5 @@ def make_node_reference(all_info):
     context = dict()
     context.update(all_info)
     template = env.get_template("node_reference.t")
-    sorted_nodes= list(context['metadata']['nodes'].items())
-    sorted_nodes.sort(key = lambda x: x[1]['doc_name'].lower())
-    sorted_nodes= [i[0] for i in sorted_nodes]
-    sorted_nodes.remove('Lav_OBJTYPE_GENERIC_NODE')
-    sorted_nodes = ['Lav_OBJTYPE_GENERIC_NODE'] + sorted_nodes
-    context['sorted_nodes'] = sorted_nodes
-    context['nodes'] = context['metadata']['nodes']
+    context.update(node_reference_context(all_info))
     return template.render(context)
@@ -36,6 +36,8 @@ class EnvironmentInfo {
 	//These avoid tons of property lookups.
 	//Each lookup on the environment is a shared_ptr indirection and a dictionary lookup.
 	int distance_model, panning_strategy;
+	//Sources quieter than this don't pan.
+	float cull_threshold;
 };
 
 /**The sorce and environment model does not use the standard node and implementation separation.
@@ -60,6 +62,9 @@ class EnvironmentNode: public Node {
 	int addEffectSend(int channels, bool isReverb, bool connecctByDefault);
 	EffectSendConfiguration& getEffectSend(int which);
 	int getEffectSendCount();
+	//Move many sources at once.  positions holds 3 floats per source and orientations, which may be null, 6.
+	//Every source is checked before any is changed, so either all of the updates apply or none do.
+	void updateSources(std::vector<std::shared_ptr<SourceNode>> &toUpdate, const float* positions, const float* orientations);
 	//This is a public variable; sources write directly to these buffers.
 	//There are always at least 8 buffers, with additional buffers appended for effect sends.
 	std::vector<float*> source_buffers;
@@ -70,6 +75,8 @@ class EnvironmentNode: public Node {
 	std::shared_ptr<HrtfData > hrtf;
 	EnvironmentInfo environment_info;
 	std::vector<EffectSendConfiguration> effect_sends;
+	//Scratch space for picking which sources get HRTF, kept to avoid allocating in the audio thread.
+	std::vector<std::tuple<float, SourceNode*>> hrtf_candidates;
 	
 	template<typename JobT, typename CallableT, typename... ArgsT>
 	friend void environmentVisitDependencies(JobT&& start, CallableT &&callable, ArgsT&&... args);
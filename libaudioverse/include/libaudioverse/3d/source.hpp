@@ -32,10 +32,24 @@ class SourceNode: public Node {
 	virtual void process() override;
 	void handleStateUpdates(bool shouldCull);
 	void handleOcclusion();
+	std::shared_ptr<EnvironmentNode> getEnvironment();
+	//For the environment's culling and HRTF budget.
+	//Culled sources are inaudible, paused, or have been fed silence for longer than their tail and do no panning.
+	bool isCulled();
+	//True if this source would like to use HRTF this block.
+	bool wantsHrtf();
+	bool isUsingHrtf();
+	float getDryGain();
+	//Degraded sources use stereo panning in place of HRTF.  Cleared by update.
+	void setDegraded(bool d);
 	private:
-	bool culled = false;
+	bool culled = false, silent = false, degraded = false, hrtf_active = false;
+	//How many zero samples in a row have come in, used to find out when the panners' tails have finished.
+	int silent_samples = 0;
 	float dry_gain, reverb_gain;
 	int panning_strategy;
+	//The strategy used for the last block, or -1 if we were culled.  Used to crossfade when max_hrtf_sources moves us between the hrtf and stereo panners.
+	int last_strategy = -1;
 	HrtfPanner hrtf_panner;
 	AmplitudePanner stereo_panner, surround40_panner, surround51_panner, surround71_panner;
 	BiquadFilter occlusion_filter;
@@ -21,6 +21,8 @@ class BufferPlayer {
 	BufferPlayer(int _block_size, float _sr);
 	~BufferPlayer();
 	void process(int channels, float** outputs);
+	//Only produce frames frames, which may be less than the block size.  Used to start and stop partway through a block.
+	void process(int channels, float** outputs, int frames);
 	void setBuffer(std::shared_ptr<Buffer> buff);
 	std::shared_ptr<Buffer> getBuffer();
 	void setPosition(double position);
@@ -32,8 +34,15 @@ class BufferPlayer {
 	//Increments every time the buffer ends.
 	int getEndedCount();
 	void resetEndedCount();
+	//True if process would output nothing: there's no buffer, or we reached the end without looping.
+	bool isEnded();
 	private:
+	//Take the buffer's current contents.
+	void takeData();
 	std::shared_ptr<Buffer> buffer = nullptr;
+	//We hold the data ourselves, so that replacing the buffer's contents can't pull it out from under us.
+	std::shared_ptr<BufferData> buffer_data = nullptr;
+	float* data = nullptr;
 	int frame = 0;
 	int buffer_length=0;
 	double offset=0.0, rate = 1.0;
@@ -57,21 +66,31 @@ inline BufferPlayer::~BufferPlayer() {
 }
 
 inline void BufferPlayer::process(int channels, float** outputs) {
+	process(channels, outputs, block_size);
+}
+
+inline void BufferPlayer::process(int channels, float** outputs, int frames) {
 	if(buffer == nullptr) return; //no buffer.
+	if(buffer->getData() != buffer_data) { //Contents replaced, say by a background load. Start over on the new ones.
+		takeData();
+		frame = 0;
+		offset = 0.0;
+		ended = false;
+	}
 	if(buffer_length== 0) return;
 	if(ended) return;
 	//This is an optimizable case, and a fairly common one.  It degrades to a memcpy when we can do it.
-	if(rate == 1.0 && offset < 1e-5 && frame+block_size < buffer_length) {
+	if(rate == 1.0 && offset < 1e-5 && frame+frames < buffer_length) {
 		for(int ch = 0; ch < buffer_channels; ch++) {
-			float* p=buffer->getPointer(frame, ch);
-			std::copy(p, p+block_size, intermediate_destination[ch]);
+			float* p=data+ch*buffer_length+frame;
+			std::copy(p, p+frames, intermediate_destination[ch]);
 		}
-		frame += block_size;
+		frame += frames;
 	}
 	else {
 		int computed_samples = 0;
 		//We do the looping check first so we can break out if we have issues.
-		for(int i =0; i < block_size; i++) {
+		for(int i =0; i < frames; i++) {
 			if(frame >= buffer_length) { //past end.
 				ended_count ++;
 				if(is_looping == false) {
@@ -83,10 +102,10 @@ inline void BufferPlayer::process(int channels, float** outputs) {
 			}
 			for(int chan =0; chan < buffer_channels; chan++) {
 				//This is standard linear interpolation.
-				double a = buffer->getSample(frame, chan);
+				double a = data[chan*buffer_length+frame];
 				double b;
-				if(frame+1 < buffer_length) b = buffer->getSample(frame+1, chan); //okay, we have one more sample after this one.
-				else if(is_looping) b =buffer->getSample(0, chan); //We have a next sample, but it's looped to the beginning.
+				if(frame+1 < buffer_length) b = data[chan*buffer_length+frame+1]; //okay, we have one more sample after this one.
+				else if(is_looping) b = data[chan*buffer_length]; //We have a next sample, but it's looped to the beginning.
 				else b = 0.0; //no next sample.
 				double weight1 = 1-offset;
 				double weight2 = offset;
@@ -99,11 +118,11 @@ inline void BufferPlayer::process(int channels, float** outputs) {
 		}
 		//We have to zero the rest out.
 		for(int ch = 0; ch < buffer_channels; ch++) {
-			for(int i = computed_samples; i < block_size; i++) intermediate_destination[ch][i] = 0.0;
+			for(int i = computed_samples; i < frames; i++) intermediate_destination[ch][i] = 0.0;
 		}
 	}
 	//Remix to the destination.
-	audio_io::remixAudioUninterleaved(block_size, buffer_channels, &intermediate_destination[0], channels, outputs);
+	audio_io::remixAudioUninterleaved(frames, buffer_channels, &intermediate_destination[0], channels, outputs);
 }
 
 inline void BufferPlayer::setBuffer(std::shared_ptr<Buffer> b) {
@@ -115,12 +134,16 @@ inline void BufferPlayer::setBuffer(std::shared_ptr<Buffer> b) {
 	resetEndedCount();
 	if(b) ended = false;
 	else ended = true;
-	buffer_length = b ? b->getLength() : 0;
+	takeData();
+}
+
+inline void BufferPlayer::takeData() {
+	buffer_data = buffer ? buffer->getData() : nullptr;
+	data = buffer_data ? buffer_data->data : nullptr;
+	buffer_length = buffer_data ? buffer_data->frames : 0;
+	buffer_channels = buffer_data ? buffer_data->channels : 0;
 	//Ensure we have enough intermediate buffers.
-	if(b) {
-		while(intermediate_destination.size() < (unsigned int)b->getChannels()) intermediate_destination.push_back(allocArray<float>(block_size));
-	}
-	buffer_channels = b ? b->getChannels() : 0;
+	while(intermediate_destination.size() < (unsigned int)buffer_channels) intermediate_destination.push_back(allocArray<float>(block_size));
 }
 
 inline std::shared_ptr<Buffer> BufferPlayer::getBuffer() {
@@ -163,4 +186,9 @@ inline void BufferPlayer::resetEndedCount() {
 	ended_count = 0;
 }
 
+inline bool BufferPlayer::isEnded() {
+	//If the contents were replaced, process starts over.
+	return ended && (buffer == nullptr || buffer->getData() == buffer_data);
+}
+
 }
\ No newline at end of file
@@ -9,6 +9,15 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 
 namespace libaudioverse_implementation {
 
+class PartitionedConvolver;
+
+//True if convolving blocks of blockSize with a response of responseLength is expected to be cheaper through the FFT.
+bool shouldUseFftConvolution(int blockSize, int responseLength);
+
+/**Convolves one block at a time with a response of any length.
+
+Short responses are convolved directly.  Long ones go through a PartitionedConvolver.
+The mode is one of the Lav_CONVOLUTION_MODES; automatic picks based on the block size and response length whenever the response changes.*/
 class BlockConvolver {
 	public:
 	BlockConvolver(int blockSize);
@@ -16,12 +25,46 @@ class BlockConvolver {
 	//Error if length<1.
 	//This is not checked.
 	//Note: this function zeros the history if the new response has a different length.
-	void setResponse(int length, float* newResponse);
+	//If crossfade is true and the length is unchanged, the next block fades from the old response to the new one.
+	void setResponse(int length, float* newResponse, bool crossfade = false);
 	void convolve(float* input, float* output);
 	void reset();
+	//Switching between direct and FFT convolution zeros the history.
+	void setMode(int mode);
+	int getMode();
+	bool isUsingFft();
 	private:
-	float* response = nullptr, *history = nullptr;
+	void updateStrategy(bool crossfade);
+	float* response = nullptr, *previous_response = nullptr, *history = nullptr, *crossfade_buffer = nullptr;
 	int block_size = 0, response_length = 0;
+	int mode = 0;
+	bool use_fft = false, crossfading = false;
+	PartitionedConvolver* partitioned = nullptr;
+};
+
+/**Uniformly partitioned overlap-save convolution.
+
+The response is split into block-sized partitions, each of which is transformed once when the response is set.
+Each block then costs one forward FFT, one inverse FFT of twice the block size, and a complex multiply-add per partition.
+The input spectra are kept separately from the response, so changing to a response of the same length doesn't disturb the history.
+For the same reason, crossfading only costs one extra inverse FFT and a second pass of multiply-adds.*/
+class PartitionedConvolver {
+	public:
+	PartitionedConvolver(int blockSize);
+	~PartitionedConvolver();
+	//As BlockConvolver::setResponse.
+	void setResponse(int length, float* response, bool crossfade = false);
+	void convolve(float* input, float* output);
+	void reset();
+	private:
+	void accumulate(kiss_fft_cpx* spectra, float* output);
+	int block_size = 0, fft_size = 0, bins = 0, partitions = 0, newest = 0;
+	bool crossfading = false;
+	//The last two blocks of input.
+	float* input_window = nullptr, *workspace = nullptr, *crossfade_buffer = nullptr;
+	//partitions*bins each.  input_spectra is a ring, with the newest at newest.
+	kiss_fft_cpx* response_spectra = nullptr, *previous_spectra = nullptr, *input_spectra = nullptr, *accumulator = nullptr;
+	kiss_fftr_cfg fft = nullptr, ifft = nullptr;
 };
 
 class FftConvolver {
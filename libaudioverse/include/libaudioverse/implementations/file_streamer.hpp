@@ -8,17 +8,24 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include "../private/file.hpp"
 #include <speex_resampler_cpp.hpp>
 #include <memory>
+#include <atomic>
+#include <thread>
+#include <mutex>
+#include <condition_variable>
 #include <algorithm>
 #include <string>
 #include <inttypes.h>
 
 namespace libaudioverse_implementation {
 
-/**This is a lot like a BufferPlayer, but channels matches the file always and we resample at run-time.*/
+/**This is a lot like a BufferPlayer, but channels matches the file always and we resample at run-time.
 
+Decoding happens on a background thread which keeps a ring buffer of interleaved frames at the file's sample rate topped up.
+The ring buffer is single-producer single-consumer: the I/O thread only advances the write counter and the audio thread only advances the read counter.
+Seeks and read-ahead changes which need a bigger ring are requests: the audio thread publishes them and outputs silence until the I/O thread acknowledges them, so the audio thread never touches the file.*/
 class FileStreamer {
 	public:
-	FileStreamer(std::string path, int _block_size, float _sr);
+	FileStreamer(std::string path, int _block_size, float _sr, double read_ahead = 1.0);
 	~FileStreamer();
 	void process(float** outputs);
 	void setPosition(double position);
@@ -31,16 +38,42 @@ class FileStreamer {
 	//This last fact is important for the node's process method.
 	bool getEnded();
 	int getChannels();
+	//Seconds of audio to keep decoded ahead of playback.
+	void setReadAhead(double seconds);
+	double getReadAhead();
+	//Count of blocks for which the I/O thread hadn't decoded enough audio.
+	int getUnderruns();
 	private:
-	void feedResampler();
-	int block_size = 0;
-	float sr = 0.0f;
+	//Returns false if nothing was fed.  Sets starved if the I/O thread fell behind.
+	bool feedResampler(bool &starved);
+	void request(int64_t frame, int64_t capacity);
+	//Everything below here up to the next comment belongs to the I/O thread.
+	void ioThreadFunction();
+	void fill();
+	void handleRequest(int generation);
 	FileReader reader;
+	bool reached_end_locally = false;
+	int handled_generation = 0;
+	//Shared state.
+	float* ring = nullptr;
+	int64_t ring_capacity = 0;
+	std::atomic<int64_t> write_count, read_count, fill_target;
+	std::atomic<bool> reached_end, is_looping_shared, should_stop;
+	std::atomic<int> request_generation, completed_generation;
+	std::atomic<int64_t> requested_frame, requested_capacity;
+	std::atomic<int> underruns;
+	std::mutex wake_mutex;
+	std::condition_variable wake;
+	std::thread io_thread;
+	//Audio thread state.
+	int64_t framesForSeconds(double seconds);
+	int block_size = 0;
+	float sr = 0.0f, file_sr = 0.0f;
 	std::shared_ptr<speex_resampler_cpp::Resampler> resampler = nullptr;
 	float *workspace_before_resampling = nullptr, *workspace_after_resampling = nullptr;
 	int channels = 0;
-	double position = 0.0, duration  = 0.0, position_per_sample = 0.0;
-	int64_t position_in_frames = 0;
+	double duration  = 0.0, read_ahead = 0.0;
+	int64_t position_in_frames = 0, frame_count = 0;
 	bool is_looping = false, ended_before_resampling = false, ended_after_resampling = false;
 };
 
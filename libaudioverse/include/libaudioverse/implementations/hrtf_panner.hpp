@@ -30,10 +30,13 @@ class HrtfPanner {
 	//Also known as manhattan distance.
 	void setCrossfadeThreshold(float threshold);
 	float getCrossfadeThreshold();
+	//One of the Lav_CONVOLUTION_MODES.
+	void setConvolutionMode(int mode);
+	int getConvolutionMode();
 	private:
 	std::shared_ptr<HrtfData> hrtf;
-	//Convolvers, current and previous.
-	BlockConvolver *left_convolver, *right_convolver, *prev_left_convolver, *prev_right_convolver;
+	//These crossfade internally when given a new response.
+	BlockConvolver *left_convolver, *right_convolver;
 	int block_size;
 	int response_length;
 	float sr;
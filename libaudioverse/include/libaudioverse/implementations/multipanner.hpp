@@ -28,6 +28,9 @@ class Multipanner {
 	//Manhattan distance (delta_azimuth+delta_elevation) before crossfading happens.
 	float getCrossfadeThreshold();
 	void setCrossfadeThreshold(float t);
+	//One of the Lav_CONVOLUTION_MODES, for HRTF panning.
+	int getConvolutionMode();
+	void setConvolutionMode(int mode);
 	int getStrategy();
 	void setStrategy(int s);
 	private:
@@ -155,6 +155,13 @@ enum Lav_LOGGING_LEVELS {
 	Lav_LOGGING_LEVEL_OFF = 40,
 };
 
+/**Histograms kept by the planner.  See Lav_simulationGetPlannerStatistics.*/
+enum Lav_PLANNER_HISTOGRAMS {
+	Lav_PLANNER_HISTOGRAM_WIDTH,
+	Lav_PLANNER_HISTOGRAM_TIME,
+	Lav_PLANNER_HISTOGRAM_BARRIER_WAIT,
+};
+
 /**Initialize Libaudioverse.*/
 Lav_PUBLIC_FUNCTION LavError Lav_initialize();
 /**Shuts down the library.
@@ -207,10 +214,15 @@ Lav_PUBLIC_FUNCTION LavError Lav_createSimulation(unsigned int sr, unsigned int
 
 Lav_PUBLIC_FUNCTION LavError Lav_simulationGetBlockSize(LavHandle simulationHandle, int* destination);
 Lav_PUBLIC_FUNCTION LavError Lav_simulationGetBlock(LavHandle simulationHandle, unsigned int channels, int mayApplyMixingMatrix, float* buffer);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetBlocks(LavHandle simulationHandle, unsigned int channels, int mayApplyMixingMatrix, unsigned int blocks, float* buffer);
 Lav_PUBLIC_FUNCTION LavError Lav_simulationGetSr(LavHandle simulationHandle, int* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetCurrentTime(LavHandle simulationHandle, double* destination);
 
 /**Set or clear the output device.*/
 Lav_PUBLIC_FUNCTION LavError Lav_simulationSetOutputDevice(LavHandle simulationHandle, const char* device, int channels);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSetOutputDeviceWithLatency(LavHandle simulationHandle, const char* device, int channels, double minLatency, double startLatency, double maxLatency);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetLatencyStatistics(LavHandle simulationHandle, double* destinationLatency, int* destinationLatencyBlocks, double* destinationMinLatency, double* destinationMaxLatency, int* destinationUnderruns, int* destinationCallbacks);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetCallbackTime(LavHandle simulationHandle, int index, double* destination);
 Lav_PUBLIC_FUNCTION LavError Lav_simulationClearOutputDevice(LavHandle simulationHandle);
 
 /**Lock/unlock the simulation.*/
@@ -229,6 +241,27 @@ Lav_PUBLIC_FUNCTION LavError Lav_simulationWriteFile(LavHandle simulationHandle,
 Lav_PUBLIC_FUNCTION LavError Lav_simulationSetThreads(LavHandle simulationHandle, int threads);
 Lav_PUBLIC_FUNCTION LavError Lav_simulationGetThreads(LavHandle simulationHandle, int* destination);
 
+/**Statistics on how the simulation's graph is being scheduled, to help decide how many threads are worthwhile.*/
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetPlannerStatistics(LavHandle simulationHandle, int* destinationTicks, int* destinationReplans, int* destinationBins, int* destinationCulledJobs, int* destinationThreads, double* destinationTime, double* destinationBarrierWaitTime);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetPlannerBinStatistics(LavHandle simulationHandle, int bin, int* destinationTicks, int* destinationJobs, double* destinationTime, double* destinationMaxTime, double* destinationBarrierWaitTime);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetPlannerHistogramLength(LavHandle simulationHandle, int histogram, int* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationReadPlannerHistogram(LavHandle simulationHandle, int histogram, int index, int* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationResetPlannerStatistics(LavHandle simulationHandle);
+
+/**Per-node profiling.*/
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSetProfiling(LavHandle simulationHandle, int profiling);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetProfiling(LavHandle simulationHandle, int* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSetPropertyQueueEnabled(LavHandle simulationHandle, int enabled);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetPropertyQueueEnabled(LavHandle simulationHandle, int* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetPropertyQueueStatistics(LavHandle simulationHandle, int* destinationQueued, int* destinationApplied, int* destinationRejected);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSetSilenceSkipping(LavHandle simulationHandle, int skipping);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetSilenceSkipping(LavHandle simulationHandle, int* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetSilenceStatistics(LavHandle simulationHandle, int* destinationSkipped, int* destinationProcessed);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationResetSilenceStatistics(LavHandle simulationHandle);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationResetProfile(LavHandle simulationHandle);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSnapshotProfile(LavHandle simulationHandle, int* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetProfileEntry(LavHandle simulationHandle, int index, LavHandle* destinationNode, int* destinationCalls, int* destinationCulled, double* destinationTotalTime, double* destinationMaxTime);
+
 Lav_PUBLIC_FUNCTION LavError Lav_simulationCallIn(LavHandle simulationHandle, double when, int inAudioThread, LavTimeCallback cb, void* userdata);
 
 /**Buffers.
@@ -236,11 +269,35 @@ Buffers are chunks of audio data from any source.  A variety of nodes to work wi
 Lav_PUBLIC_FUNCTION LavError Lav_createBuffer(LavHandle simulationHandle, LavHandle* destination);
 Lav_PUBLIC_FUNCTION LavError Lav_bufferGetSimulation(LavHandle bufferHandle, LavHandle* destination);
 Lav_PUBLIC_FUNCTION LavError Lav_bufferLoadFromFile(LavHandle bufferHandle, const char* path);
+typedef void (*LavBufferLoadedCallback)(LavHandle bufferHandle, LavError error, void* userdata);
+Lav_PUBLIC_FUNCTION LavError Lav_bufferLoadFromFileAsync(LavHandle bufferHandle, const char* path, LavBufferLoadedCallback callback, void* userdata);
 Lav_PUBLIC_FUNCTION LavError Lav_bufferLoadFromArray(LavHandle bufferHandle, int sr, int channels, int frames, float* data);
 Lav_PUBLIC_FUNCTION LavError Lav_bufferNormalize(LavHandle bufferHandle);
 Lav_PUBLIC_FUNCTION LavError Lav_bufferGetDuration(LavHandle bufferHandle, float* destination);
 Lav_PUBLIC_FUNCTION LavError Lav_bufferGetLengthInSamples(LavHandle bufferHandle, int* destination);
 
+/**The buffer cache, which shares decoded files between buffers in all simulations.*/
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheGetStatistics(int* destinationHits, int* destinationMisses, int* destinationEvictions, int* destinationEntries, double* destinationMegabytes);
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheSetLimit(double megabytes);
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheGetLimit(double* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheClear();
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheSetDirectory(const char* path);
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheTrimDirectory(double megabytes, double* destinationFreedMegabytes);
+
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheGetStatistics(int* destinationHits, int* destinationMisses, int* destinationEvictions, int* destinationEntries);
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheSetLimit(int entries);
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheGetLimit(int* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheSetQuantization(float degrees);
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheGetQuantization(float* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheClear();
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfPreload(const char* path, int sr);
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfUnpin(const char* path, int sr);
+
+Lav_PUBLIC_FUNCTION LavError Lav_kernelsGetBackendCount(int* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_kernelsGetBackendName(int index, const char** destination);
+Lav_PUBLIC_FUNCTION LavError Lav_kernelsGetBackend(const char** destination);
+Lav_PUBLIC_FUNCTION LavError Lav_kernelsSetBackend(const char* name);
+
 Lav_PUBLIC_FUNCTION LavError Lav_nodeGetSimulation(LavHandle nodeHandle, LavHandle* destination);
 /**Connect two nodes.*/
 Lav_PUBLIC_FUNCTION LavError Lav_nodeConnect(LavHandle nodeHandle, int output, LavHandle destHandle, int input);
@@ -389,9 +446,13 @@ Lav_PUBLIC_FUNCTION LavError Lav_createChannelMergerNode(LavHandle simulationHan
 
 Lav_PUBLIC_FUNCTION LavError Lav_createBufferNode(LavHandle simulationHandle, LavHandle* destination);
 Lav_PUBLIC_FUNCTION LavError Lav_bufferNodeSetEndCallback(LavHandle nodeHandle, LavParameterlessCallback callback, void* userdata);
+Lav_PUBLIC_FUNCTION LavError Lav_bufferNodePlayAt(LavHandle nodeHandle, double time, double offset);
+Lav_PUBLIC_FUNCTION LavError Lav_bufferNodeStopAt(LavHandle nodeHandle, double time);
 
 Lav_PUBLIC_FUNCTION LavError Lav_createBufferTimelineNode(LavHandle simulationHandle, int channels, LavHandle* destination);
 Lav_PUBLIC_FUNCTION LavError Lav_bufferTimelineNodeScheduleBuffer(LavHandle nodeHandle, LavHandle bufferHandle, double time, float pitchBend);
+Lav_PUBLIC_FUNCTION LavError Lav_bufferTimelineNodeScheduleMany(LavHandle nodeHandle, int count, LavHandle* bufferHandles, double* times, float* pitchBends, float* gains, float* azimuths, float* elevations);
+Lav_PUBLIC_FUNCTION LavError Lav_bufferTimelineNodeSetHrtf(LavHandle nodeHandle, const char* hrtfPath);
 
 Lav_PUBLIC_FUNCTION LavError Lav_createRecorderNode(LavHandle simulationHandle, int channels, LavHandle* destination);
 Lav_PUBLIC_FUNCTION LavError Lav_recorderNodeStartRecording(LavHandle nodeHandle, const char* path);
@@ -15,6 +15,7 @@ extern "C" {
 Lav_PUBLIC_FUNCTION LavError Lav_createEnvironmentNode(LavHandle simulationHandle, const char*hrtfPath, LavHandle* destination);
 Lav_PUBLIC_FUNCTION LavError Lav_environmentNodePlayAsync(LavHandle nodeHandle, LavHandle bufferHandle, float x, float y, float z, int isDry);
 Lav_PUBLIC_FUNCTION LavError Lav_environmentNodeAddEffectSend(LavHandle nodeHandle, int channels, int isReverb, int connectByDefault, int* destination);
+Lav_PUBLIC_FUNCTION LavError Lav_environmentNodeUpdateSources(LavHandle nodeHandle, int count, LavHandle* sourceHandles, float* positions, float* orientations);
 
 Lav_PUBLIC_FUNCTION LavError Lav_createSourceNode(LavHandle simulationHandle, LavHandle environmentHandle, LavHandle* destination);
 Lav_PUBLIC_FUNCTION LavError Lav_sourceNodeFeedEffect(LavHandle nodeHandle, int effect);
@@ -34,6 +35,10 @@ enum lav_STANDARD_ENVIRONMENT_PROPERTIES {
 	Lav_ENVIRONMENT_DEFAULT_SIZE = -13,
 	Lav_ENVIRONMENT_OUTPUT_CHANNELS = -14,
 	Lav_ENVIRONMENT_DEFAULT_REVERB_DISTANCE = -15,
+	Lav_ENVIRONMENT_CULL_THRESHOLD = -16,
+	Lav_ENVIRONMENT_MAX_HRTF_SOURCES = -17,
+	Lav_ENVIRONMENT_CULLED_SOURCES = -18,
+	Lav_ENVIRONMENT_DEGRADED_SOURCES = -19,
 };
 
 enum Lav_SOURCE_PROPERTIES {
@@ -46,6 +51,7 @@ enum Lav_SOURCE_PROPERTIES {
 	Lav_SOURCE_MIN_REVERB_LEVEL = -10,
 	Lav_SOURCE_MAX_REVERB_LEVEL = -11,
 	Lav_SOURCE_OCCLUSION = -12,
+	Lav_SOURCE_CONVOLUTION_MODE = -13,
 };
 
 enum Lav_DISTANCE_MODELS {
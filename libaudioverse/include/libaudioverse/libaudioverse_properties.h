@@ -70,6 +70,7 @@ enum Lav_PANNER_PROPERTIES {
 	Lav_PANNER_CHANNEL_MAP = -3,
 	Lav_PANNER_SHOULD_CROSSFADE = -4,
 	Lav_PANNER_STRATEGY = -5,
+	Lav_PANNER_CONVOLUTION_MODE = -6,
 };
 
 enum Lav_PANNER_BANK_PROPERTIES {
@@ -87,6 +88,12 @@ enum Lav_PANNING_STRATEGIES {
 	Lav_PANNING_STRATEGY_SURROUND71 = 5,
 };
 
+enum Lav_CONVOLUTION_MODES {
+	Lav_CONVOLUTION_MODE_AUTOMATIC = 0,
+	Lav_CONVOLUTION_MODE_DIRECT = 1,
+	Lav_CONVOLUTION_MODE_FFT = 2,
+};
+
 
 enum Lav_MIXER_PROPERTIES {
 	Lav_MIXER_MAX_PARENTS = -1,
@@ -149,8 +156,21 @@ enum Lav_BUFFER_PROPERTIES {
 	Lav_BUFFER_ENDED_COUNT = -5,
 };
 
+enum Lav_BUFFER_TIMELINE_PROPERTIES {
+	Lav_BUFFER_TIMELINE_MAX_VOICES = -1,
+	Lav_BUFFER_TIMELINE_VOICE_STEALING = -2,
+	Lav_BUFFER_TIMELINE_VOICE_COUNT = -3,
+	Lav_BUFFER_TIMELINE_STOLEN_VOICE_COUNT = -4,
+};
+
+enum Lav_VOICE_STEALING_STRATEGIES {
+	Lav_VOICE_STEALING_OLDEST = 0,
+	Lav_VOICE_STEALING_QUIETEST = 1,
+};
+
 enum Lav_CONVOLVER_PROPERTIES {
 	Lav_CONVOLVER_IMPULSE_RESPONSE = -1,
+	Lav_CONVOLVER_CONVOLUTION_MODE = -2,
 };
 
 enum Lav_THREE_BAND_EQ_PROPERTIES {
@@ -216,6 +236,8 @@ enum Lav_FILE_STREAMER_PROPERTIES {
 	Lav_FILE_STREAMER_POSITION = -1,
 	Lav_FILE_STREAMER_LOOPING = -2,
 	Lav_FILE_STREAMER_ENDED= -3,
+	Lav_FILE_STREAMER_READ_AHEAD = -4,
+	Lav_FILE_STREAMER_UNDERRUNS = -5,
 };
 
 #ifdef __cplusplus
@@ -10,6 +10,8 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include "../private/callback.hpp"
 #include "../implementations/buffer_player.hpp"
 #include <memory>
+#include <vector>
+#include <stdint.h>
 
 namespace libaudioverse_implementation {
 
@@ -23,8 +25,23 @@ class BufferNode: public Node {
 	void positionChanged();
 	void bufferChanged();
 	virtual void process();
+	//We have no inputs, so we're silent once stopped or ended, until something is written or scheduled.
+	bool isQuiescent() override;
+	//Times are simulation times in seconds, and are rounded to the nearest sample.
+	//Each replaces any start or stop scheduled before it.
+	void playAt(double time, double offset);
+	void stopAt(double time);
 	BufferPlayer player;
 	std::shared_ptr<Callback<void()>> end_callback;
+	private:
+	//Splits the block at the scheduled start and stop.
+	void processScheduled(int channels);
+	//In samples since the simulation started, or -1 if nothing is scheduled.
+	int64_t scheduled_start = -1, scheduled_stop = -1;
+	double scheduled_start_offset = 0.0;
+	//Set by stopAt, cleared by playAt and by writing the position.  Stopped nodes output silence.
+	bool stopped = false;
+	std::vector<float*> segment_outputs;
 };
 
 std::shared_ptr<Node> createBufferNode(std::shared_ptr<Simulation> simulation);
@@ -8,25 +8,70 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include "../private/node.hpp"
 #include <map>
 #include <memory>
+#include <vector>
+#include <stdint.h>
 
 namespace libaudioverse_implementation {
 
 class Simulation;
 class Buffer;
 class BufferPlayer;
+class HrtfData;
+class HrtfPanner;
+
+//One scheduled buffer.
+class TimelineVoice {
+	public:
+	~TimelineVoice();
+	BufferPlayer* player = nullptr;
+	//Only with an HRTF, and only while playing.
+	HrtfPanner* panner = nullptr;
+	float gain = 1.0f, azimuth = 0.0f, elevation = 0.0f;
+	//Scaled by gain.  Before the voice has played, this is just the gain.
+	float level = 0.0f;
+	//In samples since the start of the block the voice starts in.  Only used on its first block.
+	int start_offset = 0;
+	//With an HRTF, the samples of the panner's tail left to render after the player ends, or -1 until it does.
+	int tail_remaining = -1;
+	//Set when stolen: the voice fades out over one block and is then removed.
+	bool stolen = false, has_played = false;
+};
 
 class BufferTimelineNode: public Node {
 	public:
 	BufferTimelineNode(std::shared_ptr<Simulation> simulation, int channels);
 	~BufferTimelineNode();
 	void process() override;
-	void scheduleBuffer(double time, float delta, std::shared_ptr<Buffer> buffer);
+	void scheduleBuffer(double time, float delta, std::shared_ptr<Buffer> buffer, float gain = 1.0f, float azimuth = 0.0f, float elevation = 0.0f);
+	//Pan every voice through this dataset.  Needs 2 channels.
+	void setHrtf(std::shared_ptr<HrtfData> hrtf);
+	bool hasHrtf() {return hrtf != nullptr;}
 	void reset() override;
 	private:
-	std::multimap<double, BufferPlayer*> scheduled_buffers;
+	//Starts the voices whose time falls in this block, stealing if needed.
+	void startVoices();
+	void stealVoice();
+	//Renders into the output and returns true when the voice is done.
+	bool renderVoice(TimelineVoice* voice);
+	void finishVoice(TimelineVoice* voice);
+	HrtfPanner* acquirePanner();
+	//Fills free_panners so that max_voices voices can play without allocating.
+	//Locks the simulation, but not while making the panners.
+	void allocatePanners();
+	//Calls allocatePanners on the simulation's background thread.
+	void maxVoicesChanged();
+	std::multimap<double, TimelineVoice*> scheduled_voices;
+	std::vector<TimelineVoice*> playing_voices;
+	//Panners of finished voices, kept so that starting a voice doesn't allocate.
+	std::vector<HrtfPanner*> free_panners;
+	std::shared_ptr<HrtfData> hrtf = nullptr;
 	std::vector<float*> workspace;
+	//Pointers into workspace, for voices which start partway through a block.
+	std::vector<float*> workspace_offsets;
+	float* mono_workspace = nullptr;
 	double time = 0.0;
 	int output_channels = 0;
+	int stolen_voices = 0;
 };
 
 std::shared_ptr<Node> createBufferTimelineNode(std::shared_ptr<Simulation> simulation, int channels);
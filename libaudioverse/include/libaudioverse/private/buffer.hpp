@@ -6,13 +6,73 @@ A copy of both licenses may be found in license.gpl and license.mpl at the root
 If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
 #pragma once
 #include "memory.hpp"
+#include "error.hpp"
 #include <memory>
+#include <functional>
 #include <atomic>
+#include <string>
+#include <stdint.h>
 
 
 namespace libaudioverse_implementation {
 class Simulation;
 
+/**Decoded, resampled and uninterleaved audio.
+This never changes once created, so buffers and the buffer cache can share it freely.*/
+class BufferData {
+	public:
+	BufferData(int channels, int frames, float* data);
+	//For data which lives in storage, for example a mapped file, that should be released instead of deleting data.
+	BufferData(int channels, int frames, float* data, std::shared_ptr<void> storage);
+	~BufferData();
+	int channels = 0, frames = 0;
+	//Channel-major: all of channel 0, then all of channel 1, and so on.
+	float* data = nullptr;
+	std::shared_ptr<void> storage = nullptr;
+};
+
+//Resample interleaved audio to targetSr and uninterleave it.  Doesn't take ownership of inputData.
+std::shared_ptr<BufferData> createBufferData(int sr, int targetSr, int channels, int frames, float* inputData);
+
+/**The process-wide buffer cache, in buffer_cache.cpp.
+Decoded files are keyed by path, modification time, size, and target sampling rate, and shared between every buffer which loads them.
+The cache holds the most recently used data up to a limit in bytes.  Data evicted from the cache is still shared with any buffers using it.*/
+void initializeBufferCache();
+void shutdownBufferCache();
+//Threadsafe.  Decodes the file only if nothing is already holding it.
+std::shared_ptr<BufferData> loadBufferDataFromFile(std::string path, int targetSr);
+
+class BufferCacheStatistics {
+	public:
+	int hits = 0, misses = 0, evictions = 0, entries = 0;
+	int64_t bytes = 0;
+};
+
+BufferCacheStatistics getBufferCacheStatistics();
+void setBufferCacheLimit(int64_t bytes);
+int64_t getBufferCacheLimit();
+void clearBufferCache();
+
+/**The optional on-disk cache, in buffer_disk_cache.cpp.
+Holds decoded data at the target sampling rate in files which are mapped rather than read, so that processes loading the same file share memory.
+Entries are validated against the absolute path of the source in UTF-8, its modification time and size, and the target sampling rate.
+Everything here is threadsafe, and failing to read or write the cache is never an error: it just means decoding the file.*/
+void initializeBufferDiskCache();
+void shutdownBufferDiskCache();
+//An empty path turns the cache off.
+void setBufferDiskCacheDirectory(std::string path);
+std::shared_ptr<BufferData> readBufferDiskCache(const std::string &path, int64_t modified, int64_t size, int targetSr);
+void writeBufferDiskCache(const std::string &path, int64_t modified, int64_t size, int targetSr, const std::shared_ptr<BufferData> &data);
+//Delete the least recently used entries until the cache is no bigger than maxBytes.  Returns the number of bytes freed.
+int64_t trimBufferDiskCache(int64_t maxBytes);
+
+/**Background loading, in buffer_loading.cpp.
+Files are decoded on a pool of worker threads shared by the whole process.
+done is called on a worker thread with either the data or the error that prevented loading it.*/
+void initializeBufferLoading();
+void shutdownBufferLoading();
+void loadBufferDataFromFileAsync(std::string path, int targetSr, std::function<void(std::shared_ptr<BufferData>, ErrorException*)> done);
+
 class Buffer: public ExternalObject {
 	public:
 	Buffer(std::shared_ptr<Simulation> simulation);
@@ -23,6 +83,14 @@ class Buffer: public ExternalObject {
 	int getChannels();
 	//This can be used outside the lock; the only thing it does is read simulation's sr value which can never change by definition.
 	void loadFromArray(int sr, int channels, int frames, float* inputData);
+	//Use data, possibly shared with other buffers.
+	void setData(std::shared_ptr<BufferData> newData);
+	//Null if the buffer is empty.
+	const std::shared_ptr<BufferData>& getData();
+	//Empty the buffer in preparation for a background load, returning a number to pass to finishLoading.
+	int startLoading();
+	//Use newData if nothing has replaced the buffer's contents since the matching startLoading.  Returns false if the load was superseded.
+	bool finishLoading(int generation, std::shared_ptr<BufferData> newData);
 	//The following two functions do not check if the requested frame is past the end for efficiency.
 	//It is possible the compiler would optimize this, but running  in debug mode is already really painful and the trade-off here is worth it.
 	//a single sample without mixing:
@@ -46,7 +114,11 @@ class Buffer: public ExternalObject {
 	int channels = 0;
 	int frames = 0;
 	int sr = 0;
+	//Points into buffer_data, which may be shared.
 	float* data = nullptr;
+	std::shared_ptr<BufferData> buffer_data;
+	//Incremented whenever the contents are replaced, so that stale background loads can be dropped.
+	int load_generation = 0;
 	std::shared_ptr<Simulation> simulation;
 	std::atomic<int> use_count{0};
 };
@@ -6,12 +6,27 @@ A copy of both licenses may be found in license.gpl and license.mpl at the root
 If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
 #pragma once
 #include <powercores/thread_local_variable.hpp>
+#include <stdint.h>
 #include <string>
 #include <memory>
+#include <mutex>
+#include <map>
+#include <vector>
+#include <tuple>
 #include <kiss_fftr.h>
 
 namespace libaudioverse_implementation {
 
+/**Flags stored alongside the endianness marker of an HRTF file.
+The low bit is always set; the marker is 1 for files without flags.*/
+const int32_t HRTF_FLAG_UNIFORM_GRID = 2;
+const int32_t HRTF_FLAGS_MASK = 0xfe;
+
+class HrtfCacheStatistics {
+	public:
+	int hits = 0, misses = 0, evictions = 0, entries = 0;
+};
+
 class HrtfData {
 	public:
 	HrtfData();
@@ -20,7 +35,13 @@ class HrtfData {
 	void computeCoefficientsMono(float elevation, float azimuth, float* out);
 
 	//warning: writes directly to the output destination, doesn't allocate a new one.
+	//Goes through the coefficient cache, so the angles are rounded to the cache's quantization step unless it's disabled.
 	void computeCoefficientsStereo(float elevation, float azimuth, float* left, float* right);
+	//Adds this dataset's coefficient cache to stats.
+	void addCoefficientCacheStatistics(HrtfCacheStatistics &stats);
+	void clearCoefficientCache();
+	//Allocates room for this many entries, dropping everything cached.  Not for the audio thread.
+	void resizeCoefficientCache(int entries);
 
 	//load from a file.
 	void loadFromFile(std::string path, unsigned int forSr);
@@ -29,22 +50,67 @@ class HrtfData {
 
 	//get the hrir's length.
 	int getLength();
+	//True if the dataset was resampled onto a uniform grid and can be indexed directly.
+	bool isUniformGrid();
 	private:
+	void computeCoefficientsMonoUniform(float elevation, float azimuth, float* out);
+	void computeCoefficientsStereoUncached(float elevation, float azimuth, float* left, float* right);
+	//Quantized elevation and azimuth, in steps.
+	typedef std::tuple<int, int> CoefficientCacheKey;
+	//Call these with coefficient_cache_mutex held.
+	bool lookupCoefficients(const CoefficientCacheKey &key, float step, float* left, float* right);
+	void storeCoefficients(const CoefficientCacheKey &key, float step, float* left, float* right);
+	//The index of key in coefficient_cache_index if it's there, otherwise the empty index where it would go.
+	unsigned int findCoefficientCacheIndex(const CoefficientCacheKey &key);
+	void removeCoefficientCacheIndex(unsigned int index);
 	float* createTemporaryBuffer();
 	void freeTemporaryBuffer(float* b);
 	int elev_count = 0, hrir_count = 0, hrir_length = 0;
 	int min_elevation = 0, max_elevation = 0;
 	int *azimuth_counts = nullptr;
 	int samplerate = 0;
+	//hrirs[elevation][azimuth] points into hrir_storage.
 	float ***hrirs = nullptr;
+	float *hrir_storage = nullptr;
+	//Set up by loadFromBuffer for files with HRTF_FLAG_UNIFORM_GRID.
+	bool uniform_grid = false;
+	float degrees_per_elevation = 0.0f, degrees_per_azimuth = 0.0f;
 	//used for crossfading so we don't clobber the heap.
 	powercores::ThreadLocalVariable<float*> temporary_buffer1, temporary_buffer2;
+	//Stereo coefficients by quantized angle, shared by every panner using this dataset.
+	//The audio thread uses this, so it never allocates: the entries are allocated up front by resizeCoefficientCache, and panners only try the lock.
+	//Entry i's coefficients are at coefficient_cache_storage+2*i*hrir_length, the left response followed by the right.
+	std::mutex coefficient_cache_mutex;
+	float* coefficient_cache_storage = nullptr;
+	std::vector<CoefficientCacheKey> coefficient_cache_keys;
+	//When each entry was last used, for evicting the least recently used one.
+	std::vector<int64_t> coefficient_cache_last_used;
+	int64_t coefficient_cache_clock = 0;
+	int coefficient_cache_entries = 0;
+	//Open addressing with linear probing, from keys to entries.  -1 is empty.  The size is a power of 2, at least twice the number of entries.
+	std::vector<int> coefficient_cache_index;
+	//The step the keys were quantized with. Changing the step empties the cache.
+	float coefficient_cache_step = 0.0f;
+	int coefficient_cache_hits = 0, coefficient_cache_misses = 0, coefficient_cache_evictions = 0;
 };
 
+/**The coefficient caches of all loaded datasets.
+The limit is in entries per dataset, and the quantization step is in degrees.  Either being 0 disables caching.*/
+HrtfCacheStatistics getHrtfCacheStatistics();
+void setHrtfCacheLimit(int entries);
+int getHrtfCacheLimit();
+void setHrtfCacheQuantization(float degrees);
+float getHrtfCacheQuantization();
+void clearHrtfCache();
+
 void initializeHrtfCaches();
 void shutdownHrtfCaches();
 
 //This is threadsafe in and of itself, and will return hrtfs from a cache if it can.
 //Either load from a file or our internal default.
+//Datasets are keyed by the UUID at the start of the file and the sampling rate, and freed when nothing is using them unless pinned.
 std::shared_ptr<HrtfData> createHrtfFromString(std::string path, int forSr);
+//Load a dataset if needed, and keep it loaded until unpinned.
+void pinHrtf(std::string path, int forSr);
+void unpinHrtf(std::string path, int forSr);
 }
\ No newline at end of file
@@ -10,6 +10,7 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <vector>
 #include <map>
 #include <memory>
+#include <stdint.h>
 
 /**See planner.hpp.
 This file is for the Job base class, and reduces dependencies on powercores.*/
@@ -19,7 +20,7 @@ namespace libaudioverse_implementation {
 class Job;
 
 //Places jobs into their bins.
-void binner(std::shared_ptr<Job> job, int tag, std::map<int, std::vector<std::shared_ptr<Job>>> &destination);
+void binner(std::shared_ptr<Job> job, int tag, std::map<int, std::vector<std::shared_ptr<Job>>> &destination, std::set<Job*> &culled);
 /**Compares smart pointers to jobs: terue if job a comes-before job b.
 bool jobComparer(const std::shared_ptr<Job> &a, const std::shared_ptr<Job> &b);
 
@@ -32,9 +33,11 @@ class  Job: public ExternalObject {
 	virtual bool canCull() {return false;}
 	private:
 	bool job_recorded = false;
-	friend void binner(std::shared_ptr<Job> job, int tag, std::map<int, std::vector<std::shared_ptr<Job>>> &destination);
+	//Nanoseconds, a moving average maintained by the planner.
+	int64_t cost_estimate = 0;
+	friend void binner(std::shared_ptr<Job> job, int tag, std::map<int, std::vector<std::shared_ptr<Job>>> &destination, std::set<Job*> &culled);
 	friend class Planner;
-	friend void jobExecutor(std::shared_ptr<Job> &j); //Used by the planner to run jobs.
+	friend int64_t jobExecutor(std::shared_ptr<Job> &j); //Used by the planner to run jobs.
 };
 
 }
\ No newline at end of file
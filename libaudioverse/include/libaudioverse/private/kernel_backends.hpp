@@ -0,0 +1,49 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+#pragma once
+
+namespace libaudioverse_implementation {
+
+/**One implementation of the vectorized kernels in kernels.hpp for one instruction set.
+
+Each backend lives in its own file in src/libaudioverse/kernels, compiled with the flags for its instruction set, and the kernels in kernels.hpp call through whichever is selected.
+Nothing in those files may include headers with inline functions or templates: the linker is free to keep the copy compiled for AVX and use it everywhere.*/
+class KernelBackend {
+	public:
+	const char* name;
+	void (*addition)(int length, float* a1, float* a2, float* dest);
+	void (*scalarAddition)(int length, float c, float* a1, float* dest);
+	void (*multiplication)(int length, float* a1, float* a2, float* dest);
+	void (*scalarMultiplication)(int length, float c, float* a1, float* dest);
+	void (*multiplicationAddition)(int length, float c, float* a1, float* a2, float* dest);
+	void (*parallelMultiplicationAddition)(int length, float c1, float c2, float c3, float c4, float* a1, float* a2, float* out);
+	float (*dot)(int length, const float* v1, const float* v2);
+};
+
+extern const KernelBackend scalar_kernel_backend;
+#if defined(LIBAUDIOVERSE_USE_SSE2)
+extern const KernelBackend sse2_kernel_backend;
+#endif
+#if defined(LIBAUDIOVERSE_USE_AVX)
+extern const KernelBackend avx_kernel_backend;
+//AVX2 and FMA.
+extern const KernelBackend avx2_kernel_backend;
+#endif
+
+/**Selects the most capable backend this processor supports.
+Until this runs, the kernels use the scalar backend.*/
+void initializeKernelBackends();
+void shutdownKernelBackends();
+
+//The backends this processor supports, least capable first.
+int getSupportedKernelBackendCount();
+const KernelBackend* getSupportedKernelBackend(int index);
+const KernelBackend* getKernelBackend();
+//Errors with Lav_ERROR_RANGE if the backend doesn't exist or the processor doesn't support it.
+void setKernelBackend(const char* name);
+
+}
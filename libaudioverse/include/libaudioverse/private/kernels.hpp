@@ -17,6 +17,7 @@ void uninterleaveSamples(unsigned int channels, unsigned int frames, float* samp
 void interleaveSamples(unsigned int channels, unsigned int frames, unsigned int inputCount, float** inputs, float* output);
 
 //primitive math operations.
+//These and dotKernel are implemented once per instruction set, and forward to the best the processor supports.  See kernel_backends.hpp.
 //It is safe to use these such that dest==a1 or dest==a2.
 void additionKernel(int length, float* a1, float* a2, float* dest);
 void scalarAdditionKernel(int length, float c, float*a1, float* dest);
@@ -37,8 +38,10 @@ The first response-1 samples of the input buffer are assumed to be a running his
 */
 void convolutionKernel(float* input, int outputSampleCount, float* output, int responseLength, float* response);
 
-/**Same as convolutionKernel, but will crossfade from the first response to the second smoothly over the interval outputSampleCount.*/
-void crossfadeConvolutionKernel(float* input, unsigned int outputSampleCount, float* output, unsigned int responseLength, float* from, float* to);
+/**Linear crossfade over length samples, starting fully at from and ending just short of fully at to.
+To crossfade between two responses, convolve with each and crossfade the outputs: this is the same as blending the responses per sample, but far cheaper.
+dest may be either input.*/
+void crossfadeKernel(int length, float* from, float* to, float* dest);
 
 /**The panning kernels.  All arguments are self-explanatory.
 The channel order must be the angles of all channels, specified clockwise where 0 is "in front" of the listener and angles proceed clockwise (this is to match HRTF; note that it is not standard trig).
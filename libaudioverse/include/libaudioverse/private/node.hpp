@@ -20,6 +20,7 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 namespace libaudioverse_implementation {
 
 class Property;
+class Buffer;
 class InputConnection;
 class OutputConnection;
 
@@ -113,6 +114,10 @@ class Node: public Job {
 	//Override hook for resetting.
 	virtual void reset();
 
+	//Called when the contents of a buffer change underneath it, as happens when a background load finishes.
+	//The default refires the changed callbacks of every buffer property set to it.
+	virtual void bufferDataChanged(std::shared_ptr<Buffer> buffer);
+
 	//change number of input and output buffers.
 	virtual void resize(int newInputCount, int newOutputCount);
 
@@ -124,6 +129,23 @@ class Node: public Job {
 	
 	//Various optimizations that subclasses can enable.
 	void setShouldZeroOutputBuffers(bool v);
+
+	/**Silence propagation.
+	A node which has set a silence tail is skipped once all of its inputs have been silent for at least that many samples and its last output was silent.
+	Skipped nodes don't tick their properties or call process, and their output connections add nothing.
+	-1, the default, means never skip.  Nodes with state that outlives their input, i.e. delay lines, must report how long it lasts.
+	Sources can also override isQuiescent to say when they're done.*/
+	void setSilenceTail(int samples);
+	//True if the last tick was skipped, so that the outputs are known to be zero.
+	bool isOutputSilent() {return output_silent;}
+	int64_t getSkippedTickCount() {return skipped_ticks;}
+	int64_t getProcessedTickCount() {return processed_ticks;}
+	void resetSilenceStatistics() {skipped_ticks = processed_ticks = 0;}
+
+	//Profiling support. These are only updated while the simulation is profiling.
+	NodeProfile& getProfile() {return profile;}
+	//Called by the simulation after every profiled tick.
+	void recordProfiledTick(int tickCount);
 	protected:
 	std::shared_ptr<Simulation> simulation = nullptr;
 	std::map<int, Property> properties;
@@ -148,6 +170,18 @@ class Node: public Job {
 	
 	//various optimization flags.
 	bool should_zero_output_buffers = true; //Enable/disable zeroing output buffers on tick if node is unpaused.
+	NodeProfile profile;
+	//True if every input and every node connected to a property is paused or silent, and nothing has been written to our properties since we last processed.
+	bool areInputsSilent();
+	//Whether to skip, given that our inputs are silent.
+	//The default is true once the silence tail has passed and our last output was quiet.
+	//Sources override this to say that they've finished on their own.
+	virtual bool isQuiescent();
+	//True if every output is below -100 DB.
+	bool areOutputsQuiet();
+	int silence_tail = -1, silent_input_samples = 0;
+	bool output_silent = false, last_output_quiet = false;
+	int64_t skipped_ticks = 0, processed_ticks = 0;
 	template<typename JobT, typename CallableT, typename... ArgsT>
 	friend void nodeVisitDependencies(JobT&& start, CallableT&& callable, ArgsT&&... args);
 };
@@ -9,25 +9,95 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <set>
 #include <vector>
 #include <memory>
+#include <atomic>
+#include <future>
+#include <stdint.h>
 #include <powercores/thread_pool.hpp>
 #include "job.hpp"
 
 /**job.hpp contains the rest of this code.*/
 
 namespace libaudioverse_implementation {
+
+const int PLANNER_HISTOGRAM_BUCKETS = 32;
+//Estimated nanoseconds of work below which handing jobs to another thread costs more than it saves.
+const int64_t PLANNER_MIN_CHUNK_COST = 20000;
+//The schedule is recomputed from fresh cost estimates this often, in ticks.
+//It only replaces the current one if the stages changed shape or it is predicted to be faster by more than 1/PLANNER_RESCHEDULE_GAIN, so that noise in the estimates doesn't shuffle jobs around.
+const int PLANNER_RESCHEDULE_INTERVAL = 64;
+const int PLANNER_RESCHEDULE_GAIN = 8;
+
+/**The planner bins jobs by depth, but doesn't run the bins directly.
+Instead, it builds a schedule of stages from the bins and their measured costs.
+A bin which is too cheap or too narrow to split across threads becomes part of a serial stage, merged with its neighbours, so that chains of jobs run on one thread with no synchronization.
+Other bins become parallel stages, whose jobs are divided into chunks of roughly equal cost.
+The calling thread always runs the first chunk of every stage itself.*/
+class PlannerStage {
+	public:
+	//Indices into the flattened plan.  Chunks may run concurrently; the jobs of a chunk run in order.
+	std::vector<std::vector<int>> chunks;
+	int jobs = 0;
+};
+
+/**Cumulative statistics for one stage of the current schedule.
+Reset whenever the schedule changes, because the stages of the old schedule no longer mean anything.
+Times are in seconds.*/
+class PlannerBinStatistics {
+	public:
+	int ticks = 0, jobs = 0;
+	double time = 0.0, max_time = 0.0, barrier_wait_time = 0.0;
+};
+
+/**What the planner has been doing since it was created or last reset.
+barrier_wait_time is thread time spent idle inside a stage: the stage's wall time times the number of chunks, minus the time spent running jobs.
+The width histogram is indexed by the number of jobs in a stage, with the last bucket holding everything wider.
+threads is the number of threads actually used, which is chosen by the planner if the simulation asked for 0.
+The time histograms use power-of-two buckets of microseconds: bucket 0 is under 1 microsecond and bucket n is from 2^(n-1) up to 2^n microseconds.*/
+class PlannerStatistics {
+	public:
+	void reset();
+	int ticks = 0, replans = 0, culled_jobs = 0, threads = 1;
+	double time = 0.0, barrier_wait_time = 0.0;
+	std::vector<PlannerBinStatistics> bins;
+	int width_histogram[PLANNER_HISTOGRAM_BUCKETS] = {0};
+	int bin_time_histogram[PLANNER_HISTOGRAM_BUCKETS] = {0};
+	int barrier_wait_histogram[PLANNER_HISTOGRAM_BUCKETS] = {0};
+};
+
+/**Filled in as the chunks of a stage run, possibly on several threads. Times are nanoseconds from an arbitrary epoch.*/
+class PlannerBinTiming {
+	public:
+	void reset();
+	void record(int64_t start, int64_t end, int64_t busyTime);
+	std::atomic<int64_t> busy{0}, first_start{0}, last_end{0};
+};
+
 class Planner {
 	public:
 	Planner();
 	~Planner();
 	
-	//These three functions make up the planning logic; the entry point is execute.
-	//Threads must be greater than 0.	
+	//The entry point.  If threads is 0, the planner picks a thread count from the costs of the jobs.
 	void execute(std::shared_ptr<Job> start, int threads = 1);
-	void runJobsSync();
-	void runJobsAsync();
 	
 	void invalidatePlan();
+	PlannerStatistics& getStatistics() {return statistics;}
+	void resetStatistics();
 	private:
+	//Build a schedule from the plan and the current cost estimates into next_schedule, and swap it in if it differs.
+	void reschedule(int requestedThreads);
+	//The most threads any bin can use, given the cost estimates.
+	int chooseThreadCount();
+	//The next unused stage of next_schedule, emptied but keeping its capacity.
+	PlannerStage& appendStage(int chunks);
+	void fillParallelStage(PlannerStage &stage, std::vector<std::shared_ptr<Job>> &bin, int firstIndex);
+	//The estimated time of a schedule: the sum over its stages of the most expensive chunk.
+	int64_t estimateScheduleCost(std::vector<PlannerStage> &stages, int count);
+	void ensureThreadPool(int threads);
+	void runSchedule();
+	void runChunk(std::vector<int> *chunk, PlannerBinTiming* timing);
+	//Record one stage of the current tick.
+	void recordBin(int index, int jobs, int64_t wallTime, int64_t busyTime, int threads);
 	void replan(std::shared_ptr<Job> start);
 	//After every tick, kill the shared pointers so that we can let things die.
 	void clearStrongPlan();
@@ -42,6 +112,20 @@ class Planner {
 	bool started_thread_pool = false;
 	int last_thread_count = 0;
 	powercores::ThreadPool thread_pool{0};
+	//The plan in bin order, rebuilt every tick.
+	std::vector<std::shared_ptr<Job>> ordered;
+	//Stages are never freed, so that rescheduling can reuse them.  Only the first scheduled_stages are in use.
+	std::vector<PlannerStage> schedule, next_schedule;
+	int scheduled_stages = 0, next_stage_count = 0;
+	//Scratch space for fillParallelStage.
+	std::vector<int> stage_order;
+	std::vector<int64_t> chunk_loads;
+	bool schedule_is_valid = false, schedule_has_unmeasured_jobs = false;
+	int ticks_since_schedule = 0, scheduled_request = -1, scheduled_threads = 1;
+	std::vector<std::future<void>> chunk_futures;
+	PlannerStatistics statistics;
+	//One per stage of the current schedule.
+	std::vector<std::unique_ptr<PlannerBinTiming>> bin_timings;
 };
 
 }
\ No newline at end of file
@@ -60,11 +60,15 @@ class Property {
 	std::shared_ptr<InputConnection> getInputConnection();
 	//returns true if this property was written after it was last ticked.
 	bool wasModified();
+	//True if written since the last tick, so that the next tick will see a modification.
+	bool hasPendingModification();
 
 	void updateAutomatorIndex(double t);
 	void scheduleAutomator(Automator* automator);
 	//Cancels all automation after time t. T is relative to the property's current time.
 	void cancelAutomators(double time);
+	//True if automators are scheduled that haven't finished.
+	bool isAutomated();
 	//yes, really. This is as uggly as it looks.
 	int getIntValue();
 	void setIntValue(int v, bool avoidCallbacks = false);
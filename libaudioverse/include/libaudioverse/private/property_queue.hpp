@@ -0,0 +1,55 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+#pragma once
+#include <atomic>
+#include <memory>
+#include <stddef.h>
+
+namespace libaudioverse_implementation {
+
+class Node;
+
+/**One write to an int, float, double, float3, or float6 property.
+Only the fields for the property's type are used.*/
+class PropertyWrite {
+	public:
+	PropertyWrite() = default;
+	PropertyWrite(std::shared_ptr<Node> node, int slot, int type): node(node), slot(slot), type(type) {}
+	//Does the write.  Call with the simulation's lock held.  Errors exactly like the corresponding Lav_nodeSetXProperty.
+	void apply();
+	std::weak_ptr<Node> node;
+	int slot = 0, type = 0;
+	int int_value = 0;
+	double double_value = 0.0;
+	float float_values[6] = {0.0f};
+};
+
+/**A bounded queue of property writes with any number of producers and one consumer.
+
+Producers never block and never allocate; push fails if the queue is full.
+The simulation only pops with its lock held, which is what makes there be only one consumer.
+This is Dmitry Vyukov's bounded queue: each cell has a sequence number saying whether it is ready to be written or read for the current lap of the ring.*/
+class PropertyWriteQueue {
+	public:
+	//capacity must be a power of 2.
+	PropertyWriteQueue(size_t capacity = 1024);
+	~PropertyWriteQueue();
+	bool push(const PropertyWrite &write);
+	bool pop(PropertyWrite &destination);
+	private:
+	class Cell {
+		public:
+		std::atomic<size_t> sequence;
+		PropertyWrite write;
+	};
+	Cell* cells = nullptr;
+	size_t mask = 0;
+	std::atomic<size_t> push_position{0};
+	size_t pop_position = 0;
+};
+
+}
@@ -16,9 +16,12 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <tuple>
 #include <map>
 #include <random>
+#include <atomic>
+#include <stdint.h>
 #include "../libaudioverse.h"
 #include "memory.hpp"
 #include "job.hpp"
+#include "property_queue.hpp"
 
 namespace libaudioverse_implementation {
 
@@ -26,6 +29,14 @@ class Node;
 class Device;
 class InputConnection;
 class Planner;
+class Buffer;
+
+/**Per-node counters kept while the simulation is profiling.  Times are in nanoseconds.
+culled counts ticks in which the node existed but didn't run, because it was paused or nothing needed its output.*/
+class NodeProfile {
+	public:
+	int64_t calls = 0, culled = 0, total_time = 0, max_time = 0;
+};
 
 /*When thrown on the background thread, terminates it.*/
 class ThreadTerminationException {
@@ -52,6 +63,8 @@ class Simulation: public Job {
 	void unregisterNodeForAlwaysPlaying(std::shared_ptr<Node> which);
 	//If we need maintenance.
 	void registerNodeForMaintenance(std::shared_ptr<Node> which);
+	//Tell every node using buffer that its contents were replaced.  Call with the lock held.
+	void bufferDataChanged(std::shared_ptr<Buffer> buffer);
 	
 	float getSr() { return sr;}
 	int getTickCount() {return tick_count;}
@@ -62,8 +75,12 @@ class Simulation: public Job {
 
 	//associate with the specified device index.
 	//This must absolutely absolutely absolutely be called without the lock, it's threadsafe.
-	void setOutputDevice(int index, int channels);
+	//Latencies are in seconds, and are hints to the backend.
+	void setOutputDevice(int index, int channels, double minLatency = 0.0, double startLatency = 0.1, double maxLatency = 0.2);
 	void clearOutputDevice();
+	//Copies the output device's statistics, so that the callback times can be read by index.  All zeros without a device.
+	audio_io::OutputDeviceStatistics snapshotLatencyStatistics();
+	double getLatencySnapshotCallbackTime(int index);
 
 	//Tasks that need to run in the background.
 	void enqueueTask(std::function<void(void)>);
@@ -76,6 +93,33 @@ class Simulation: public Job {
 	//Thread support.
 	void setThreads(int n);
 	int getThreads();
+	Planner* getPlanner() {return planner;}
+	//Per-node profiling.  When off, nodes only pay for checking isProfiling.
+	bool isProfiling() {return profiling;}
+	void setProfiling(bool p) {profiling = p;}
+	void resetProfile();
+	//Copies every node's profile, so that it can be read by index without racing the audio thread. Returns the number of entries.
+	int snapshotProfile();
+	std::tuple<std::shared_ptr<Node>, NodeProfile> getProfileSnapshotEntry(int index);
+
+	//Silence propagation, see Node::setSilenceTail.  On by default.
+	bool getSilenceSkipping() {return silence_skipping;}
+	void setSilenceSkipping(bool s) {silence_skipping = s;}
+	//Sums the skipped and processed tick counts of every node that still exists.
+	void getSilenceStatistics(int64_t &skipped, int64_t &processed);
+	void resetSilenceStatistics();
+
+	//Property writes from threads that would otherwise wait for the audio thread.
+	//When enabled and the lock is held elsewhere, writes are queued and applied at the start of the next block.
+	bool isPropertyQueueEnabled() {return property_queue_enabled.load(std::memory_order_relaxed);}
+	void setPropertyQueueEnabled(bool enabled);
+	//Does the write now if it can, otherwise queues it.  Call without the lock, though holding it is fine.
+	void writeProperty(const PropertyWrite &write);
+	//Call with the lock held.
+	void applyQueuedPropertyWrites();
+	int64_t getQueuedPropertyWrites() {return queued_property_writes.load(std::memory_order_relaxed);}
+	int64_t getAppliedPropertyWrites() {return applied_property_writes;}
+	int64_t getRejectedPropertyWrites() {return rejected_property_writes;}
 
 	//called when connections are formed or lost, or when a node is deleted.
 	void invalidatePlan();
@@ -138,6 +182,15 @@ class Simulation: public Job {
 	
 	Planner* planner = nullptr;
 	int threads = 1;
+	bool profiling = false;
+	bool silence_skipping = true;
+	std::vector<std::tuple<std::weak_ptr<Node>, NodeProfile>> profile_snapshot;
+	audio_io::OutputDeviceStatistics latency_snapshot;
+	std::atomic<bool> property_queue_enabled{false};
+	PropertyWriteQueue property_queue;
+	//Queued counts writes that went through the queue, applied and rejected those that came out of it.
+	std::atomic<int64_t> queued_property_writes{0};
+	int64_t applied_property_writes = 0, rejected_property_writes = 0;
 	
 	template<typename JobT, typename CallableT, typename... ArgsT>
 	friend void simulationVisitDependencies(JobT&& start, CallableT&& callable, ArgsT&&... args);
@@ -53,6 +53,14 @@ enumerations:
       Lav_LOGGING_LEVEL_CRITICAL: Logs critical messages such as failures to initialize and error conditions.
       Lav_LOGGING_LEVEL_INFO: Logs informative messages.
       Lav_LOGGING_LEVEL_DEBUG: Logs everything possible.
+  Lav_PLANNER_HISTOGRAMS:
+    doc_description: |
+      The histograms kept by a simulation's planner, for use with {{"Lav_simulationReadPlannerHistogram"|function}}.
+      Every tick adds one sample per stage of the schedule to each histogram.
+    members:
+      Lav_PLANNER_HISTOGRAM_WIDTH: Indexed by the number of jobs in a stage.  The last bucket also counts all wider stages.
+      Lav_PLANNER_HISTOGRAM_TIME: The wall time of each stage, in power-of-two buckets of microseconds. Bucket 0 is under 1 microsecond and bucket n is from 2^(n-1) up to 2^n microseconds.
+      Lav_PLANNER_HISTOGRAM_BARRIER_WAIT: The thread time spent idle in each stage waiting for its slowest chunk, in the same buckets as {{"Lav_PLANNER_HISTOGRAM_TIME"|codelit}}.
   Lav_PANNING_STRATEGIES:
     doc_description: |
       Indicates a strategy to use for panning.
@@ -64,6 +72,19 @@ enumerations:
       Lav_PANNING_STRATEGY_SURROUND40: Indicates 4.0 surround sound (quadraphonic) panning.
       Lav_PANNING_STRATEGY_SURROUND51: Indicates 5.1 surround sound panning.
       Lav_PANNING_STRATEGY_SURROUND71: Indicates 7.1 surround sound panning.
+  Lav_CONVOLUTION_MODES:
+    doc_description: |
+      How convolution is performed, for nodes that convolve such as the {{"Lav_OBJTYPE_CONVOLVER_NODE"|node}} and HRTF panners.
+    members:
+      Lav_CONVOLUTION_MODE_AUTOMATIC: Choose direct or FFT convolution based on the response length and the block size.
+      Lav_CONVOLUTION_MODE_DIRECT: Always convolve directly, which is cheapest for short responses and small blocks.
+      Lav_CONVOLUTION_MODE_FFT: Always use partitioned FFT convolution, which is cheapest for long responses and large blocks.
+  Lav_VOICE_STEALING_STRATEGIES:
+    doc_description: |
+      Which voice the {{"Lav_OBJTYPE_BUFFER_TIMELINE_NODE"|node}} stops when it has to start a voice and is already playing as many as it may.
+    members:
+      Lav_VOICE_STEALING_OLDEST: Stop the voice which started first.
+      Lav_VOICE_STEALING_QUIETEST: Stop the voice whose last block was quietest, after its gain.  Voices which haven't played yet are assumed to be at full scale.
   Lav_BIQUAD_TYPES:
     doc_description: |
       Indicates a biquad filter type, used with the {{"Lav_OBJTYPE_BIQUAD_NODE"|node}} and in a few other places.
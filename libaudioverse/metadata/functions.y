@@ -174,33 +174,89 @@ functions:
       channels: The number of channels we want. The simulations' output will be upmixed or downmixed as appropriate.
       mayApplyMixingMatrix: If 0, drop any additional channels in the simulation's output and set any  missing channels in the simulation's output to 0. Otherwise, if we can, apply a mixing matrix.
       buffer: The memory to which to write the result.
+  Lav_simulationGetBlocks:
+    category: simulations
+    doc_description: |
+      Gets several consecutive blocks of audio from the simulation in one call, advancing its time by that many blocks.
+      This is equivalent to calling `Lav_simulationGetBlock` in a loop, but avoids the per-call overhead and is how the bindings render offline faster than realtime.
+      The blocks are written one after the other, so {{"buffer"|param}} must hold the simulation's block size times {{"channels"|param}} times {{"blocks"|param}} floating point values.
+      The simulation is locked and unlocked around each block, not for the entire call.
+    params:
+      simulationHandle: The handle of the simulation to read blocks from.
+      channels: The number of channels we want. The simulations' output will be upmixed or downmixed as appropriate.
+      mayApplyMixingMatrix: If 0, drop any additional channels in the simulation's output and set any  missing channels in the simulation's output to 0. Otherwise, if we can, apply a mixing matrix.
+      blocks: The number of blocks to compute.
+      buffer: The memory to which to write the result.
   Lav_simulationGetSr:
     category: simulations
     doc_description: |
       Query the simulation's sampling rate.
+  Lav_simulationGetCurrentTime:
+    category: simulations
+    doc_description: |
+      Query the simulation's time in seconds: the time at which the next block it computes starts.
+      This begins at 0 when the simulation is created, and advances by one block every time a block is computed.
+      
+      This is the clock used by {{"Lav_bufferNodePlayAt"|function}} and {{"Lav_bufferNodeStopAt"|function}}.
+      Schedule slightly ahead of it, by at least the output device's latency, to get consistent timing.
   Lav_simulationSetOutputDevice:
     category: simulations
     doc_description: |
       Set the output device of the simulation.
-      -1 is the system default.  0 and above are specific audio devices, matching the indices returned by the enumeration functions.
+      "default" is the system default.  "0" and above are specific audio devices, matching the identifiers returned by the enumeration functions.
       
       Note that it is possible to change the output device of a simulation even after it has been set.
       
       After the output device has been set, calls to `Lav_simulationGetBlock` will error.
       
-      The parameters {{"minLatency"|param}}, {{"startLatency"|param}}, and {{"maxLatency"|param}} are hints as to the latency you wish to have.
+      This is {{"Lav_simulationSetOutputDeviceWithLatency"|function}} with a minimum latency of 0, a start latency of 0.1 seconds, and a maximum latency of 0.2 seconds.
+    params:
+      device: The identifier of the output device the simulation is to play on.
+      channels: The number of channels we wish to output.
+  Lav_simulationSetOutputDeviceWithLatency:
+    category: simulations
+    doc_description: |
+      Set the output device of the simulation, with hints as to the latency you wish to have.
+      
       The audio backends attempt to optimize themselves according to the CPU load of your application and other factors.
       These parameters control this optimization.
       If your application can suddenly and frequently cause CPU usage to spike, set {{"minLatency"|param}} to something greater than 0.
       The {{"startLatency"|param}} parameter is the latency at which the audio backend will start audio.
       This should usually be somewhat high, as applications often begin by creating a large number of objects.
       The audio backends will reduce latency as rapidly as is safe.
+      Each underrun raises the minimum by 5 milliseconds, up to the maximum.
+      {{"Lav_simulationGetLatencyStatistics"|function}} reports what the backend decided.
     params:
-      index: The output device  the simulation is to play on.
+      device: The identifier of the output device the simulation is to play on.
       channels: The number of channels we wish to output.
       minLatency: The minimum latency your application can tolerate. 0.0 is a good value in most cases.
       startLatency: A hint as to the latency the audio backend should start with. 0.05 is a suggested default.
       maxLatency: The maximum latency your application can tolerate. 0.1 or even 0.2 is a suggested default.
+  Lav_simulationGetLatencyStatistics:
+    category: simulations
+    doc_description: |
+      Query how the output device is managing latency.
+      
+      The audio backends time each pass through the device, including computing the simulation's audio, and aim for a latency just above the longest recent pass.
+      Underruns raise the minimum latency.
+      All times are in seconds, and everything is 0 if the simulation has no output device.
+      
+      This also takes a copy of the recent pass times, which {{"Lav_simulationGetCallbackTime"|function}} reads.
+      Backends may differ slightly in what they measure, and the Winmm backend rounds its latency to whole buffers.
+    params:
+      destinationLatency: The latency the backend is currently aiming for.
+      destinationLatencyBlocks: The same, in blocks of this simulation, rounded up.
+      destinationMinLatency: The current minimum latency.
+      destinationMaxLatency: The maximum latency.
+      destinationUnderruns: How many times the device ran out of audio.
+      destinationCallbacks: The number of pass times copied.
+  Lav_simulationGetCallbackTime:
+    category: simulations
+    doc_description: |
+      Read a pass time copied by {{"Lav_simulationGetLatencyStatistics"|function}}, in seconds.
+      Index 0 is the oldest.
+    params:
+      index: Which pass.
   Lav_simulationClearOutputDevice:
     category: simulations
     doc_description: |
@@ -260,15 +316,178 @@ functions:
     doc_description: |
       Set the number of threads that the simulation is allowed to use.
       
-      The value of the threads parameter may be from 1 to infinity.
+      The value of the threads parameter may be from 1 to infinity, or 0 to let Libaudioverse decide.
       When set to 1, processing happens in the thread who calls {{"Lav_simulationGetBlock"|function}}.
-      All other values sleep the thread calling {{"Lav_simulationGetBlock"|function}} and perform processing in background threads.
+      Otherwise, the thread calling {{"Lav_simulationGetBlock"|function}} shares the work with up to this many minus one background threads.
+      
+      Libaudioverse measures how long every node takes and only splits work across threads when there is enough of it to pay for the synchronization.
+      Chains of nodes and cheap parts of the graph always run on one thread, so narrow graphs are not slowed down by extra threads.
+      When set to 0, the thread count is the widest parallelism the graph can use, at most the number of cores, and is reconsidered as the graph and its costs change.
+      {{"Lav_simulationGetPlannerStatistics"|function}} reports the count in use.
     params:
-      threads: The number of threads to use for processing.  Must be at least 1.  Typical values include 1 and 1 less than the available cores.
+      threads: The number of threads to use for processing.  Typical values include 0, 1, and 1 less than the available cores.
   Lav_simulationGetThreads:
     category: simulations
     doc_description: |
       Get the number of threads that the simulation is currently using.
+      This is 0 if Libaudioverse is choosing.
+  Lav_simulationGetPlannerStatistics:
+    category: simulations
+    doc_description: |
+      Query statistics on how the simulation has been scheduling its graph since it was created or {{"Lav_simulationResetPlannerStatistics"|function}} was last called.
+      
+      The planner divides the nodes that need processing into bins by their depth in the graph.
+      A plan is reused until something invalidates it, for example connecting or disconnecting nodes or pausing one.
+      The bins are then turned into a schedule of stages using the measured cost of every node.
+      Bins that are expensive enough are split into chunks which run in parallel, and each becomes its own stage.
+      Consecutive cheap or narrow bins are merged into one stage which runs on one thread.
+      Each stage must finish before the next begins.
+      
+      Barrier wait time is the thread time spent idle because a stage was waiting for its slowest chunk: the stage's wall time times its number of chunks, minus the time spent processing.
+      If it is a large fraction of the time times the thread count, adding threads will not help this graph.
+      All times are in seconds.
+    params:
+      destinationTicks: The number of ticks.
+      destinationReplans: The number of times the plan was rebuilt.
+      destinationBins: The number of stages in the current schedule.
+      destinationCulledJobs: The number of jobs left out of the current plan because they did not need to run.
+      destinationThreads: The number of threads used by the last tick.
+      destinationTime: The total wall time spent processing the graph.
+      destinationBarrierWaitTime: The total barrier wait time.
+  Lav_simulationGetPlannerBinStatistics:
+    category: simulations
+    doc_description: |
+      Query statistics for one stage of the current schedule.  These are reset whenever the schedule changes.
+      See {{"Lav_simulationGetPlannerStatistics"|function}}.
+    params:
+      bin: The index of the stage, from 0 to the number of stages minus 1.  Stages run in order of index.
+      destinationTicks: The number of ticks this stage has run.
+      destinationJobs: The number of jobs in this stage.
+      destinationTime: The total wall time of this stage.
+      destinationMaxTime: The longest wall time of this stage in any tick.
+      destinationBarrierWaitTime: The total barrier wait time of this stage.
+  Lav_simulationGetPlannerHistogramLength:
+    category: simulations
+    doc_description: |
+      Get the number of buckets in one of the planner's histograms.
+    params:
+      histogram: A value from the {{"Lav_PLANNER_HISTOGRAMS"|enum}} enumeration.
+  Lav_simulationReadPlannerHistogram:
+    category: simulations
+    doc_description: |
+      Read one bucket of one of the planner's histograms.
+    params:
+      histogram: A value from the {{"Lav_PLANNER_HISTOGRAMS"|enum}} enumeration.
+      index: The bucket to read.
+  Lav_simulationResetPlannerStatistics:
+    category: simulations
+    doc_description: |
+      Reset all of the simulation's planner statistics to 0.
+  Lav_simulationSetProfiling:
+    category: simulations
+    doc_description: |
+      Turn per-node profiling on or off.
+      
+      While profiling, every node records how many times it ran, how long it took, and how many ticks it was culled because it was paused or nothing needed its output.
+      The clock is monotonic and read twice per node per tick.
+      When profiling is off, nodes record nothing.
+      Counters are kept when profiling is turned off; use {{"Lav_simulationResetProfile"|function}} to clear them.
+    params:
+      profiling: 1 to profile, 0 to stop.
+  Lav_simulationGetProfiling:
+    category: simulations
+    doc_description: |
+      Query whether the simulation is profiling.
+  Lav_simulationSetPropertyQueueEnabled:
+    category: simulations
+    doc_description: |
+      Let property writes from other threads skip waiting for the audio thread.
+      
+      Setting an int, float, double, float3, or float6 property normally takes the simulation's lock, so a thread that sets one while a block is being computed waits for the block to finish.
+      With the queue enabled, such writes are instead put in a lock-free queue and applied at the start of the next block, in the order they were made.
+      Writes which don't have to wait are done immediately, as before.
+      
+      A queued write returns before it happens.
+      Reading the property back may give the old value until the next block, and errors such as values out of range or writes to nodes deleted in the meantime can't be reported.
+      Such writes are dropped, and counted by {{"Lav_simulationGetPropertyQueueStatistics"|function}}.
+      If the queue is full, writes wait for the lock as they would with the queue disabled.
+      
+      Disabling the queue applies anything still in it.
+    params:
+      enabled: 1 to queue writes, 0 to always wait.
+  Lav_simulationGetPropertyQueueEnabled:
+    category: simulations
+    doc_description: |
+      Query whether property writes may be queued.
+      See {{"Lav_simulationSetPropertyQueueEnabled"|function}}.
+  Lav_simulationGetPropertyQueueStatistics:
+    category: simulations
+    doc_description: |
+      Count the property writes which went through the queue described in {{"Lav_simulationSetPropertyQueueEnabled"|function}}.
+      
+      The queued count less the other two is the number still waiting for the next block.
+    params:
+      destinationQueued: Writes put in the queue.
+      destinationApplied: Queued writes which have been applied.
+      destinationRejected: Queued writes dropped because they errored.
+  Lav_simulationSetSilenceSkipping:
+    category: simulations
+    doc_description: |
+      Let nodes skip blocks in which they would only output silence.
+      
+      Some nodes, filters and panners among them, know how long their output continues after their input stops.
+      Once every input of such a node has been silent for that long, and its last output was below -100 DB, the node stops computing and outputs silence until something connected to it makes sound again.
+      Paused nodes and skipped nodes both count as silent, so silence propagates down chains of such nodes.
+      Buffer nodes are skipped once they are stopped or reach the end without looping, so whatever they feed goes quiet after them.
+      Nodes with automators scheduled on any property are never skipped, and writing to any property of a skipped node wakes it.
+      
+      A skipped node's properties don't advance, as with paused nodes, so changes made while it is skipped take effect on its next processed block.
+      
+      This is on by default.
+    params:
+      skipping: 1 to skip silent nodes, 0 to always process them.
+  Lav_simulationGetSilenceSkipping:
+    category: simulations
+    doc_description: |
+      Query whether silent nodes are skipped.
+      See {{"Lav_simulationSetSilenceSkipping"|function}}.
+  Lav_simulationGetSilenceStatistics:
+    category: simulations
+    doc_description: |
+      Count how many node ticks were skipped because of silence and how many were processed.
+      
+      Only nodes which still exist are counted.
+      Paused nodes count as neither.
+    params:
+      destinationSkipped: Ticks skipped because the node was silent.
+      destinationProcessed: Ticks in which the node was processed.
+  Lav_simulationResetSilenceStatistics:
+    category: simulations
+    doc_description: |
+      Set the counts returned by {{"Lav_simulationGetSilenceStatistics"|function}} to 0.
+  Lav_simulationResetProfile:
+    category: simulations
+    doc_description: |
+      Clear the profiling counters of every node in this simulation.
+  Lav_simulationSnapshotProfile:
+    category: simulations
+    doc_description: |
+      Copy the profiling counters of every node in this simulation, so that they can be read with {{"Lav_simulationGetProfileEntry"|function}}.
+      The snapshot replaces the previous one and holds only weak references to the nodes.
+    params:
+      destination: The number of entries in the snapshot.
+  Lav_simulationGetProfileEntry:
+    category: simulations
+    doc_description: |
+      Read an entry of the snapshot taken by {{"Lav_simulationSnapshotProfile"|function}}.
+      Times are in seconds.
+    params:
+      index: The entry to read.
+      destinationNode: The node, or 0 if it has died since the snapshot was taken.
+      destinationCalls: How many ticks the node ran.
+      destinationCulled: How many ticks the node did not run.
+      destinationTotalTime: The total time spent processing the node.
+      destinationMaxTime: The longest time the node took to process a block.
   Lav_simulationCallIn:
     category: simulations
     doc_description: |
@@ -299,13 +518,37 @@ functions:
       bufferHandle: The handle of the buffer.
   Lav_bufferLoadFromFile:
     category: buffers
-    doc_description:
+    doc_description: |
       Loads data into this buffer from a file.
       The file will be resampled to the sampling rate of the simulation.
       This will happen synchronously.
+      
+      Decoded files are shared through the buffer cache.
+      If any buffer in the process has already loaded this file at this sampling rate and the file hasn't changed since, its data is reused instead of decoding the file again.
+      See {{"Lav_bufferCacheGetStatistics"|function}}.
     params:
       bufferHandle: The buffer into which to load data.
       path: The path to the file to load data from.
+  Lav_bufferLoadFromFileAsync:
+    category: buffers
+    doc_description: |
+      Load data into this buffer from a file without waiting for it to decode.
+      
+      The buffer is emptied immediately, and the file is decoded and resampled on a pool of worker threads shared by the whole process.
+      When decoding finishes, the data replaces the buffer's contents atomically with respect to the simulation, and the callback is called on the worker thread.
+      The callback receives the buffer's handle, or 0 if the buffer was deleted first, and {{"Lav_ERROR_NONE"|codelit}} or the error which prevented loading.
+      If there was an error, {{"Lav_errorGetMessage"|function}} called from within the callback describes it.
+      
+      Unlike {{"Lav_bufferLoadFromFile"|function}}, this may be used on buffers that are in use.
+      Buffer nodes playing the buffer go silent until the load finishes, then start from the beginning of the new data.
+      If the buffer's contents are replaced again before the load finishes, the load's data is dropped and the callback still reports success.
+      
+      Loads go through the buffer cache like {{"Lav_bufferLoadFromFile"|function}}.
+    params:
+      bufferHandle: The buffer into which to load data.
+      path: The path to the file to load data from.
+      callback: Called on a worker thread when loading finishes. May be NULL.
+      userdata: Passed to the callback.
   Lav_bufferLoadFromArray:
     category: buffers
     doc_description: |
@@ -316,6 +559,157 @@ functions:
       channels: The number of audio channels in the data; frames*channels is the total length of the array in samples.
       frames: The number of frames of audio data; frames*channels is the length of the array in samples.
       data: A pointer to the beginning of the array to load from.
+  Lav_bufferCacheGetStatistics:
+    category: buffers
+    doc_description: |
+      Query the buffer cache.
+      
+      The buffer cache is shared by every simulation in the process.
+      It is keyed by each file's path, modification time, size, and the sampling rate it was resampled to, so changing a file on disk causes it to be decoded again.
+      The cache keeps the most recently used files up to a limit, set with {{"Lav_bufferCacheSetLimit"|function}}.
+      Files that have been evicted but are still in use by some buffer continue to be shared, and don't count against the limit.
+    params:
+      destinationHits: Loads which reused data.
+      destinationMisses: Loads which had to decode a file.
+      destinationEvictions: Files dropped to stay under the limit.
+      destinationEntries: Files currently held by the cache.
+      destinationMegabytes: The memory held by the cache.
+  Lav_bufferCacheSetLimit:
+    category: buffers
+    doc_description: |
+      Set the most memory the buffer cache may hold, in megabytes.
+      The default is 128.
+      0 disables keeping files which aren't in use, but files in use by buffers are still shared.
+    params:
+      megabytes: The new limit.
+  Lav_bufferCacheGetLimit:
+    category: buffers
+    doc_description: |
+      Get the most memory the buffer cache may hold, in megabytes.
+  Lav_bufferCacheClear:
+    category: buffers
+    doc_description: |
+      Drop everything held by the buffer cache.
+      Buffers using cached data keep it.
+  Lav_bufferCacheSetDirectory:
+    category: buffers
+    doc_description: |
+      Keep decoded files on disk as well as in memory.
+      
+      When a file isn't in memory, the buffer cache looks for it in this directory before decoding it, and stores it there after decoding it.
+      Files are stored as 32-bit floats at the simulation's sampling rate, and are mapped into memory rather than read, so processes which load the same file share its memory.
+      A stored file is only used if the source's absolute path, size, and modification time and the sampling rate all match.
+      
+      The directory is created if it doesn't exist.
+      Failing to read or write it is never an error; the file is just decoded.
+      Nothing is ever removed automatically; see {{"Lav_bufferCacheTrimDirectory"|function}}.
+    params:
+      path: The directory, or NULL or the empty string to stop using one.
+  Lav_bufferCacheTrimDirectory:
+    category: buffers
+    doc_description: |
+      Delete the least recently used files in the buffer cache's directory until it holds no more than the specified size.
+      
+      Files in use by another process may not be deleted on some platforms, and are skipped.
+      Does nothing if no directory is set.
+    params:
+      megabytes: The size to trim to.
+      destinationFreedMegabytes: How much was deleted.
+  Lav_hrtfCacheGetStatistics:
+    category: core
+    doc_description: |
+      Query the HRTF coefficient caches.
+      
+      Every HRTF dataset keeps the most recently used responses, keyed by angle, and every panner using the dataset shares them.
+      Panners whose source moves or turns slowly ask for the same few angles over and over, so most of their updates become a copy.
+      Angles are rounded to a step set with {{"Lav_hrtfCacheSetQuantization"|function}} before they are used, and each dataset keeps up to {{"Lav_hrtfCacheSetLimit"|function}} angles.
+      The counts returned are summed over all loaded datasets.
+    params:
+      destinationHits: Lookups which reused a response.
+      destinationMisses: Lookups which computed a response.
+      destinationEvictions: Responses dropped to stay under the limit.
+      destinationEntries: Responses currently cached.
+  Lav_hrtfCacheSetLimit:
+    category: core
+    doc_description: |
+      Set the most angles each HRTF dataset's cache may hold.
+      The default is 512.
+      0 disables the cache.
+      This also empties the caches.
+      
+      Room for this many angles is allocated now for every loaded dataset, and when later datasets load, so that panning never allocates.
+      Panners never wait for this or the other HRTF cache functions: while one of them is running, panners compute the responses they need without the cache.
+    params:
+      entries: The new limit.
+  Lav_hrtfCacheGetLimit:
+    category: core
+    doc_description: |
+      Get the most angles each HRTF dataset's cache may hold.
+  Lav_hrtfCacheSetQuantization:
+    category: core
+    doc_description: |
+      Set the step, in degrees, to which azimuths and elevations are rounded before looking them up in the HRTF caches.
+      The default is 1 degree, which is finer than listeners can localize.
+      Larger steps give more hits at the cost of coarser positioning.
+      0 disables the cache, and responses are computed for the exact angle.
+    params:
+      degrees: The new step.
+  Lav_hrtfCacheGetQuantization:
+    category: core
+    doc_description: |
+      Get the step to which angles are rounded before looking them up in the HRTF caches.
+  Lav_hrtfCacheClear:
+    category: core
+    doc_description: |
+      Drop every response held by the HRTF caches.
+  Lav_hrtfPreload:
+    category: core
+    doc_description: |
+      Load an HRTF dataset and keep it loaded until {{"Lav_hrtfUnpin"|function}} is called.
+      
+      Nodes which take an HRTF path share one copy of each dataset per sampling rate, which is freed when the last of them is deleted.
+      Files are recognized by the identifier at their start rather than by their path.
+      Applications which create and delete panners as they go can call this at startup, so that loading and resampling the dataset happens once and never while the application is running.
+      Preloading a dataset which is already pinned does nothing.
+    params:
+      path: The path to an HRTF file, or "default" for the built-in dataset.
+      sr: The sampling rate of the simulations which will use it.
+  Lav_hrtfUnpin:
+    category: core
+    doc_description: |
+      Undo {{"Lav_hrtfPreload"|function}}.
+      The dataset is freed once no nodes are using it.
+      Does nothing if the dataset isn't pinned.
+    params:
+      path: The path given to {{"Lav_hrtfPreload"|function}}.
+      sr: The sampling rate given to {{"Lav_hrtfPreload"|function}}.
+  Lav_kernelsGetBackendCount:
+    category: core
+    doc_description: |
+      Get how many kernel backends this processor supports.
+      
+      Libaudioverse's inner loops are compiled once for each instruction set it knows how to use, and {{"Lav_initialize"|function}} picks the most capable one the processor and operating system support.
+      Depending on how Libaudioverse was built, the backends are some of "scalar", "sse2", "avx", and "avx2" (which also uses FMA).
+      They compute the same results, save that "avx2" rounds fused multiply-adds once and so can differ in the last bit.
+  Lav_kernelsGetBackendName:
+    category: core
+    doc_description: |
+      Get the name of a supported kernel backend.
+      Backends are ordered from least to most capable.
+    params:
+      index: A number from 0 to one less than the value of {{"Lav_kernelsGetBackendCount"|function}}.
+  Lav_kernelsGetBackend:
+    category: core
+    doc_description: |
+      Get the name of the kernel backend in use.
+  Lav_kernelsSetBackend:
+    category: core
+    doc_description: |
+      Use a different kernel backend, for example to compare them or to work around a problem with one.
+      This applies to the whole process and takes effect immediately, even if audio is playing.
+      Backends which the processor doesn't support can't be selected.
+    params:
+      name: The name of the backend, as returned by {{"Lav_kernelsGetBackendName"|function}}.
   Lav_bufferNormalize:
     category: buffers
     doc_description: |
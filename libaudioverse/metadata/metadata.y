@@ -1,4 +1,5 @@
 additional_important_enums:
   - Lav_LOGGING_LEVELS
   - Lav_PROPERTY_TYPES
-  - Lav_OBJECT_TYPES
\ No newline at end of file
+  - Lav_OBJECT_TYPES
+  - Lav_PLANNER_HISTOGRAMS
\ No newline at end of file
@@ -39,6 +39,27 @@ properties:
       if the buffer is configured to loop, the counter will count up every time the end of a loop is reached.
       Note that this property can technically wrap if your buffer node manages to end 2147483647 times.
       This should be impossible, save for the most long-running applications and shortest meaningful buffers.
+extra_functions:
+  Lav_bufferNodePlayAt:
+    doc_description: |
+      Start playing at a specific simulation time, as returned by {{"Lav_simulationGetCurrentTime"|function}}, with sample accuracy.
+      
+      At that sample, the position jumps to the offset and the node starts playing if it was stopped.
+      Until then, whatever is playing continues.
+      Times in the past start at the beginning of the next block.
+      This replaces any start scheduled earlier.
+      The node must not be paused.
+    params:
+      time: The simulation time at which to start.
+      offset: The position in the buffer to start from, in seconds.
+  Lav_bufferNodeStopAt:
+    doc_description: |
+      Stop playing at a specific simulation time, with sample accuracy.
+      
+      From that sample, the node outputs silence and its position does not advance until {{"Lav_bufferNodePlayAt"|function}} starts it again or {{"Lav_BUFFER_POSITION"|property}} is set.
+      This replaces any stop scheduled earlier.
+    params:
+      time: The simulation time at which to stop.
 callbacks:
   end:
     doc_description: |
@@ -1,3 +1,36 @@
+properties:
+  Lav_BUFFER_TIMELINE_MAX_VOICES:
+    name: max_voices
+    type: int
+    range: [-1, MAX_INT]
+    default: -1
+    doc_description: |
+      The most buffers which may play at once, or -1 for no limit.
+      
+      When a buffer is due to start and this many are already playing, one is stopped according to {{"Lav_BUFFER_TIMELINE_VOICE_STEALING"|property}}.
+      Stopped buffers that have been heard fade out over one block.
+      This bounds the work done per block no matter how many buffers are scheduled.
+  Lav_BUFFER_TIMELINE_VOICE_STEALING:
+    name: voice_stealing
+    type: int
+    default: Lav_VOICE_STEALING_OLDEST
+    value_enum: Lav_VOICE_STEALING_STRATEGIES
+    doc_description: |
+      Which buffer to stop when {{"Lav_BUFFER_TIMELINE_MAX_VOICES"|property}} is reached.
+  Lav_BUFFER_TIMELINE_VOICE_COUNT:
+    name: voice_count
+    type: int
+    default: 0
+    read_only: true
+    doc_description: |
+      The number of buffers playing after the last block.
+  Lav_BUFFER_TIMELINE_STOLEN_VOICE_COUNT:
+    name: stolen_voice_count
+    type: int
+    default: 0
+    read_only: true
+    doc_description: |
+      The number of buffers stopped early because of {{"Lav_BUFFER_TIMELINE_MAX_VOICES"|property}}, since the node was created.
 extra_functions:
   Lav_bufferTimelineNodeScheduleBuffer:
     doc_description: |
@@ -7,6 +40,34 @@ extra_functions:
       bufferHandle: The buffer to schedule.
       pitchBend: The pitch bend, which must be positive.  Use 1.0 to disable.
       time: The time to play the buffer.
+  Lav_bufferTimelineNodeScheduleMany:
+    doc_description: |
+      Schedule many buffers at once, each with its own pitch bend, gain, and position.
+      
+      All arrays have count entries.
+      Any of the pitch bends, gains, azimuths, and elevations may be NULL, in which case they are 1.0, 1.0, 0.0, and 0.0 respectively.
+      Azimuths and elevations need an HRTF, set with {{"Lav_bufferTimelineNodeSetHrtf"|function}}.
+      If any entry is invalid, nothing is scheduled.
+    params:
+      count: The number of buffers to schedule.
+      bufferHandles: The buffers.
+      times: The times to play them, relative to now.
+      pitchBends: The pitch bends, which must be positive.
+      gains: Multipliers for the buffers' volumes, which must be positive.
+      azimuths: The horizontal angles, in degrees.
+      elevations: The vertical angles, in degrees, from -90 to 90.
+  Lav_bufferTimelineNodeSetHrtf:
+    doc_description: |
+      Pan every buffer this node plays through an HRTF, at its own azimuth and elevation.
+      
+      The node must have 2 channels.
+      Buffers are mixed to mono before panning.
+      Buffers scheduled without a position play straight ahead.
+      The dataset is shared with every other user of the same file, and panners are kept for reuse as buffers finish.
+      If {{"Lav_BUFFER_TIMELINE_MAX_VOICES"|property}} is set, that many are allocated now, and more are allocated in the background shortly after it is raised.
+      A buffer keeps its panner until the HRTF's tail has finished after the buffer ends, and counts as playing until then.
+    params:
+      hrtfPath: The path to an HRTF file, or "default".
 inputs: null
 outputs:
   - [constructor, "The sum of all playing buffers."]
@@ -8,6 +8,16 @@ properties:
     default: [1.0]
     doc_description: |
       The impulse response to convolve the input with.
+  Lav_CONVOLVER_CONVOLUTION_MODE:
+    name: convolution_mode
+    type: int
+    default: Lav_CONVOLUTION_MODE_AUTOMATIC
+    value_enum: Lav_CONVOLUTION_MODES
+    doc_description: |
+      How the impulse response is applied.
+      
+      The automatic mode is almost always the right choice.
+      Changing between direct and FFT convolution causes a brief gap.
 inputs:
   - [constructor, "The signal to be convolved."]
 outputs:
@@ -16,4 +26,5 @@ doc_name: convolver
 doc_description: |
   A simple convolver.
   
-  This implements convolution directly, without use of the FFT.
\ No newline at end of file
+  Short responses are convolved directly and long ones with uniformly partitioned FFT convolution, which has no added latency.
+  See {{"Lav_CONVOLVER_CONVOLUTION_MODE"|property}}.
\ No newline at end of file
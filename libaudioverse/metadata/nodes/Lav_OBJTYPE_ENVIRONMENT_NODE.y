@@ -89,6 +89,43 @@ properties:
       The default distance at which a source will be heard only in the reverb.
       
       See documentation on the {{"Lav_OBJTYPE_SOURCE_NODE"|node}} node.
+  Lav_ENVIRONMENT_CULL_THRESHOLD:
+    name: cull_threshold
+    type: float
+    range: [0.0, INFINITY]
+    default: 0.0001
+    doc_description: |
+      Sources whose gain, after the distance model and their {{"Lav_NODE_MUL"|property}} property, is below this value are culled: they skip all panning and reverb work.
+      
+      The default is 80 DB below full volume.
+      Set this to 0 to cull only sources beyond their max distance.
+      Sources are also culled while paused and once their input has been silent for long enough that nothing remains of it in the panners.
+  Lav_ENVIRONMENT_MAX_HRTF_SOURCES:
+    name: max_hrtf_sources
+    type: int
+    range: [-1, MAX_INT]
+    default: -1
+    doc_description: |
+      The most sources which may use HRTF panning at once, or -1 for no limit.
+      
+      HRTF panning is by far the most expensive part of a source.
+      When more sources than this want to use HRTF, the loudest keep it and the rest fall back to stereo panning until they are among the loudest again.
+      Sources crossfade between the two over one block when they switch.
+  Lav_ENVIRONMENT_CULLED_SOURCES:
+    name: culled_sources
+    type: int
+    default: 0
+    read_only: true
+    doc_description: |
+      The number of sources culled on the last block.
+      See {{"Lav_ENVIRONMENT_CULL_THRESHOLD"|property}}.
+  Lav_ENVIRONMENT_DEGRADED_SOURCES:
+    name: degraded_sources
+    type: int
+    default: 0
+    read_only: true
+    doc_description: |
+      The number of sources which wanted HRTF panning on the last block but used stereo panning because of {{"Lav_ENVIRONMENT_MAX_HRTF_SOURCES"|property}}.
 extra_functions:
   Lav_environmentNodePlayAsync:
     doc_description: |
@@ -125,6 +162,18 @@ extra_functions:
       channels: The number of channels the effect send is to have. Must be 1, 2, 4, 6, or 8.
       isReverb: nonzero if this is a reverb effect send.
       connectByDefault: If nonzero, all existing and newly created sources will send to this effect send unless disabled.
+  Lav_environmentNodeUpdateSources:
+    doc_description: |
+      Set the position, and optionally the orientation, of many sources in one call.
+      
+      This is equivalent to setting the position and orientation properties of each source, but much cheaper when there are many sources, especially from languages with high per-call overhead.
+      All of the updates are made under one lock, so they take effect on the same block.
+      Every source is checked before any is changed: if one is invalid or belongs to another environment, nothing is updated.
+    params:
+      count: The number of sources.
+      sourceHandles: The sources to update.
+      positions: "{{\"count\"|param}}*3 floats: x, y, and z for each source in turn."
+      orientations: "NULL, or {{\"count\"|param}}*6 floats: the at and up vectors for each source in turn, as for the orientation property."
 inputs: null
 outputs:
   - [dynamic, "Depends on the output_channels property.", "The output of the 3D environment."]
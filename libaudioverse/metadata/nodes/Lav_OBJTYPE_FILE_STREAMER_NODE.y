@@ -24,6 +24,26 @@ properties:
     doc_description: |
       Switches from false to true once the stream has ended completely and gone silent.
       This property will never go true unless looping is false.
+  Lav_FILE_STREAMER_READ_AHEAD:
+    name: read_ahead
+    type: double
+    default: 1.0
+    range: [0.0, 60.0]
+    doc_description: |
+      How many seconds of the file to keep decoded ahead of playback.
+      
+      Decoding happens on a background thread, which tops the read-ahead back up whenever it falls below half full.
+      Raise this if the file lives somewhere slow, such as a network share, and underruns goes up.
+      Values below two processing blocks are treated as two blocks.
+      Increasing this past the largest value used so far causes a short gap while the larger buffer fills.
+  Lav_FILE_STREAMER_UNDERRUNS:
+    name: underruns
+    type: int
+    default: 0
+    read_only: true
+    doc_description: |
+      Counts the blocks for which the background thread hadn't decoded enough audio, so that part of the block was silent.
+      Silence while waiting on a seek isn't counted.
 callbacks:
   end:
     doc_description: |
@@ -40,5 +60,8 @@ doc_description: |
   It will likely remain for backward compatibility.
   Libaudioverse plans to eventually offer a more generic streaming node that also supports web addresses; such a node will have a completely different, less buffer-like interface.
   
+  The file is decoded on a background thread ahead of playback, so slow disks don't cause dropouts unless they fall behind by more than read_ahead.
+  Setting position plays a short silence while the background thread seeks.
+  
   In order to stream a file, it must be passed through a resampler.
   Consequentlty, the position property is slightly inaccurate and the ended property and callback are slightly delayed.
\ No newline at end of file
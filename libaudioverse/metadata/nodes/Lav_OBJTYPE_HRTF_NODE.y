@@ -24,6 +24,18 @@ properties:
       This property allows such functionality to be disabled.
       Note that for HRTF nodes, crossfading is more important than for other panner types.
       Unlike other panner types, the audio artifacts produced by disabling crossfading are noticeable, even for updates of only a few degrees.
+      
+      Crossfading is cheap: a block in which the panner moves costs at most about twice a block in which it doesn't.
+  Lav_PANNER_CONVOLUTION_MODE:
+    name: convolution_mode
+    type: int
+    default: Lav_CONVOLUTION_MODE_AUTOMATIC
+    value_enum: Lav_CONVOLUTION_MODES
+    doc_description: |
+      How the HRTF is applied.
+      
+      The automatic mode is almost always the right choice.
+      Changing between direct and FFT convolution causes a brief gap.
 inputs:
   - [1, "The signal to pan."]
 outputs:
@@ -32,6 +32,16 @@ properties:
       What type of panning to use.
       Possibilities include HRTF, stereo, 5.1, and 7.1 speaker configurations.
       For something more nontraditional, use an amplitude panner.
+  Lav_PANNER_CONVOLUTION_MODE:
+    name: convolution_mode
+    type: int
+    default: Lav_CONVOLUTION_MODE_AUTOMATIC
+    value_enum: Lav_CONVOLUTION_MODES
+    doc_description: |
+      How the HRTF is applied when the strategy is HRTF.
+      
+      The automatic mode is almost always the right choice.
+      Changing between direct and FFT convolution causes a brief gap.
 inputs:
   - [1, "The signal to pan."]
 outputs:
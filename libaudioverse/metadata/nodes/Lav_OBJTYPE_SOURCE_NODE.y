@@ -107,6 +107,16 @@ properties:
       It is extremely difficult to map occlusion to a physical quantity.
       In the real world, occlusion depends on mass, density, molecular structure, and a huge number of other factors.
       Libaudioverse therefore chooses to use this scalar quantity and to attempt to do the right thing.
+  Lav_SOURCE_CONVOLUTION_MODE:
+    name: convolution_mode
+    type: int
+    default: Lav_CONVOLUTION_MODE_AUTOMATIC
+    value_enum: Lav_CONVOLUTION_MODES
+    doc_description: |
+      How the HRTF is applied when this source uses HRTF panning.
+      
+      The automatic mode is almost always the right choice.
+      Changing between direct and FFT convolution causes a brief gap.
 extra_functions:
   Lav_sourceNodeFeedEffect:
     doc_description: |
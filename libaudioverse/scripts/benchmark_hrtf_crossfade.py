@@ -0,0 +1,73 @@
+"""Measures what moving an HRTF panner costs, with and without crossfading, against response length.
+
+For each response length, a synthetic HRTF is written to a temporary file and several HrtfNodes are rendered offline three ways:
+standing still, turning fast enough to pass the crossfade threshold every block with crossfading off, and the same with crossfading on.
+Costs are reported relative to standing still, so 2.0x means a moving panner costs twice a static one.
+
+Usage: benchmark_hrtf_crossfade.py [--duration seconds] [--block-size n] [--panners n] [--lengths 32,64,...]"""
+from __future__ import print_function
+import argparse
+import os
+import tempfile
+import time
+import numpy
+import hrtf_writer
+import libaudioverse
+
+sr = 44100
+
+def write_hrtf(length):
+    """A random HRTF with responses of length samples, every 10 degrees of azimuth and elevation."""
+    random = numpy.random.RandomState(length)
+    elevations = range(-40, 100, 10)
+    responses = [[random.uniform(-0.1, 0.1, length) for azimuth in range(36)] for elevation in elevations]
+    writer = hrtf_writer.HrtfWriter(samplerate = sr, min_elevation = -40, max_elevation = 90, responses = responses, print_progress = False)
+    writer.pack_data()
+    handle, path = tempfile.mkstemp(suffix = ".hrtf")
+    os.close(handle)
+    writer.write_file(path)
+    return path
+
+def measure(path, mode, moving, crossfade, arguments):
+    simulation = libaudioverse.Simulation(sample_rate = sr, block_size = arguments.block_size)
+    noise = libaudioverse.NoiseNode(simulation)
+    keepalive = [noise]
+    for i in range(arguments.panners):
+        panner = libaudioverse.HrtfNode(simulation, path)
+        panner.convolution_mode = mode
+        panner.should_crossfade = crossfade
+        if moving:
+            #10 turns a second is well over the 5 degree crossfade threshold per block at any sensible block size.
+            panner.azimuth.linear_ramp_to_value(arguments.duration+1.0, (arguments.duration+1.0)*3600.0)
+        noise.connect(0, panner, 0)
+        panner.connect_simulation(0)
+        keepalive.append(panner)
+    start = time.time()
+    simulation.render(duration = arguments.duration, channels = 2)
+    return time.time()-start
+
+def int_list(s):
+    return [int(i) for i in s.split(",")]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Benchmark HRTF crossfading against response length.")
+    parser.add_argument("--duration", type = float, default = 5.0, help = "Seconds of audio to render per measurement.")
+    parser.add_argument("--block-size", type = int, default = 256)
+    parser.add_argument("--panners", type = int, default = 16)
+    parser.add_argument("--lengths", type = int_list, default = [32, 64, 128, 256, 512, 1024, 2048])
+    arguments = parser.parse_args()
+    libaudioverse.initialize()
+    modes = [("direct", libaudioverse.ConvolutionModes.direct), ("fft", libaudioverse.ConvolutionModes.fft), ("automatic", libaudioverse.ConvolutionModes.automatic)]
+    print("{:<8}{:<11}{:>12}{:>14}{:>14}".format("length", "mode", "static us", "moving", "crossfading"))
+    for length in arguments.lengths:
+        path = write_hrtf(length)
+        try:
+            for name, mode in modes:
+                static = measure(path, mode, False, False, arguments)
+                moving = measure(path, mode, True, False, arguments)
+                crossfading = measure(path, mode, True, True, arguments)
+                blocks = arguments.duration*sr/arguments.block_size*arguments.panners
+                print("{:<8}{:<11}{:>12.2f}{:>13.2f}x{:>13.2f}x".format(length, name, static/blocks*1e6, moving/static, crossfading/static))
+        finally:
+            os.remove(path)
+    libaudioverse.shutdown()
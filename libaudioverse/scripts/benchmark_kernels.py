@@ -0,0 +1,93 @@
+"""Measures rendering speed with each kernel backend this processor supports.
+
+Each graph leans on different kernels: direct convolution is parallel multiply-adds, mixing and gain are additions and multiplications.
+Speeds are reported in multiples of realtime and relative to the first backend, which is always scalar.
+
+Usage: benchmark_kernels.py [--duration seconds] [--block-size n] [--backends scalar,sse2,...]"""
+from __future__ import print_function
+import argparse
+import random
+import time
+import libaudioverse
+
+sr = 44100
+
+def hrtf_panners(simulation):
+    """16 HRTF panners using direct convolution."""
+    keepalive = []
+    for i in range(16):
+        noise = libaudioverse.NoiseNode(simulation)
+        hrtf = libaudioverse.HrtfNode(simulation, "default")
+        hrtf.convolution_mode = libaudioverse.ConvolutionModes.direct
+        hrtf.azimuth = i*360.0/16
+        noise.connect(0, hrtf, 0)
+        hrtf.connect_simulation(0)
+        keepalive.extend([noise, hrtf])
+    return keepalive
+
+def convolvers(simulation):
+    """4 direct convolvers with 512-sample responses."""
+    keepalive = []
+    for i in range(4):
+        noise = libaudioverse.NoiseNode(simulation)
+        convolver = libaudioverse.ConvolverNode(simulation, 1)
+        convolver.convolution_mode = libaudioverse.ConvolutionModes.direct
+        convolver.impulse_response = [random.uniform(-0.05, 0.05) for j in range(512)]
+        noise.connect(0, convolver, 0)
+        convolver.connect_simulation(0)
+        keepalive.extend([noise, convolver])
+    return keepalive
+
+def mixing(simulation):
+    """64 sines through gain nodes into one output."""
+    keepalive = []
+    for i in range(64):
+        sine = libaudioverse.SineNode(simulation)
+        sine.frequency = 100.0+i*10.0
+        gain = libaudioverse.GainNode(simulation, 2)
+        gain.mul = 1.0/64
+        sine.connect(0, gain, 0)
+        gain.connect_simulation(0)
+        keepalive.extend([sine, gain])
+    return keepalive
+
+graphs = [
+    ("hrtf panners", hrtf_panners),
+    ("convolvers", convolvers),
+    ("mixing", mixing),
+]
+
+def measure(build, block_size, duration):
+    simulation = libaudioverse.Simulation(sample_rate = sr, block_size = block_size)
+    simulation.threads = 1
+    keepalive = build(simulation)
+    simulation.render(duration = 0.5, channels = 2)
+    start = time.time()
+    simulation.render(duration = duration, channels = 2)
+    return duration/(time.time()-start)
+
+def name_list(s):
+    return s.split(",")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Benchmark the kernel backends against each other.")
+    parser.add_argument("--duration", type = float, default = 10.0, help = "Seconds of audio to render per measurement.")
+    parser.add_argument("--block-size", type = int, default = 256)
+    parser.add_argument("--backends", type = name_list, default = None, help = "Defaults to every backend this processor supports.")
+    arguments = parser.parse_args()
+    random.seed(0)
+    libaudioverse.initialize()
+    chosen = libaudioverse.get_kernel_backend()
+    backends = arguments.backends or libaudioverse.get_kernel_backends()
+    print("Initialization chose {}.".format(chosen))
+    print("{:<16}{:>10}{:>12}{:>10}".format("graph", "backend", "realtime x", "speedup"))
+    for name, build in graphs:
+        baseline = None
+        for backend in backends:
+            libaudioverse.set_kernel_backend(backend)
+            realtime = measure(build, arguments.block_size, arguments.duration)
+            if baseline is None:
+                baseline = realtime
+            print("{:<16}{:>10}{:>12.1f}{:>9.2f}x".format(name, backend, realtime, realtime/baseline))
+    libaudioverse.set_kernel_backend(chosen)
+    libaudioverse.shutdown()
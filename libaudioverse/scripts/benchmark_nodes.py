@@ -0,0 +1,231 @@
+"""Benchmarks every node type through the Python bindings and writes the results as JSON.
+
+The node list comes from the metadata via bindings.get_info, so new nodes are covered without changing this script.
+For every node, a representative graph is built: noise feeding each input, several copies of the node, and the outputs mixed into the simulation.
+The graph is then rendered offline with Simulation.get_block and Simulation.write_file at every combination of block size and thread count.
+
+Usage: benchmark_nodes.py [--output results.json] [--duration seconds] [--copies n] [--block-sizes 64,256,1024] [--threads 1,2,4] [--file sound.wav] [--nodes Lav_OBJTYPE_SINE_NODE,...]
+
+Nodes which need something we can't provide (the file streamer without --file) are reported as skipped rather than left out.
+Nodes which raise while being built or rendered are reported as failed, and the run goes on to the next node."""
+from __future__ import print_function
+import argparse
+import json
+import os
+import os.path
+import random
+import sys
+import tempfile
+import time
+import traceback
+
+repository_root = os.path.split(os.path.split(os.path.abspath(__file__))[0])[0]
+sys.path = [repository_root] + sys.path
+import bindings.get_info
+from bindings import transformers
+import libaudioverse
+
+sr = 44100
+
+#Values for constructor parameters, by name.  Callables receive the simulation and the parsed arguments.
+#Numbers are converted to the parameter's type in the header, see convert_argument.
+constructor_arguments = {
+    'channels': 2,
+    'maxDelay': 1.0,
+    'inputs': 2,
+    'channelsPerInput': 2,
+    'outputs': 1,
+    'channelsPerOutput': 2,
+    'sr': sr,
+    'hrtfPath': "default",
+    'path': lambda simulation, arguments: arguments.file,
+    'environmentHandle': lambda simulation, arguments: make_environment(simulation),
+}
+
+def make_environment(simulation):
+    environment = libaudioverse.EnvironmentNode(simulation, "default")
+    environment.connect_simulation(0)
+    return environment
+
+def make_noise_buffer(simulation, seconds = 1.0, channels = 2):
+    frames = int(sr*seconds)
+    buffer = libaudioverse.Buffer(simulation)
+    buffer.load_from_array(sr, channels, frames, [random.uniform(-1.0, 1.0) for i in range(frames*channels)])
+    return buffer
+
+#Node-specific setup, for nodes which do nothing interesting in their default state.
+def setup_buffer_timeline(simulation, node):
+    buffer = make_noise_buffer(simulation, 0.1)
+    for i in range(100):
+        node.schedule_buffer(buffer, i*0.05, 1.0)
+
+def setup_fft_convolver(simulation, node):
+    for channel in range(2):
+        node.set_response(channel, 1024, [random.uniform(-0.1, 0.1) for i in range(1024)])
+
+def setup_convolver(simulation, node):
+    node.impulse_response = [random.uniform(-0.1, 0.1) for i in range(512)]
+
+def setup_source(simulation, node):
+    node.position = (2.0, 1.0, 0.0)
+
+special_setup = {
+    'Lav_OBJTYPE_BUFFER_TIMELINE_NODE': setup_buffer_timeline,
+    'Lav_OBJTYPE_FFT_CONVOLVER_NODE': setup_fft_convolver,
+    'Lav_OBJTYPE_CONVOLVER_NODE': setup_convolver,
+    'Lav_OBJTYPE_SOURCE_NODE': setup_source,
+}
+
+#Parameters in seconds, which are in samples when the constructor takes an int.
+seconds_arguments = {'maxDelay'}
+
+def convert_argument(name, type, value):
+    """The bindings check types strictly, so 1.0 can't be passed for an int."""
+    if type.indirection != 0 or isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    if type.base in ('int', 'unsigned int', 'long', 'unsigned long', 'long long', 'unsigned long long'):
+        if name in seconds_arguments:
+            return int(value*sr)
+        return int(value)
+    if type.base in ('float', 'double'):
+        return float(value)
+    return value
+
+class Skip(Exception):
+    pass
+
+def class_for(name):
+    return getattr(libaudioverse, transformers.underscores_to_camelcase(name[len("Lav_OBJTYPE_"):], True))
+
+def make_node(info, name, simulation, arguments, keepalive):
+    node_info = info['metadata']['nodes'][name]
+    constructor = info['functions'][node_info['constructor']]
+    values = []
+    for i in constructor.input_args[1:]:
+        if i.name not in constructor_arguments:
+            raise Skip("don't know how to provide constructor argument {}".format(i.name))
+        value = constructor_arguments[i.name]
+        if callable(value):
+            value = value(simulation, arguments)
+        if value is None:
+            raise Skip("needs {}".format(i.name))
+        value = convert_argument(i.name, i.type, value)
+        keepalive.append(value)
+        values.append(value)
+    node = class_for(name)(simulation, *values)
+    for prop_name, prop in node_info['properties'].items():
+        if prop['type'] == 'buffer' and not prop['read_only']:
+            buffer = make_noise_buffer(simulation)
+            keepalive.append(buffer)
+            setattr(node, prop['name'], buffer)
+    if name in special_setup:
+        special_setup[name](simulation, node)
+    return node
+
+def build_graph(info, name, simulation, arguments):
+    """Returns the objects which must be kept alive while the graph renders."""
+    keepalive = []
+    node_info = info['metadata']['nodes'][name]
+    inputs = node_info.get('inputs', None)
+    input_count = len(inputs) if isinstance(inputs, list) else (0 if inputs is None else 1)
+    for copy in range(arguments.copies):
+        node = make_node(info, name, simulation, arguments, keepalive)
+        keepalive.append(node)
+        for input in range(input_count):
+            noise = libaudioverse.NoiseNode(simulation)
+            noise.connect(0, node, input)
+            keepalive.append(noise)
+        #Sources output through their environment, which make_environment already connected.
+        if node_info.get('outputs', None) is not None and name != 'Lav_OBJTYPE_SOURCE_NODE':
+            node.connect_simulation(0)
+    return keepalive
+
+def time_get_block(simulation, block_size, duration):
+    blocks = max(1, int(duration*sr/block_size))
+    start = time.time()
+    for i in range(blocks):
+        simulation.get_block(2)
+    return blocks, time.time()-start
+
+def time_write_file(simulation, block_size, duration):
+    handle, path = tempfile.mkstemp(suffix = ".wav")
+    os.close(handle)
+    try:
+        start = time.time()
+        simulation.write_file(path, 2, duration)
+        elapsed = time.time()-start
+    finally:
+        os.remove(path)
+    return max(1, int(duration*sr/block_size)), elapsed
+
+def benchmark_node(info, name, arguments):
+    results = []
+    for block_size in arguments.block_sizes:
+        for threads in arguments.threads:
+            for method, timer in (("get_block", time_get_block), ("write_file", time_write_file)):
+                simulation = libaudioverse.Simulation(sample_rate = sr, block_size = block_size)
+                simulation.threads = threads
+                keepalive = build_graph(info, name, simulation, arguments)
+                blocks, elapsed = timer(simulation, block_size, arguments.duration)
+                audio_seconds = blocks*block_size/float(sr)
+                results.append({
+                    'node': name,
+                    'status': 'ok',
+                    'method': method,
+                    'block_size': block_size,
+                    'threads': threads,
+                    'copies': arguments.copies,
+                    'blocks': blocks,
+                    'seconds': elapsed,
+                    'blocks_per_second': blocks/elapsed if elapsed > 0 else None,
+                    'realtime_factor': audio_seconds/elapsed if elapsed > 0 else None,
+                })
+                del keepalive
+    return results
+
+def int_list(s):
+    return [int(i) for i in s.split(",")]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Benchmark every Libaudioverse node type.")
+    parser.add_argument("--output", default = None, help = "Where to write the JSON. Defaults to stdout.")
+    parser.add_argument("--duration", type = float, default = 5.0, help = "Seconds of audio to render per measurement.")
+    parser.add_argument("--copies", type = int, default = 8, help = "Number of instances of the node in each graph.")
+    parser.add_argument("--block-sizes", type = int_list, default = [64, 256, 1024])
+    parser.add_argument("--threads", type = int_list, default = [1, 2, 4])
+    parser.add_argument("--file", default = None, help = "A sound file, for nodes which stream from disk.")
+    parser.add_argument("--nodes", default = None, help = "Comma-separated Lav_OBJTYPE_* names to benchmark instead of all of them.")
+    arguments = parser.parse_args()
+    random.seed(0)
+    info = bindings.get_info.get_all_info()
+    names = [i for i in info['metadata']['nodes'].keys() if i != 'Lav_OBJTYPE_GENERIC_NODE']
+    if arguments.nodes is not None:
+        names = arguments.nodes.split(",")
+    names.sort()
+    libaudioverse.initialize()
+    results = []
+    for name in names:
+        print("Benchmarking", name, file = sys.stderr)
+        try:
+            results.extend(benchmark_node(info, name, arguments))
+        except Skip as e:
+            print("Skipped:", e, file = sys.stderr)
+            results.append({'node': name, 'status': 'skipped', 'reason': str(e)})
+        except Exception as e:
+            traceback.print_exc()
+            results.append({'node': name, 'status': 'failed', 'reason': "{}: {}".format(type(e).__name__, e)})
+    libaudioverse.shutdown()
+    document = {
+        'version': info['version'],
+        'git_revision': info['git_revision'] if isinstance(info['git_revision'], str) else info['git_revision'].decode('ascii', 'replace'),
+        'build_type': info['build_type'],
+        'sr': sr,
+        'duration': arguments.duration,
+        'results': results,
+    }
+    text = json.dumps(document, indent = 4, sort_keys = True)
+    if arguments.output is None:
+        print(text)
+    else:
+        with open(arguments.output, "w") as f:
+            f.write(text)
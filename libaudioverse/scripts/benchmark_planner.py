@@ -0,0 +1,107 @@
+"""Measures how rendering speed scales with Simulation.threads on graphs of different shapes.
+
+Wide graphs (many independent expensive nodes) should get faster with more threads.
+Narrow graphs (chains, or a few cheap nodes feeding one expensive node) should be no slower than with one thread.
+
+Usage: benchmark_planner.py [--duration seconds] [--block-size n] [--threads 1,2,4,auto]"""
+from __future__ import print_function
+import argparse
+import random
+import time
+import libaudioverse
+
+sr = 44100
+
+def noise_buffer(simulation, seconds = 1.0):
+    frames = int(sr*seconds)
+    buffer = libaudioverse.Buffer(simulation)
+    buffer.load_from_array(sr, 1, frames, [random.uniform(-1.0, 1.0) for i in range(frames)])
+    return buffer
+
+def wide_hrtf(simulation):
+    """16 independent HRTF panners, each with its own source."""
+    keepalive = []
+    for i in range(16):
+        noise = libaudioverse.NoiseNode(simulation)
+        hrtf = libaudioverse.HrtfNode(simulation, "default")
+        hrtf.azimuth = i*360.0/16
+        noise.connect(0, hrtf, 0)
+        hrtf.connect_simulation(0)
+        keepalive.extend([noise, hrtf])
+    return keepalive
+
+def wide_convolvers(simulation):
+    """8 FFT convolvers with 1 second responses."""
+    keepalive = []
+    for i in range(8):
+        noise = libaudioverse.NoiseNode(simulation)
+        convolver = libaudioverse.FftConvolverNode(simulation, 1)
+        convolver.set_response(0, sr, [random.uniform(-0.01, 0.01) for j in range(sr)])
+        noise.connect(0, convolver, 0)
+        convolver.connect_simulation(0)
+        keepalive.extend([noise, convolver])
+    return keepalive
+
+def chain(simulation):
+    """A noise generator through 32 biquads in series."""
+    keepalive = [libaudioverse.NoiseNode(simulation)]
+    for i in range(32):
+        biquad = libaudioverse.BiquadNode(simulation, 1)
+        biquad.frequency = 200.0+i*50.0
+        keepalive[-1].connect(0, biquad, 0)
+        keepalive.append(biquad)
+    keepalive[-1].connect_simulation(0)
+    return keepalive
+
+def few_buffers_one_hrtf(simulation):
+    """A few buffer nodes mixed into one HRTF panner, the shape of a typical game sound."""
+    hrtf = libaudioverse.HrtfNode(simulation, "default")
+    hrtf.connect_simulation(0)
+    keepalive = [hrtf]
+    for i in range(3):
+        node = libaudioverse.BufferNode(simulation)
+        node.buffer = noise_buffer(simulation)
+        node.looping = True
+        node.connect(0, hrtf, 0)
+        keepalive.append(node)
+    return keepalive
+
+graphs = [
+    ("wide hrtf", wide_hrtf),
+    ("wide convolvers", wide_convolvers),
+    ("chain", chain),
+    ("few buffers, one hrtf", few_buffers_one_hrtf),
+]
+
+def measure(build, threads, block_size, duration):
+    simulation = libaudioverse.Simulation(sample_rate = sr, block_size = block_size)
+    simulation.threads = threads
+    keepalive = build(simulation)
+    #Let the planner measure the graph and settle on a schedule before timing.
+    simulation.render(duration = 0.5, channels = 2)
+    start = time.time()
+    simulation.render(duration = duration, channels = 2)
+    elapsed = time.time()-start
+    chosen = simulation.get_planner_stats()['threads']
+    return duration/elapsed, chosen
+
+def thread_list(s):
+    return [i if i == "auto" else int(i) for i in s.split(",")]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Benchmark rendering speed against thread count.")
+    parser.add_argument("--duration", type = float, default = 10.0, help = "Seconds of audio to render per measurement.")
+    parser.add_argument("--block-size", type = int, default = 256)
+    parser.add_argument("--threads", type = thread_list, default = [1, 2, 4, "auto"])
+    arguments = parser.parse_args()
+    random.seed(0)
+    libaudioverse.initialize()
+    print("{:<24}{:>8}{:>10}{:>12}{:>10}".format("graph", "threads", "used", "realtime x", "speedup"))
+    for name, build in graphs:
+        baseline = None
+        for threads in arguments.threads:
+            realtime, chosen = measure(build, threads, arguments.block_size, arguments.duration)
+            if baseline is None:
+                baseline = realtime
+            print("{:<24}{:>8}{:>10}{:>12.1f}{:>9.2f}x".format(name, threads, chosen, realtime, realtime/baseline))
+    libaudioverse.shutdown()
@@ -0,0 +1,57 @@
+"""Compares the per-call overhead of the ctypes and cffi backends of the Python bindings.
+
+Both versions of every function live side by side in libaudioverse._lav, so this script needs cffi installed but doesn't care which backend is active.
+Usage: benchmark_python_backends.py [iterations]"""
+from __future__ import print_function
+import sys
+import timeit
+import ctypes
+import libaudioverse
+from libaudioverse import _lav, _libaudioverse
+
+def make_cases(prefix):
+    simulation = libaudioverse.Simulation(block_size = 256)
+    sine = libaudioverse.SineNode(simulation)
+    gain = libaudioverse.GainNode(simulation, 1)
+    sine_handle = sine.handle.handle
+    gain_handle = gain.handle.handle
+    simulation_handle = simulation.handle.handle
+    frequency = _libaudioverse.Lav_SINE_FREQUENCY
+    buffer = (ctypes.c_float*256)()
+    buffer_pointer = ctypes.POINTER(ctypes.c_float)()
+    buffer_pointer.contents = buffer
+    set_float = getattr(_lav, prefix+"node_set_float_property")
+    get_float = getattr(_lav, prefix+"node_get_float_property")
+    connect = getattr(_lav, prefix+"node_connect")
+    disconnect = getattr(_lav, prefix+"node_disconnect")
+    get_block = getattr(_lav, prefix+"simulation_get_block")
+    def connect_disconnect():
+        connect(sine_handle, 0, gain_handle, 0)
+        disconnect(sine_handle, 0, gain_handle, 0)
+    #The objects must outlive the benchmark, so they ride along with the cases.
+    return (simulation, sine, gain), [
+        ("property set", lambda: set_float(sine_handle, frequency, 440.0)),
+        ("property get", lambda: get_float(sine_handle, frequency)),
+        ("connect+disconnect", connect_disconnect),
+        ("get_block", lambda: get_block(simulation_handle, 1, 1, buffer_pointer)),
+    ]
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    libaudioverse.initialize()
+    if libaudioverse._cffi_bindings.lib is None:
+        print("cffi is not available, so there is nothing to compare.")
+        sys.exit(1)
+    print("Active backend:", _lav.backend)
+    results = dict()
+    for prefix in ("_ctypes_", "_cffi_"):
+        keepalive, cases = make_cases(prefix)
+        for name, case in cases:
+            case() #warm up.
+            results[(prefix, name)] = min(timeit.repeat(case, number = iterations, repeat = 3))/iterations
+    print("{:<20}{:>12}{:>12}{:>10}".format("call", "ctypes us", "cffi us", "speedup"))
+    for name in ("property set", "property get", "connect+disconnect", "get_block"):
+        c = results[("_ctypes_", name)]*1e6
+        f = results[("_cffi_", name)]*1e6
+        print("{:<20}{:>12.2f}{:>12.2f}{:>9.2f}x".format(name, c, f, c/f))
+    libaudioverse.shutdown()
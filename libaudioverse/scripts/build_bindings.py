@@ -4,6 +4,7 @@ import sys
 import jinja2
 sys.path = [os.path.split(os.path.split(os.path.abspath(__file__))[0])[0]] + sys.path
 import bindings.make_bindings
+import bindings.incremental
 
 
 if __name__ == '__main__':
@@ -12,4 +13,6 @@ if __name__ == '__main__':
         bindings.make_bindings.make_bindings()
     except jinja2.exceptions.TemplateSyntaxError as e:
         print("Error in template: {} line {}: {}".format(e.name, e.lineno, e.message))
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    if '--timings' in sys.argv:
+        bindings.incremental.print_timings()
\ No newline at end of file
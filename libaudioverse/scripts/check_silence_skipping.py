@@ -0,0 +1,97 @@
+"""Checks that nodes with nothing to say are skipped, and that they wake up again.
+
+The main case is Unspoken's graph: a buffer node feeding an HRTF panner, where the buffer is left playing after it ends.
+Once the sound and the HRTF tail are over, both nodes should be skipped every block until the buffer is restarted.
+Exits with status 1 if anything is wrong.
+
+Usage: check_silence_skipping.py [--block-size n]"""
+from __future__ import print_function
+import argparse
+import sys
+import libaudioverse
+
+sr = 44100
+failures = []
+
+def check(condition, message):
+    if not condition:
+        failures.append(message)
+        print("FAIL:", message, file = sys.stderr)
+
+def render(simulation, blocks):
+    """Returns the peak of the rendered audio and how many node ticks were skipped and processed while rendering it."""
+    before = simulation.get_silence_stats()
+    peak = 0.0
+    for i in range(blocks):
+        peak = max([peak] + [abs(j) for j in simulation.get_block(2)])
+    after = simulation.get_silence_stats()
+    return peak, after['skipped']-before['skipped'], after['processed']-before['processed']
+
+def check_buffer_into_hrtf(block_size):
+    simulation = libaudioverse.Simulation(sample_rate = sr, block_size = block_size)
+    buffer = libaudioverse.Buffer(simulation)
+    frames = sr//10
+    buffer.load_from_array(sr, 1, frames, [0.5]*frames)
+    player = libaudioverse.BufferNode(simulation)
+    player.buffer = buffer
+    panner = libaudioverse.HrtfNode(simulation, "default")
+    panner.azimuth = 45.0
+    player.connect(0, panner, 0)
+    panner.connect_simulation(0)
+    #The sound, the block in which the player notices it ended, and enough for the HRTF's tail.
+    blocks = frames//block_size+8
+    peak, skipped, processed = render(simulation, blocks)
+    check(peak > 0.1, "the buffer didn't play")
+    peak, skipped, processed = render(simulation, 20)
+    check(peak == 0.0, "output wasn't silent after the buffer ended")
+    check(skipped == 40, "expected the buffer and HRTF nodes to be skipped for all 20 blocks, but {} ticks were skipped and {} processed".format(skipped, processed))
+    #Restarting is a property write, which has to wake the player, which has to wake the panner.
+    player.position = 0.0
+    peak, skipped, processed = render(simulation, 4)
+    check(peak > 0.1, "the buffer didn't play after being restarted")
+    check(skipped == 0, "nodes were skipped while the buffer was playing")
+    #And stop_at stops it.
+    player.stop_at(simulation.time)
+    render(simulation, 8)
+    peak, skipped, processed = render(simulation, 20)
+    check(peak == 0.0, "output wasn't silent after stop_at")
+    check(skipped == 40, "expected both nodes to be skipped after stop_at, but {} ticks were skipped".format(skipped))
+    #Setting the position restarts a stopped node too.
+    player.position = 0.0
+    peak, skipped, processed = render(simulation, 4)
+    check(peak > 0.1, "the buffer didn't play after being stopped and restarted")
+    check(skipped == 0, "nodes were skipped after restarting a stopped buffer")
+    simulation.skip_silence = False
+    peak, skipped, processed = render(simulation, 4)
+    check(skipped == 0, "nodes were skipped with skip_silence off")
+    return simulation
+
+def check_disconnected(block_size):
+    #Nodes with nothing connected and nodes fed by paused nodes are silent from the start.
+    simulation = libaudioverse.Simulation(sample_rate = sr, block_size = block_size)
+    biquad = libaudioverse.BiquadNode(simulation, 2)
+    biquad.connect_simulation(0)
+    sine = libaudioverse.SineNode(simulation)
+    sine.state = libaudioverse.NodeStates.paused
+    gain = libaudioverse.GainNode(simulation, 1)
+    sine.connect(0, gain, 0)
+    gain.connect_simulation(0)
+    render(simulation, 2)
+    peak, skipped, processed = render(simulation, 10)
+    check(skipped == 20, "expected the biquad and gain nodes to be skipped, but {} ticks were skipped".format(skipped))
+    sine.state = libaudioverse.NodeStates.playing
+    peak, skipped, processed = render(simulation, 4)
+    check(peak > 0.1, "the gain node didn't wake up when the sine was unpaused")
+    return simulation
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Check that silent nodes are skipped.")
+    parser.add_argument("--block-size", type = int, default = 256)
+    arguments = parser.parse_args()
+    libaudioverse.initialize()
+    #Simulations freed just before shutdown can deadlock it, so they live until after.
+    keepalive = [check_buffer_into_hrtf(arguments.block_size), check_disconnected(arguments.block_size)]
+    libaudioverse.shutdown()
+    if failures:
+        sys.exit(1)
+    print("ok")
@@ -0,0 +1,82 @@
+"""Resamples a .hrtf file onto a uniform grid of azimuths and elevations.
+
+Datasets such as the MIT KEMAR set have a different number of azimuths at each elevation.
+The resampled file has the same number of azimuths everywhere and is flagged as a uniform grid, which allows Libaudioverse to find responses with a multiply instead of a search.
+Denser grids need more memory but interpolate less at runtime.  This script reports both sides of that trade-off.
+
+Usage: hrtf_grid.py <input_file> <output_file> [azimuth_step] [elevation_step]
+Steps are in degrees and default to 1 and 5."""
+import numpy
+import sys
+import hrtf_writer
+
+def interpolate(responses, min_elevation, max_elevation, elevation, azimuth):
+    """Bilinear interpolation between the measured responses surrounding (elevation, azimuth).
+    This is what Libaudioverse does at runtime, but with fractional weights."""
+    elevation_count = len(responses)
+    elevation = min(max(elevation, min_elevation), max_elevation)
+    if elevation_count > 1:
+        position = (elevation-min_elevation)/float(max_elevation-min_elevation)*(elevation_count-1)
+    else:
+        position = 0.0
+    elevation_index = min(int(numpy.floor(position)), elevation_count-1)
+    elevation_weight = position-elevation_index
+    result = numpy.zeros(len(responses[0][0]), dtype = numpy.float64)
+    for index, weight in ((elevation_index, 1.0-elevation_weight), (min(elevation_index+1, elevation_count-1), elevation_weight)):
+        if weight == 0.0:
+            continue
+        azimuths = responses[index]
+        azimuth_position = (azimuth%360.0)/(360.0/len(azimuths))
+        azimuth_index = int(numpy.floor(azimuth_position))
+        azimuth_weight = azimuth_position-azimuth_index
+        result += weight*(1.0-azimuth_weight)*azimuths[azimuth_index%len(azimuths)]
+        result += weight*azimuth_weight*azimuths[(azimuth_index+1)%len(azimuths)]
+    return result
+
+def make_grid(responses, min_elevation, max_elevation, azimuth_step, elevation_step):
+    if 360%azimuth_step != 0:
+        raise ValueError("Azimuth step must divide 360.")
+    if len(responses) > 1 and (max_elevation-min_elevation)%elevation_step != 0:
+        raise ValueError("Elevation step must divide the elevation range {} to {}.".format(min_elevation, max_elevation))
+    elevations = list(range(min_elevation, max_elevation+1, elevation_step)) if len(responses) > 1 else [min_elevation]
+    azimuths = list(range(0, 360, azimuth_step))
+    return [[interpolate(responses, min_elevation, max_elevation, e, a) for a in azimuths] for e in elevations]
+
+def grid_error(original, grid, min_elevation, max_elevation):
+    """Returns the error of reconstructing every original measurement from the grid as a list of decibel values relative to the measurement's energy."""
+    errors = []
+    for index, azimuths in enumerate(original):
+        if len(original) > 1:
+            elevation = min_elevation+index*(max_elevation-min_elevation)/float(len(original)-1)
+        else:
+            elevation = min_elevation
+        for azimuth_index, response in enumerate(azimuths):
+            azimuth = azimuth_index*360.0/len(azimuths)
+            reconstructed = interpolate(grid, min_elevation, max_elevation, elevation, azimuth)
+            signal = numpy.sum(numpy.square(response.astype(numpy.float64)))
+            noise = numpy.sum(numpy.square(reconstructed-response))
+            if signal == 0.0:
+                continue
+            errors.append(10*numpy.log10(max(noise, 1e-30)/signal))
+    return errors
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (3, 4, 5):
+        print("Usage: hrtf_grid.py <input_file> <output_file> [azimuth_step] [elevation_step]")
+        exit()
+    input_file = sys.argv[1]
+    output_file = sys.argv[2]
+    azimuth_step = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    elevation_step = int(sys.argv[4]) if len(sys.argv) > 4 else 5
+    samplerate, min_elevation, max_elevation, flags, responses = hrtf_writer.read_hrtf(input_file)
+    print("Read {} elevations from {}. Azimuth counts: {}".format(len(responses), input_file, [len(i) for i in responses]))
+    print("Resampling to a grid of {} degrees azimuth by {} degrees elevation.".format(azimuth_step, elevation_step))
+    grid = make_grid(responses, min_elevation, max_elevation, azimuth_step, elevation_step)
+    errors = grid_error(responses, grid, min_elevation, max_elevation)
+    original_size = sum(len(i) for i in responses)*len(responses[0][0])*4
+    writer = hrtf_writer.HrtfWriter(samplerate = samplerate, min_elevation = min_elevation, max_elevation = max_elevation, responses = grid, flags = hrtf_writer.HRTF_FLAG_UNIFORM_GRID, print_progress = False)
+    print("Memory: {} bytes before, {} bytes after ({:.2f}x), at {} hz.".format(original_size, writer.memory_usage(), writer.memory_usage()/float(original_size), samplerate))
+    print("Error reconstructing the original measurements: mean {:.2f} dB, worst {:.2f} dB.".format(numpy.mean(errors), numpy.max(errors)))
+    writer.pack_data()
+    writer.write_file(output_file)
+    print("Wrote", output_file)
@@ -10,6 +10,9 @@ import uuid
 
 EndiannessTypes=enum.Enum("EndiannessTypes", "big little")
 
+#Flags are stored in the low byte of the endianness marker.  Bit 0 is always set.
+HRTF_FLAG_UNIFORM_GRID = 2
+
 class HrtfWriter(object):
     endianness_marker = 1
     #The odd syntax here lets us put comments in.
@@ -23,7 +26,7 @@ class HrtfWriter(object):
     "{}", #hole for the responses.
     ])
 
-    def __init__(self, samplerate, min_elevation, max_elevation, responses, endianness=EndiannessTypes.little, print_progress=True):
+    def __init__(self, samplerate, min_elevation, max_elevation, responses, endianness=EndiannessTypes.little, print_progress=True, flags=0):
         """Parameters should all be integers:
         samplerate: obvious.
         min_elevation: Lowest elevation in degrees.
@@ -32,6 +35,7 @@ class HrtfWriter(object):
         Each sublist is one elevation, and they should be stored in ascending order (lowest elevation first).
         endianness: Endianness of the target CPU.
         print_progress: If true, using this class prints progress information to stdout.
+        flags: HRTF_FLAG_* constants or'd together.  HRTF_FLAG_UNIFORM_GRID requires every elevation to have the same azimuth count.
         """
         self.samplerate=int(samplerate)
         self.elevation_count = len(responses)
@@ -54,6 +58,9 @@ class HrtfWriter(object):
                 raise valueError("Responses must all have the same length.")
         self.response_length = response_lengths[0]
         self.response_count=sum((len(elev) for elev in self.responses))
+        self.flags = int(flags)
+        if self.flags & HRTF_FLAG_UNIFORM_GRID and len(set(self.azimuth_counts)) != 1:
+            raise ValueError("Uniform grids must have the same number of azimuths at every elevation.")
         self.progress("basic sanity checks passed and HRTF Writer initialized.")
         self.progress("Dataset has {} responses and {} elevations".format(self.response_length, self.elevation_count))
         self.progress("sr =", self.samplerate)
@@ -74,7 +81,7 @@ class HrtfWriter(object):
         self.make_format_string()
         iter = itertools.chain(
         uuid.uuid4().bytes, #Generate a 16-byte uuid.
-        [self.endianness_marker, self.samplerate, self.response_count,
+        [self.endianness_marker | self.flags, self.samplerate, self.response_count,
         self.elevation_count, self.min_elevation, self.max_elevation],
         self.azimuth_counts,
         [self.response_length],
@@ -115,9 +122,39 @@ class HrtfWriter(object):
             return new_response
         self.map(conv)
 
+    def memory_usage(self):
+        """Size in bytes of the responses once loaded, assuming 4-byte floats."""
+        return self.response_count*self.response_length*4
+
     def standard_build(self, path):
         """Does a standard build, that is the transformations that should be made on most HRIRs."""
         self.progress("Standard build requested.")
         self.data_to_float64()
         self.pack_data()
         self.write_file(path)
+
+def read_hrtf(path):
+    """Reads a .hrtf file, returning (samplerate, min_elevation, max_elevation, flags, responses).
+    responses is in the format expected by HrtfWriter: a list of lists of float32 Numpy arrays, lowest elevation first."""
+    with open(path, "rb") as f:
+        data = f.read()
+    endianness_token = "<"
+    marker = struct.unpack_from("<i", data, 16)[0]
+    if marker & ~0xfe != 1:
+        endianness_token = ">"
+        marker = struct.unpack_from(">i", data, 16)[0]
+    offset = 20
+    samplerate, response_count, elevation_count, min_elevation, max_elevation = struct.unpack_from(endianness_token+"5i", data, offset)
+    offset += 20
+    azimuth_counts = struct.unpack_from(endianness_token+str(elevation_count)+"i", data, offset)
+    offset += 4*elevation_count
+    response_length = struct.unpack_from(endianness_token+"i", data, offset)[0]
+    offset += 4
+    all_responses = numpy.frombuffer(data, dtype = numpy.dtype(numpy.float32).newbyteorder(endianness_token), offset = offset)
+    all_responses = all_responses.reshape((response_count, response_length)).astype(numpy.float32)
+    responses = []
+    index = 0
+    for count in azimuth_counts:
+        responses.append([all_responses[index+i] for i in range(count)])
+        index += count
+    return samplerate, min_elevation, max_elevation, marker & 0xfe, responses
@@ -83,11 +83,28 @@ void EnvironmentNode::willTick() {
 	if(environment_info.distance_model == Lav_DISTANCE_MODEL_DELEGATE) environment_info.distance_model = Lav_DISTANCE_MODEL_LINEAR;
 	environment_info.panning_strategy = getProperty(Lav_ENVIRONMENT_PANNING_STRATEGY).getIntValue();
 	if(environment_info.panning_strategy == Lav_PANNING_STRATEGY_DELEGATE) environment_info.panning_strategy = Lav_PANNING_STRATEGY_STEREO;
+	environment_info.cull_threshold = getProperty(Lav_ENVIRONMENT_CULL_THRESHOLD).getFloatValue();
 	//give the new environment to the sources.
 	//this is a set of weak pointers.
+	int culled = 0;
+	hrtf_candidates.clear();
 	filterWeakPointers(sources, [&](std::shared_ptr<SourceNode> &s) {
 		s->update(environment_info);
+		if(s->isCulled()) culled++;
+		//Sources already using HRTF get a head start of about 2 DB so that two sources of about the same loudness don't keep trading places.
+		else if(s->wantsHrtf()) hrtf_candidates.emplace_back(s->getDryGain()*(s->isUsingHrtf() ? 1.25f : 1.0f), s.get());
 	});
+	int maxHrtf = getProperty(Lav_ENVIRONMENT_MAX_HRTF_SOURCES).getIntValue();
+	int degraded = 0;
+	if(maxHrtf >= 0 && maxHrtf < (int)hrtf_candidates.size()) {
+		//Only the order of the first maxHrtf matters: they keep HRTF and everyone else gets stereo.
+		std::nth_element(hrtf_candidates.begin(), hrtf_candidates.begin()+maxHrtf, hrtf_candidates.end(),
+		[] (const std::tuple<float, SourceNode*> &a, const std::tuple<float, SourceNode*> &b) {return std::get<0>(a) > std::get<0>(b);});
+		for(int i = maxHrtf; i < (int)hrtf_candidates.size(); i++) std::get<1>(hrtf_candidates[i])->setDegraded(true);
+		degraded = (int)hrtf_candidates.size()-maxHrtf;
+	}
+	getProperty(Lav_ENVIRONMENT_CULLED_SOURCES).setIntValue(culled);
+	getProperty(Lav_ENVIRONMENT_DEGRADED_SOURCES).setIntValue(degraded);
 	for(auto p: source_buffers) std::fill(p, p+block_size, 0.0f);
 }
 
@@ -203,6 +220,17 @@ int EnvironmentNode::getEffectSendCount() {
 	return (int)effect_sends.size();
 }
 
+void EnvironmentNode::updateSources(std::vector<std::shared_ptr<SourceNode>> &toUpdate, const float* positions, const float* orientations) {
+	auto self = shared_from_this();
+	for(auto &s: toUpdate) {
+		if(s->getEnvironment() != self) ERROR(Lav_ERROR_INVALID_HANDLE, "Source belongs to a different environment.");
+	}
+	for(unsigned int i = 0; i < toUpdate.size(); i++) {
+		toUpdate[i]->getProperty(Lav_3D_POSITION).setFloat3Value(positions+3*i);
+		if(orientations) toUpdate[i]->getProperty(Lav_3D_ORIENTATION).setFloat6Value(orientations+6*i, false);
+	}
+}
+
 //begin public api
 
 Lav_PUBLIC_FUNCTION LavError Lav_createEnvironmentNode(LavHandle simulationHandle, const char*hrtfPath, LavHandle* destination) {
@@ -225,6 +253,20 @@ Lav_PUBLIC_FUNCTION LavError Lav_environmentNodePlayAsync(LavHandle nodeHandle,
 	PUB_END
 }
 
+Lav_PUBLIC_FUNCTION LavError Lav_environmentNodeUpdateSources(LavHandle nodeHandle, int count, LavHandle* sourceHandles, float* positions, float* orientations) {
+	PUB_BEGIN
+	if(count < 0) ERROR(Lav_ERROR_RANGE, "Count cannot be negative.");
+	if(count && (sourceHandles == nullptr || positions == nullptr)) ERROR(Lav_ERROR_NULL_POINTER, "Sources and positions are required.");
+	auto e = incomingObject<EnvironmentNode>(nodeHandle);
+	std::vector<std::shared_ptr<SourceNode>> sources;
+	sources.reserve(count);
+	for(int i = 0; i < count; i++) sources.push_back(incomingObject<SourceNode>(sourceHandles[i]));
+	//One lock for the whole batch, so the audio thread sees all of it on the same tick.
+	LOCK(*e);
+	e->updateSources(sources, positions, orientations);
+	PUB_END
+}
+
 Lav_PUBLIC_FUNCTION LavError Lav_environmentNodeAddEffectSend(LavHandle nodeHandle, int channels, int isReverb, int connectByDefault, int* destination) {
 	PUB_BEGIN
 	auto e = incomingObject<EnvironmentNode>(nodeHandle);
@@ -25,6 +25,7 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <math.h>
 #include <stdlib.h>
 #include <glm/glm.hpp>
+#include <algorithm>
 #include <memory>
 #include <set>
 #include <vector>
@@ -89,6 +90,30 @@ void SourceNode::stopFeedingEffect(int which) {
 void SourceNode::reset() {
 }
 
+std::shared_ptr<EnvironmentNode> SourceNode::getEnvironment() {
+	return environment;
+}
+
+bool SourceNode::isCulled() {
+	return culled || silent;
+}
+
+bool SourceNode::wantsHrtf() {
+	return culled == false && panning_strategy == Lav_PANNING_STRATEGY_HRTF;
+}
+
+bool SourceNode::isUsingHrtf() {
+	return hrtf_active;
+}
+
+float SourceNode::getDryGain() {
+	return dry_gain;
+}
+
+void SourceNode::setDegraded(bool d) {
+	degraded = d;
+}
+
 //helper function: calculates gains given distance models.
 float calculateGainForDistanceModel(int model, float distance, float maxDistance, float referenceDistance) {
 	float retval = 1.0f;
@@ -116,6 +141,12 @@ int SourceNode::computeDistanceModel(EnvironmentInfo& env) {
 }
 
 void SourceNode::update(EnvironmentInfo &env) {
+	degraded = false;
+	//Paused sources don't process, so there's no point in working out where they are.
+	if(getState() == Lav_NODESTATE_PAUSED) {
+		culled = true;
+		return;
+	}
 	//first, extract the vector of our position.
 	const float* pos = getProperty(Lav_3D_POSITION).getFloat3Value();
 	bool isHeadRelative = getProperty(Lav_SOURCE_HEAD_RELATIVE).getIntValue() == 1;
@@ -156,6 +187,10 @@ void SourceNode::update(EnvironmentInfo &env) {
 	float mul = getProperty(Lav_NODE_MUL).getFloatValue();
 	dry_gain*=mul;
 	reverb_gain*=mul;
+	if(std::max(dry_gain, reverbCount ? reverb_gain : 0.0f) < env.cull_threshold) {
+		culled = true;
+		return;
+	}
 	//Apply these.
 	hrtf_panner.setAzimuth(azimuth);
 	hrtf_panner.setElevation(elevation);
@@ -168,15 +203,38 @@ void SourceNode::update(EnvironmentInfo &env) {
 	surround71_panner.setAzimuth(azimuth);
 	surround71_panner.setElevation(elevation);
 	handleOcclusion();
+	hrtf_panner.setConvolutionMode(getProperty(Lav_SOURCE_CONVOLUTION_MODE).getIntValue());
 	panning_strategy = getProperty(Lav_SOURCE_PANNING_STRATEGY).getIntValue();
 	if(panning_strategy == Lav_PANNING_STRATEGY_DELEGATE) panning_strategy = env.panning_strategy;
 }
 
 void SourceNode::process() {
-	if(culled) return; //nothing to do.
-	//The panners always skip channels 2 and 3, so 7.1 only needs 6 pointers. Plus 1 for the occlusion.
+	if(culled) {
+		hrtf_active = false;
+		last_strategy = -1;
+		return; //nothing to do.
+	}
+	//Once the input has been silent for longer than the longest tail (the hrtf response plus a block of crossfade), the panners are outputting silence too.
+	bool inputIsSilent = true;
+	for(int i = 0; i < block_size && inputIsSilent; i++) inputIsSilent = input_buffers[0][i] == 0.0f;
+	if(inputIsSilent) silent_samples = std::min(silent_samples+block_size, hrtf_data->getLength()+2*block_size);
+	else silent_samples = 0;
+	silent = silent_samples >= hrtf_data->getLength()+2*block_size;
+	if(silent) return;
+	int strategy = panning_strategy;
+	if(degraded && strategy == Lav_PANNING_STRATEGY_HRTF) strategy = Lav_PANNING_STRATEGY_STEREO;
+	//The hrtf panner's history is stale if it sat out any blocks, so start it over.
+	if(strategy == Lav_PANNING_STRATEGY_HRTF && hrtf_active == false) hrtf_panner.reset();
+	hrtf_active = strategy == Lav_PANNING_STRATEGY_HRTF;
+	//If max_hrtf_sources just moved us between the hrtf and stereo panners, we run both for this block and fade from the old to the new.
+	//Otherwise the hrtf's tail is cut off when we are degraded, and its empty history clicks when we are promoted.
+	bool crossfading = panning_strategy == Lav_PANNING_STRATEGY_HRTF && last_strategy != strategy
+	&& (last_strategy == Lav_PANNING_STRATEGY_HRTF || last_strategy == Lav_PANNING_STRATEGY_STEREO);
+	int previousStrategy = last_strategy;
+	last_strategy = strategy;
+	//The panners always skip channels 2 and 3, so 7.1 only needs 6 pointers. Plus 1 for the occlusion, and 2 for the panner we are fading from.
 	//We put these together because this increases cache locality.
-	float* ws = source_workspace.get(block_size*7);
+	float* ws = source_workspace.get(block_size*9);
 	float* occluded = ws;
 	//The two nullptrs are never, ever used by panners. Ever.
 	float* panBuffers[] = {ws+block_size, ws+2*block_size, nullptr, nullptr, ws+3*block_size, ws+4*block_size, ws+5*block_size, ws+6*block_size};
@@ -185,7 +243,7 @@ void SourceNode::process() {
 	int channels = 0;
 	//The following could be replaced with a multipanner.
 	//if we did that, however, we'd have some extra, unavoidable copies.  So we don't.
-	switch(panning_strategy) {
+	switch(strategy) {
 		case Lav_PANNING_STRATEGY_HRTF:
 		hrtf_panner.pan(occluded, panBuffers[0], panBuffers[1]);
 		channels = 2;
@@ -207,6 +265,17 @@ void SourceNode::process() {
 		channels = 8;
 		break;
 	}
+	if(crossfading) {
+		float* fadingBuffers[] = {ws+7*block_size, ws+8*block_size};
+		if(previousStrategy == Lav_PANNING_STRATEGY_HRTF) hrtf_panner.pan(occluded, fadingBuffers[0], fadingBuffers[1]);
+		else stereo_panner.pan(occluded, fadingBuffers);
+		for(int i = 0; i < 2; i++) {
+			for(int j = 0; j < block_size; j++) {
+				float weight = (j+1)/(float)block_size;
+				panBuffers[i][j] = panBuffers[i][j]*weight+fadingBuffers[i][j]*(1.0f-weight);
+			}
+		}
+	}
 	for(int i = 0; i < channels; i++) if(panBuffers[i]) multiplicationAdditionKernel(block_size, dry_gain, panBuffers[i], environment->source_buffers[i], environment->source_buffers[i]);
 	for(auto &s: fed_effects) {
 		auto &send = environment->getEffectSend(s.first);
@@ -6,7 +6,6 @@ A copy of both licenses may be found in license.gpl and license.mpl at the root
 If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
 
 #include <libaudioverse/libaudioverse.h>
-#include <libaudioverse/private/file.hpp>
 #include <libaudioverse/private/buffer.hpp>
 #include <libaudioverse/private/simulation.hpp>
 #include <libaudioverse/private/kernels.hpp>
@@ -28,7 +27,33 @@ std::shared_ptr<Buffer> createBuffer(std::shared_ptr<Simulation>simulation) {
 }
 
 Buffer::~Buffer() {
-	if(data) delete[] data;
+}
+
+BufferData::BufferData(int channels, int frames, float* data): channels(channels), frames(frames), data(data) {
+}
+
+BufferData::BufferData(int channels, int frames, float* data, std::shared_ptr<void> storage): channels(channels), frames(frames), data(data), storage(storage) {
+}
+
+BufferData::~BufferData() {
+	if(data && storage == nullptr) delete[] data;
+}
+
+std::shared_ptr<BufferData> createBufferData(int sr, int targetSr, int channels, int frames, float* inputData) {
+	float* data = nullptr;
+	int newFrames = 0;
+	staticResamplerKernel(sr, targetSr, channels, frames, inputData, &newFrames, &data);
+	if(data==nullptr) ERROR(Lav_ERROR_MEMORY);
+	if(channels == 1) return std::make_shared<BufferData>(channels, newFrames, data); //It's already uninterleaved.
+	//Uninterleave the data and delete the old one.
+	float* newData = new float[channels*newFrames];
+	for(int ch = 0; ch < channels; ch++) {
+		for(int i = 0; i < newFrames; i++) {
+			newData[ch*newFrames+i] = data[channels*i+ch];
+		}
+	}
+	delete[] data;
+	return std::make_shared<BufferData>(channels, newFrames, newData);
 }
 
 std::shared_ptr<Simulation> Buffer::getSimulation() {
@@ -48,24 +73,33 @@ int Buffer::getChannels() {
 }
 
 void Buffer::loadFromArray(int sr, int channels, int frames, float* inputData) {
-	int simulationSr= (int)simulation->getSr();
-	if(data) {
-		delete[] data;
-		data = nullptr;
-	}
-	staticResamplerKernel(sr, simulationSr, channels, frames, inputData, &(this->frames), &data);
-	if(data==nullptr) ERROR(Lav_ERROR_MEMORY);
-	this->channels = channels;
-	if(this->channels == 1) return; //It's already uninterleaved.
-	//Uninterleave the data and delete the old one.
-	float* newData = new float[this->channels*this->frames];
-	for(int ch = 0; ch < this->channels; ch++) {
-		for(int i = 0; i < this->frames; i++) {
-			newData[ch*this->frames+i] = data[this->channels*i+ch];
-		}
-	}
-	delete[] data;
-	data = newData;
+	setData(createBufferData(sr, (int)simulation->getSr(), channels, frames, inputData));
+}
+
+void Buffer::setData(std::shared_ptr<BufferData> newData) {
+	buffer_data = newData;
+	channels = newData->channels;
+	frames = newData->frames;
+	data = newData->data;
+	load_generation++;
+}
+
+const std::shared_ptr<BufferData>& Buffer::getData() {
+	return buffer_data;
+}
+
+int Buffer::startLoading() {
+	buffer_data = nullptr;
+	channels = 0;
+	frames = 0;
+	data = nullptr;
+	return ++load_generation;
+}
+
+bool Buffer::finishLoading(int generation, std::shared_ptr<BufferData> newData) {
+	if(generation != load_generation) return false;
+	setData(newData);
+	return true;
 }
 
 float Buffer::getSample(int frame, int channel) {
@@ -77,6 +111,11 @@ float* Buffer::getPointer(int frame, int channel) {
 }
 
 void Buffer::normalize() {
+	if(data == nullptr) return;
+	//The data may be shared with the cache and other buffers, so normalize a copy.
+	float* copy = new float[channels*frames];
+	std::copy(data, data+channels*frames, copy);
+	setData(std::make_shared<BufferData>(channels, frames, copy));
 	float min = *std::min_element(data, data+channels*frames);
 	float max = *std::max_element(data, data+channels*frames);
 	float normfactor = std::max(fabs(min), fabs(max));
@@ -126,16 +165,41 @@ Lav_PUBLIC_FUNCTION LavError Lav_bufferGetSimulation(LavHandle handle, LavHandle
 Lav_PUBLIC_FUNCTION LavError Lav_bufferLoadFromFile(LavHandle bufferHandle, const char* path) {
 	PUB_BEGIN
 	auto buff =incomingObject<Buffer>(bufferHandle);
-	FileReader f{};
-	f.open(path);
-	float* data = allocArray<float>(f.getSampleCount());
-	f.readAll(data);
+	//Decoding can take a while, so don't hold the lock for it.
+	auto data = loadBufferDataFromFile(path, (int)buff->getSimulation()->getSr());
+	LOCK(*buff);
+	buff->throwIfInUse();
+	buff->setData(data);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_bufferLoadFromFileAsync(LavHandle bufferHandle, const char* path, LavBufferLoadedCallback callback, void* userdata) {
+	PUB_BEGIN
+	auto buff = incomingObject<Buffer>(bufferHandle);
+	auto simulation = buff->getSimulation();
+	int generation;
 	{
-		LOCK(*buff);
-		buff->throwIfInUse();
-		buff->loadFromArray(f.getSr(), f.getChannelCount(), f.getSampleCount()/f.getChannelCount(), data);
+		LOCK(*simulation);
+		generation = buff->startLoading();
+		//Anything playing the old contents needs to know they're gone.
+		simulation->bufferDataChanged(buff);
 	}
-	freeArray(data);
+	std::weak_ptr<Buffer> weakBuffer = buff;
+	loadBufferDataFromFileAsync(std::string(path), (int)simulation->getSr(), [weakBuffer, generation, callback, userdata] (std::shared_ptr<BufferData> data, ErrorException* error) {
+		LavError result = Lav_ERROR_NONE;
+		auto buff = weakBuffer.lock();
+		if(error) {
+			//Recorded for this thread, so the callback can ask for the message.
+			recordError(*error);
+			result = error->error;
+		}
+		else if(buff) {
+			auto simulation = buff->getSimulation();
+			LOCK(*simulation);
+			if(buff->finishLoading(generation, data)) simulation->bufferDataChanged(buff);
+		}
+		if(callback) callback(outgoingObject(buff), result, userdata);
+	});
 	PUB_END
 }
 
@@ -0,0 +1,202 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+#include <libaudioverse/libaudioverse.h>
+#include <libaudioverse/private/buffer.hpp>
+#include <libaudioverse/private/file.hpp>
+#include <libaudioverse/private/memory.hpp>
+#include <libaudioverse/private/error.hpp>
+#include <libaudioverse/private/macros.hpp>
+#include <libaudioverse/private/logging.hpp>
+#include <libaudioverse/private/utf8.hpp>
+#include <boost/filesystem.hpp>
+#include <memory>
+#include <mutex>
+#include <list>
+#include <map>
+#include <tuple>
+#include <ctime>
+
+namespace libaudioverse_implementation {
+
+//Path, modification time, size, and target sampling rate.
+typedef std::tuple<boost::filesystem::path, std::time_t, uintmax_t, int> BufferCacheKey;
+
+class BufferCache {
+	public:
+	//Drop the least recently used data until we're under the limit.
+	void enforceLimit();
+	void retain(const BufferCacheKey &key, std::shared_ptr<BufferData> data);
+	std::mutex mutex;
+	//Most recently used first.
+	std::list<std::tuple<BufferCacheKey, std::shared_ptr<BufferData>>> recently_used;
+	std::map<BufferCacheKey, decltype(recently_used)::iterator> retained;
+	//Everything handed out, so that data which was evicted but is still in use gets shared instead of decoded again.
+	std::map<BufferCacheKey, std::weak_ptr<BufferData>> handed_out;
+	int64_t limit = 128*1024*1024, bytes = 0;
+	int hits = 0, misses = 0, evictions = 0;
+};
+
+BufferCache *buffer_cache;
+
+void initializeBufferCache() {
+	buffer_cache = new BufferCache();
+}
+
+void shutdownBufferCache() {
+	delete buffer_cache;
+}
+
+int64_t bufferDataSize(const std::shared_ptr<BufferData> &data) {
+	return (int64_t)data->channels*data->frames*sizeof(float);
+}
+
+void BufferCache::enforceLimit() {
+	while(bytes > limit && recently_used.empty() == false) {
+		auto &last = recently_used.back();
+		bytes -= bufferDataSize(std::get<1>(last));
+		retained.erase(std::get<0>(last));
+		recently_used.pop_back();
+		evictions++;
+	}
+}
+
+void BufferCache::retain(const BufferCacheKey &key, std::shared_ptr<BufferData> data) {
+	auto existing = retained.find(key);
+	if(existing != retained.end()) {
+		recently_used.splice(recently_used.begin(), recently_used, existing->second);
+		return;
+	}
+	recently_used.emplace_front(key, data);
+	retained[key] = recently_used.begin();
+	bytes += bufferDataSize(data);
+	enforceLimit();
+}
+
+std::shared_ptr<BufferData> decodeFile(std::string path, int targetSr) {
+	FileReader f{};
+	f.open(path.c_str());
+	float* data = allocArray<float>(f.getSampleCount());
+	f.readAll(data);
+	std::shared_ptr<BufferData> result;
+	try {
+		result = createBufferData((int)f.getSr(), targetSr, f.getChannelCount(), f.getSampleCount()/f.getChannelCount(), data);
+	}
+	catch(...) {
+		freeArray(data);
+		throw;
+	}
+	freeArray(data);
+	return result;
+}
+
+std::shared_ptr<BufferData> loadBufferDataFromFile(std::string path, int targetSr) {
+	boost::system::error_code error;
+	auto p = boost::filesystem::absolute(boost::filesystem::path(utf8ToWide(path)));
+	auto modified = boost::filesystem::last_write_time(p, error);
+	if(error) return decodeFile(path, targetSr); //Let the file reader produce the error.
+	auto size = boost::filesystem::file_size(p, error);
+	if(error) return decodeFile(path, targetSr);
+	auto key = std::make_tuple(p, modified, size, targetSr);
+	{
+		std::lock_guard<std::mutex> guard(buffer_cache->mutex);
+		auto weak = buffer_cache->handed_out.find(key);
+		if(weak != buffer_cache->handed_out.end()) {
+			auto data = weak->second.lock();
+			if(data) {
+				buffer_cache->hits++;
+				buffer_cache->retain(key, data);
+				return data;
+			}
+			buffer_cache->handed_out.erase(weak);
+		}
+		buffer_cache->misses++;
+		//Misses are rare and about to decode a file, so this is a fine time to forget dead data.
+		for(auto i = buffer_cache->handed_out.begin(); i != buffer_cache->handed_out.end();) {
+			if(i->second.expired()) i = buffer_cache->handed_out.erase(i);
+			else i++;
+		}
+	}
+	//Decode without the lock, so that loading one file doesn't block loading others.
+	//The disk cache wants a stable name for the file, so give it the absolute path.
+	auto absolutePath = wideToUtf8(p.wstring());
+	auto data = readBufferDiskCache(absolutePath, (int64_t)modified, (int64_t)size, targetSr);
+	if(data == nullptr) {
+		data = decodeFile(path, targetSr);
+		writeBufferDiskCache(absolutePath, (int64_t)modified, (int64_t)size, targetSr, data);
+	}
+	std::lock_guard<std::mutex> guard(buffer_cache->mutex);
+	//Someone else may have decoded it while we were. If so, share theirs.
+	auto &weak = buffer_cache->handed_out[key];
+	auto other = weak.lock();
+	if(other) data = other;
+	else weak = data;
+	buffer_cache->retain(key, data);
+	return data;
+}
+
+BufferCacheStatistics getBufferCacheStatistics() {
+	std::lock_guard<std::mutex> guard(buffer_cache->mutex);
+	BufferCacheStatistics stats;
+	stats.hits = buffer_cache->hits;
+	stats.misses = buffer_cache->misses;
+	stats.evictions = buffer_cache->evictions;
+	stats.entries = buffer_cache->retained.size();
+	stats.bytes = buffer_cache->bytes;
+	return stats;
+}
+
+void setBufferCacheLimit(int64_t bytes) {
+	std::lock_guard<std::mutex> guard(buffer_cache->mutex);
+	buffer_cache->limit = bytes;
+	buffer_cache->enforceLimit();
+}
+
+int64_t getBufferCacheLimit() {
+	std::lock_guard<std::mutex> guard(buffer_cache->mutex);
+	return buffer_cache->limit;
+}
+
+void clearBufferCache() {
+	std::lock_guard<std::mutex> guard(buffer_cache->mutex);
+	buffer_cache->recently_used.clear();
+	buffer_cache->retained.clear();
+	buffer_cache->bytes = 0;
+}
+
+//begin public api
+
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheGetStatistics(int* destinationHits, int* destinationMisses, int* destinationEvictions, int* destinationEntries, double* destinationMegabytes) {
+	PUB_BEGIN
+	auto stats = getBufferCacheStatistics();
+	*destinationHits = stats.hits;
+	*destinationMisses = stats.misses;
+	*destinationEvictions = stats.evictions;
+	*destinationEntries = stats.entries;
+	*destinationMegabytes = stats.bytes/(1024.0*1024.0);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheSetLimit(double megabytes) {
+	PUB_BEGIN
+	if(megabytes < 0.0) ERROR(Lav_ERROR_RANGE, "The buffer cache limit cannot be negative.");
+	setBufferCacheLimit((int64_t)(megabytes*1024*1024));
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheGetLimit(double* destination) {
+	PUB_BEGIN
+	*destination = getBufferCacheLimit()/(1024.0*1024.0);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheClear() {
+	PUB_BEGIN
+	clearBufferCache();
+	PUB_END
+}
+
+}
@@ -0,0 +1,213 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+#include <libaudioverse/libaudioverse.h>
+#include <libaudioverse/private/buffer.hpp>
+#include <libaudioverse/private/error.hpp>
+#include <libaudioverse/private/macros.hpp>
+#include <libaudioverse/private/logging.hpp>
+#include <libaudioverse/private/utf8.hpp>
+#include <boost/filesystem.hpp>
+#include <boost/filesystem/fstream.hpp>
+#include <boost/iostreams/device/mapped_file.hpp>
+#include <memory>
+#include <mutex>
+#include <vector>
+#include <tuple>
+#include <algorithm>
+#include <limits>
+#include <ctime>
+#include <stdio.h>
+#include <inttypes.h>
+
+namespace libaudioverse_implementation {
+
+//Change the last two characters whenever the layout changes. Old files then fail validation and get replaced.
+const char buffer_disk_cache_magic[8] = {'L', 'A', 'V', 'P', 'C', 'M', '0', '1'};
+const int64_t BUFFER_DISK_CACHE_ALIGNMENT = 64;
+
+/**The start of every cache file.
+The source path follows, then the samples as 32-bit floats, channel-major like BufferData, starting at data_offset.
+Everything is in the writer's byte order, which the endianness field lets readers check.*/
+struct BufferDiskCacheHeader {
+	char magic[8];
+	int32_t endianness; //Always 1.
+	int32_t target_sr;
+	int32_t channels;
+	int32_t path_length;
+	int64_t frames;
+	int64_t source_size;
+	int64_t source_modified;
+	int64_t data_offset;
+	char reserved[8];
+};
+
+static_assert(sizeof(BufferDiskCacheHeader) == BUFFER_DISK_CACHE_ALIGNMENT, "The buffer cache header must keep the samples aligned.");
+
+class BufferDiskCache {
+	public:
+	std::mutex mutex;
+	//Empty when the cache is off.
+	boost::filesystem::path directory;
+};
+
+BufferDiskCache *buffer_disk_cache = nullptr;
+
+void initializeBufferDiskCache() {
+	buffer_disk_cache = new BufferDiskCache();
+}
+
+void shutdownBufferDiskCache() {
+	delete buffer_disk_cache;
+}
+
+boost::filesystem::path getBufferDiskCacheDirectory() {
+	std::lock_guard<std::mutex> guard(buffer_disk_cache->mutex);
+	return buffer_disk_cache->directory;
+}
+
+int64_t bufferDiskCacheDataOffset(int64_t pathLength) {
+	int64_t end = sizeof(BufferDiskCacheHeader)+pathLength;
+	return (end+BUFFER_DISK_CACHE_ALIGNMENT-1)/BUFFER_DISK_CACHE_ALIGNMENT*BUFFER_DISK_CACHE_ALIGNMENT;
+}
+
+boost::filesystem::path bufferDiskCacheEntry(const boost::filesystem::path &directory, const std::string &path, int targetSr) {
+	//FNV-1a, so that names don't depend on which standard library wrote them.
+	uint64_t hash = 14695981039346656037ULL;
+	for(unsigned char c: path) {
+		hash ^= c;
+		hash *= 1099511628211ULL;
+	}
+	char name[64];
+	snprintf(name, sizeof(name), "%016" PRIx64 "-%i.lavpcm", hash, targetSr);
+	return directory / name;
+}
+
+void setBufferDiskCacheDirectory(std::string path) {
+	boost::filesystem::path p;
+	if(path.empty() == false) {
+		boost::system::error_code error;
+		p = boost::filesystem::absolute(boost::filesystem::path(utf8ToWide(path)));
+		boost::filesystem::create_directories(p, error);
+		if(error || boost::filesystem::is_directory(p, error) == false) ERROR(Lav_ERROR_FILE, "Could not create the buffer cache directory.");
+	}
+	std::lock_guard<std::mutex> guard(buffer_disk_cache->mutex);
+	buffer_disk_cache->directory = p;
+}
+
+std::shared_ptr<BufferData> readBufferDiskCache(const std::string &path, int64_t modified, int64_t size, int targetSr) {
+	auto directory = getBufferDiskCacheDirectory();
+	if(directory.empty()) return nullptr;
+	auto entry = bufferDiskCacheEntry(directory, path, targetSr);
+	try {
+		boost::system::error_code error;
+		if(boost::filesystem::exists(entry, error) == false) return nullptr;
+		auto map = std::make_shared<boost::iostreams::mapped_file_source>(entry);
+		if(map->size() < sizeof(BufferDiskCacheHeader)) return nullptr;
+		BufferDiskCacheHeader header;
+		std::copy(map->data(), map->data()+sizeof(header), (char*)&header);
+		if(std::equal(buffer_disk_cache_magic, buffer_disk_cache_magic+8, header.magic) == false || header.endianness != 1) return nullptr;
+		if(header.target_sr != targetSr || header.source_size != size || header.source_modified != modified) return nullptr;
+		if(header.path_length != (int64_t)path.size() || header.data_offset != bufferDiskCacheDataOffset(path.size())) return nullptr;
+		if(header.channels <= 0 || header.frames < 0 || header.frames > std::numeric_limits<int>::max()) return nullptr;
+		if((int64_t)map->size() != header.data_offset+header.channels*header.frames*(int64_t)sizeof(float)) return nullptr;
+		//Two paths can hash the same, so the path is stored and compared.
+		if(std::equal(path.begin(), path.end(), map->data()+sizeof(header)) == false) return nullptr;
+		//Mark it as recently used, so that trimming removes it last.
+		boost::filesystem::last_write_time(entry, std::time(nullptr), error);
+		//The map is read-only, but BufferData never writes.
+		float* data = (float*)(map->data()+header.data_offset);
+		return std::make_shared<BufferData>(header.channels, (int)header.frames, data, map);
+	}
+	catch(std::exception &e) {
+		//Mapping throws std::ios_base::failure. An entry we can't map is just a miss.
+		logDebug("Buffer cache: could not map %s: %s", entry.string().c_str(), e.what());
+		return nullptr;
+	}
+}
+
+void writeBufferDiskCache(const std::string &path, int64_t modified, int64_t size, int targetSr, const std::shared_ptr<BufferData> &data) {
+	auto directory = getBufferDiskCacheDirectory();
+	if(directory.empty()) return;
+	auto entry = bufferDiskCacheEntry(directory, path, targetSr);
+	boost::system::error_code error;
+	auto temporary = directory / boost::filesystem::unique_path("%%%%%%%%%%%%%%%%.tmp", error);
+	if(error) return;
+	BufferDiskCacheHeader header = {};
+	std::copy(buffer_disk_cache_magic, buffer_disk_cache_magic+8, header.magic);
+	header.endianness = 1;
+	header.target_sr = targetSr;
+	header.channels = data->channels;
+	header.path_length = (int32_t)path.size();
+	header.frames = data->frames;
+	header.source_size = size;
+	header.source_modified = modified;
+	header.data_offset = bufferDiskCacheDataOffset(path.size());
+	std::vector<char> padding(header.data_offset-sizeof(header)-path.size(), 0);
+	bool failed;
+	{
+		boost::filesystem::ofstream f(temporary, std::ios::out | std::ios::binary | std::ios::trunc);
+		f.write((char*)&header, sizeof(header));
+		f.write(path.c_str(), path.size());
+		if(padding.size()) f.write(&padding[0], padding.size());
+		f.write((char*)data->data, data->channels*(int64_t)data->frames*sizeof(float));
+		f.close();
+		failed = f.fail();
+	}
+	//Renaming is atomic, so other processes see either no entry or all of this one.
+	if(failed == false) boost::filesystem::rename(temporary, entry, error);
+	if(failed || error) {
+		logDebug("Buffer cache: could not write %s.", entry.string().c_str());
+		boost::filesystem::remove(temporary, error);
+	}
+}
+
+int64_t trimBufferDiskCache(int64_t maxBytes) {
+	auto directory = getBufferDiskCacheDirectory();
+	if(directory.empty()) return 0;
+	//Last used, size, path.  Temporary files left behind by crashes count too.
+	std::vector<std::tuple<std::time_t, int64_t, boost::filesystem::path>> entries;
+	int64_t total = 0, freed = 0;
+	boost::system::error_code error;
+	for(boost::filesystem::directory_iterator i(directory, error), end; error.value() == 0 && i != end; i.increment(error)) {
+		auto p = i->path();
+		if(p.extension() != ".lavpcm" && p.extension() != ".tmp") continue;
+		boost::system::error_code entryError;
+		int64_t size = (int64_t)boost::filesystem::file_size(p, entryError);
+		if(entryError) continue;
+		std::time_t used = boost::filesystem::last_write_time(p, entryError);
+		if(entryError) continue;
+		entries.emplace_back(used, size, p);
+		total += size;
+	}
+	std::sort(entries.begin(), entries.end());
+	for(auto &i: entries) {
+		if(total <= maxBytes) break;
+		boost::filesystem::remove(std::get<2>(i), error);
+		//Windows won't delete files some process has mapped.
+		if(error) continue;
+		total -= std::get<1>(i);
+		freed += std::get<1>(i);
+	}
+	return freed;
+}
+
+//begin public api
+
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheSetDirectory(const char* path) {
+	PUB_BEGIN
+	setBufferDiskCacheDirectory(path ? std::string(path) : std::string());
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_bufferCacheTrimDirectory(double megabytes, double* destinationFreedMegabytes) {
+	PUB_BEGIN
+	if(megabytes < 0.0) ERROR(Lav_ERROR_RANGE, "Cannot trim the buffer cache directory to a negative size.");
+	*destinationFreedMegabytes = trimBufferDiskCache((int64_t)(megabytes*1024*1024))/(1024.0*1024.0);
+	PUB_END
+}
+
+}
@@ -0,0 +1,76 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+#include <libaudioverse/libaudioverse.h>
+#include <libaudioverse/private/buffer.hpp>
+#include <libaudioverse/private/error.hpp>
+#include <libaudioverse/private/logging.hpp>
+#include <powercores/thread_pool.hpp>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <algorithm>
+#include <functional>
+#include <string>
+
+namespace libaudioverse_implementation {
+
+/**Decoding is mostly disk and resampling, so one worker per core lets a batch of loads proceed in parallel.*/
+class BufferLoader {
+	public:
+	BufferLoader(int threads): pool(threads) {}
+	//ThreadPool::submitJob isn't threadsafe.
+	std::mutex mutex;
+	powercores::ThreadPool pool;
+};
+
+BufferLoader *buffer_loader = nullptr;
+
+void initializeBufferLoading() {
+	int threads = std::max<int>(1, std::thread::hardware_concurrency());
+	buffer_loader = new BufferLoader(threads);
+	buffer_loader->pool.start();
+}
+
+void shutdownBufferLoading() {
+	//Stopping the pool runs whatever is still queued first.
+	buffer_loader->pool.stop();
+	delete buffer_loader;
+	buffer_loader = nullptr;
+}
+
+void loadBufferDataFromFileAsync(std::string path, int targetSr, std::function<void(std::shared_ptr<BufferData>, ErrorException*)> done) {
+	auto job = [path, targetSr, done] () {
+		std::shared_ptr<BufferData> data;
+		ErrorException error;
+		try {
+			data = loadBufferDataFromFile(path, targetSr);
+		}
+		catch(ErrorException &e) {
+			error = e;
+		}
+		catch(std::bad_alloc &e) {
+			error = ErrorException(Lav_ERROR_MEMORY, std::string("Memory allocation error: ")+e.what(), __FILE__, __LINE__);
+		}
+		catch(std::exception &e) {
+			error = ErrorException(Lav_ERROR_UNKNOWN, std::string("Standard library exception: ")+e.what(), __FILE__, __LINE__);
+		}
+		catch(...) {
+			error = ErrorException(Lav_ERROR_UNKNOWN, "Unable to determine error. Thrown exception was not ErrorException.", __FILE__, __LINE__);
+		}
+		//An exception escaping here would take down the worker, and with it every load queued behind this one.
+		try {
+			done(data, data ? nullptr : &error);
+		}
+		catch(...) {
+			logCritical("Buffer loading: completion of %s threw.", path.c_str());
+		}
+	};
+	std::lock_guard<std::mutex> guard(buffer_loader->mutex);
+	buffer_loader->pool.submitJob(job);
+}
+
+}
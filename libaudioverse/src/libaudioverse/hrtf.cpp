@@ -28,8 +28,11 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <memory>
 #include <algorithm>
 #include <map>
+#include <set>
 #include <thread>
 #include <tuple>
+#include <mutex>
+#include <atomic>
 #include <ios>
 #include <system_error>
 
@@ -74,12 +77,10 @@ temporary_buffer2([&] () {
 }
 
 HrtfData::~HrtfData() {
+	if(coefficient_cache_storage) freeArray(coefficient_cache_storage);
 	if(hrirs == nullptr) return; //we never loaded one.
-	for(int i = 0; i < elev_count; i++) {
-		//The staticResamplerKernel allocates with new[], not allocArray.
-		for(int j = 0; j < azimuth_counts[i]; j++) delete[] hrirs[i][j];
-		delete[] hrirs[i];
-	}
+	if(hrir_storage) freeArray(hrir_storage);
+	for(int i = 0; i < elev_count; i++) delete[] hrirs[i];
 	delete[] hrirs;
 	delete[] azimuth_counts;
 }
@@ -116,11 +117,14 @@ void HrtfData::loadFromBuffer(unsigned int length, char* buffer, unsigned int fo
 	//Skip the uuid. We will use this in future.
 	iterator+=16;
 	//we now handle endianness.
+	//The marker may carry flags in its low byte, but the lowest bit is always set.
 	int32_t endianness_marker =convi(iterator);
-	if(endianness_marker != 1) reverse_endianness(iterator, length-16, 4); //-16 because of uuid.
+	if((endianness_marker & ~HRTF_FLAGS_MASK) != 1) reverse_endianness(iterator, length-16, 4); //-16 because of uuid.
 	//read it again; if it is still not 1, something has gone badly wrong.
 	endianness_marker = convi(iterator);
-	if(endianness_marker != 1) ERROR(Lav_ERROR_HRTF_INVALID, "Could not correct endianness for this architecture.");
+	if((endianness_marker & ~HRTF_FLAGS_MASK) != 1) ERROR(Lav_ERROR_HRTF_INVALID, "Could not correct endianness for this architecture.");
+	int32_t flags = endianness_marker & HRTF_FLAGS_MASK;
+	if(flags & ~HRTF_FLAG_UNIFORM_GRID) ERROR(Lav_ERROR_HRTF_INVALID, "Unrecognized HRTF flags.");
 	iterator += window_size;
 	
 	//Get the header info.
@@ -147,6 +151,16 @@ void HrtfData::loadFromBuffer(unsigned int length, char* buffer, unsigned int fo
 	for(int i = 0; i < elev_count; i++) sum_sanity_check +=azimuth_counts[i];
 	if(sum_sanity_check != hrir_count) ERROR(Lav_ERROR_HRTF_INVALID, "Not enough or too many responses.");
 
+	//Uniform grids let us index directly, but only if the file is telling the truth.
+	uniform_grid = (flags & HRTF_FLAG_UNIFORM_GRID) != 0;
+	if(uniform_grid) {
+		for(int i = 1; i < elev_count; i++) {
+			if(azimuth_counts[i] != azimuth_counts[0]) ERROR(Lav_ERROR_HRTF_INVALID, "HRTF claims to be a uniform grid, but azimuth counts differ.");
+		}
+		degrees_per_elevation = elev_count > 1 ? (max_elevation-min_elevation)/(float)(elev_count-1) : 0.0f;
+		degrees_per_azimuth = 360.0f/azimuth_counts[0];
+	}
+
 	int before_hrir_length = convi(iterator);
 	iterator += window_size;
 
@@ -164,19 +178,33 @@ void HrtfData::loadFromBuffer(unsigned int length, char* buffer, unsigned int fo
 	}
 
 	//the above gives us what amounts to a 2d array.  The first dimension represents elevation.  The second dimension represents azimuth going clockwise.
+	//Every response is the same length after resampling, so they all live in one allocation, each starting on the SIMD alignment boundary.
 	//fill it.
 	float* tempBuffer = allocArray<float>(before_hrir_length);
 	int final_hrir_length = 0;
+	int stride = 0, index = 0;
 	for(int elev = 0; elev < elev_count; elev++) {
 		for(int azimuth = 0; azimuth < azimuth_counts[elev]; azimuth++) {
 			memcpy(tempBuffer, iterator, sizeof(float)*before_hrir_length);
-			staticResamplerKernel(samplerate, forSr, 1, before_hrir_length, tempBuffer, &final_hrir_length, &hrirs[elev][azimuth]);
+			float* resampled = nullptr;
+			staticResamplerKernel(samplerate, forSr, 1, before_hrir_length, tempBuffer, &final_hrir_length, &resampled);
+			if(hrir_storage == nullptr) {
+				const int alignment = std::max<int>(1, LIBAUDIOVERSE_MALLOC_ALIGNMENT/sizeof(float));
+				stride = (final_hrir_length+alignment-1)/alignment*alignment;
+				hrir_storage = allocArray<float>(stride*hrir_count);
+			}
+			hrirs[elev][azimuth] = hrir_storage+stride*index;
+			std::copy(resampled, resampled+final_hrir_length, hrirs[elev][azimuth]);
+			//The staticResamplerKernel allocates with new[], not allocArray.
+			delete[] resampled;
 			iterator+=before_hrir_length*sizeof(float);
+			index++;
 		}
 	}
 	hrir_length = final_hrir_length;
 	samplerate = forSr;
 	freeArray(tempBuffer);
+	resizeCoefficientCache(getHrtfCacheLimit());
 }
 
 //a complete HRTF for stereo is two calls to this function.
@@ -184,6 +212,10 @@ void HrtfData::loadFromBuffer(unsigned int length, char* buffer, unsigned int fo
 //This is very complicated, thus the heavy commenting.
 //todo: can this be made simpler?
 void HrtfData::computeCoefficientsMono(float elevation, float azimuth, float* out) {
+	if(uniform_grid) {
+		computeCoefficientsMonoUniform(elevation, azimuth, out);
+		return;
+	}
 	//clamp the elevation.
 	if(elevation < min_elevation) {elevation = (float)min_elevation;}
 	else if(elevation > max_elevation) {elevation = (float)max_elevation;}
@@ -238,9 +270,62 @@ void HrtfData::computeCoefficientsMono(float elevation, float azimuth, float* ou
 	}
 }
 
+//Uniform grids are a bilinear interpolation between the 4 surrounding responses, found with a multiply.
+//Responses with a weight of 0 are skipped, so angles which land on the grid are a single copy.
+void HrtfData::computeCoefficientsMonoUniform(float elevation, float azimuth, float* out) {
+	if(elevation < min_elevation) elevation = (float)min_elevation;
+	else if(elevation > max_elevation) elevation = (float)max_elevation;
+	int elevationIndex1 = 0, elevationIndex2 = 0;
+	float elevationWeight = 0.0f;
+	if(degrees_per_elevation != 0.0f) {
+		float elevationPosition = (elevation-min_elevation)/degrees_per_elevation;
+		elevationIndex1 = std::min((int)floorf(elevationPosition), elev_count-1);
+		elevationIndex2 = std::min(elevationIndex1+1, elev_count-1);
+		elevationWeight = elevationPosition-elevationIndex1;
+	}
+	int azimuthCount = azimuth_counts[0];
+	float azimuthPosition = azimuth/degrees_per_azimuth;
+	int azimuthIndex1 = (int)floorf(azimuthPosition);
+	float azimuthWeight = azimuthPosition-azimuthIndex1;
+	azimuthIndex1 = ringmodi(azimuthIndex1, azimuthCount);
+	int azimuthIndex2 = ringmodi(azimuthIndex1+1, azimuthCount);
+	float* responses[4] = {
+		hrirs[elevationIndex1][azimuthIndex1], hrirs[elevationIndex1][azimuthIndex2],
+		hrirs[elevationIndex2][azimuthIndex1], hrirs[elevationIndex2][azimuthIndex2],
+	};
+	float weights[4] = {
+		(1.0f-elevationWeight)*(1.0f-azimuthWeight), (1.0f-elevationWeight)*azimuthWeight,
+		elevationWeight*(1.0f-azimuthWeight), elevationWeight*azimuthWeight,
+	};
+	memset(out, 0, sizeof(float)*hrir_length);
+	for(int i = 0; i < 4; i++) {
+		if(weights[i] == 0.0f) continue;
+		multiplicationAdditionKernel(hrir_length, weights[i], responses[i], out, out);
+	}
+}
+
 void HrtfData::computeCoefficientsStereo(float elevation, float azimuth, float *left, float* right) {
 	//wrap azimuth to be > 0 and < 360.
 	azimuth = ringmodf(azimuth, 360.0f);
+	float step = getHrtfCacheQuantization();
+	if(step <= 0.0f || getHrtfCacheLimit() <= 0) {
+		computeCoefficientsStereoUncached(elevation, azimuth, left, right);
+		return;
+	}
+	auto key = std::make_tuple((int)roundf(elevation/step), (int)roundf(azimuth/step));
+	//This runs on the audio thread, so we never wait for the lock.
+	//If another thread has it, we compute the response ourselves and don't cache it; the rounding means the result is the same either way.
+	{
+		std::unique_lock<std::mutex> lock(coefficient_cache_mutex, std::try_to_lock);
+		if(lock.owns_lock() && lookupCoefficients(key, step, left, right)) return;
+	}
+	//Computed outside the lock, so panners on other threads aren't held up by misses.
+	computeCoefficientsStereoUncached(std::get<0>(key)*step, ringmodf(std::get<1>(key)*step, 360.0f), left, right);
+	std::unique_lock<std::mutex> lock(coefficient_cache_mutex, std::try_to_lock);
+	if(lock.owns_lock()) storeCoefficients(key, step, left, right);
+}
+
+void HrtfData::computeCoefficientsStereoUncached(float elevation, float azimuth, float *left, float* right) {
 	//the hrtf datasets are right ear coefficients.  Consequently, the right ear requires no changes.
 	computeCoefficientsMono(elevation, azimuth, right);
 	//the left ear is found at an azimuth which is reflectred about 0 degrees.
@@ -248,6 +333,110 @@ void HrtfData::computeCoefficientsStereo(float elevation, float azimuth, float *
 	computeCoefficientsMono(elevation, azimuth, left);
 }
 
+unsigned int HrtfData::findCoefficientCacheIndex(const CoefficientCacheKey &key) {
+	unsigned int mask = coefficient_cache_index.size()-1;
+	unsigned int i = ((unsigned int)std::get<0>(key)*73856093u ^ (unsigned int)std::get<1>(key)*19349663u) & mask;
+	//The index is never more than half full, so this finds either the key or an empty slot.
+	while(coefficient_cache_index[i] != -1 && coefficient_cache_keys[coefficient_cache_index[i]] != key) i = (i+1) & mask;
+	return i;
+}
+
+void HrtfData::removeCoefficientCacheIndex(unsigned int index) {
+	//Shift later members of the probe sequence back, so that lookups don't stop early at the hole.
+	unsigned int mask = coefficient_cache_index.size()-1;
+	unsigned int hole = index, i = index;
+	coefficient_cache_index[hole] = -1;
+	while(true) {
+		i = (i+1) & mask;
+		int entry = coefficient_cache_index[i];
+		if(entry == -1) return;
+		coefficient_cache_index[i] = -1;
+		coefficient_cache_index[findCoefficientCacheIndex(coefficient_cache_keys[entry])] = entry;
+	}
+}
+
+bool HrtfData::lookupCoefficients(const CoefficientCacheKey &key, float step, float* left, float* right) {
+	//The limit was 0 when we were loaded, or was set to 0 since.
+	if(coefficient_cache_index.empty()) return false;
+	if(step != coefficient_cache_step) {
+		//The keys mean different angles now.
+		std::fill(coefficient_cache_index.begin(), coefficient_cache_index.end(), -1);
+		coefficient_cache_entries = 0;
+		coefficient_cache_step = step;
+	}
+	int entry = coefficient_cache_index[findCoefficientCacheIndex(key)];
+	if(entry == -1) {
+		coefficient_cache_misses++;
+		return false;
+	}
+	coefficient_cache_last_used[entry] = ++coefficient_cache_clock;
+	float* coefficients = coefficient_cache_storage+2*entry*hrir_length;
+	std::copy(coefficients, coefficients+hrir_length, left);
+	std::copy(coefficients+hrir_length, coefficients+2*hrir_length, right);
+	coefficient_cache_hits++;
+	return true;
+}
+
+void HrtfData::storeCoefficients(const CoefficientCacheKey &key, float step, float* left, float* right) {
+	int capacity = coefficient_cache_keys.size();
+	if(capacity == 0) return;
+	//Either the step changed while we were computing, or another thread missed on the same angle and got here first.
+	if(step != coefficient_cache_step) return;
+	unsigned int index = findCoefficientCacheIndex(key);
+	if(coefficient_cache_index[index] != -1) return;
+	int entry;
+	if(coefficient_cache_entries < capacity) entry = coefficient_cache_entries++;
+	else {
+		//Full, so reuse the least recently used entry.
+		entry = (int)(std::min_element(coefficient_cache_last_used.begin(), coefficient_cache_last_used.end())-coefficient_cache_last_used.begin());
+		removeCoefficientCacheIndex(findCoefficientCacheIndex(coefficient_cache_keys[entry]));
+		coefficient_cache_evictions++;
+		//Removing can move things around.
+		index = findCoefficientCacheIndex(key);
+	}
+	coefficient_cache_keys[entry] = key;
+	coefficient_cache_last_used[entry] = ++coefficient_cache_clock;
+	coefficient_cache_index[index] = entry;
+	float* coefficients = coefficient_cache_storage+2*entry*hrir_length;
+	std::copy(left, left+hrir_length, coefficients);
+	std::copy(right, right+hrir_length, coefficients+hrir_length);
+}
+
+void HrtfData::addCoefficientCacheStatistics(HrtfCacheStatistics &stats) {
+	std::lock_guard<std::mutex> guard(coefficient_cache_mutex);
+	stats.hits += coefficient_cache_hits;
+	stats.misses += coefficient_cache_misses;
+	stats.evictions += coefficient_cache_evictions;
+	stats.entries += coefficient_cache_entries;
+}
+
+void HrtfData::clearCoefficientCache() {
+	std::lock_guard<std::mutex> guard(coefficient_cache_mutex);
+	std::fill(coefficient_cache_index.begin(), coefficient_cache_index.end(), -1);
+	coefficient_cache_entries = 0;
+}
+
+void HrtfData::resizeCoefficientCache(int entries) {
+	//Allocate before taking the lock, so panners trying it aren't turned away for longer than they have to be.
+	float* storage = entries > 0 ? allocArray<float>(2*entries*hrir_length) : nullptr;
+	unsigned int indexSize = 1;
+	while(entries > 0 && indexSize < 2*(unsigned int)entries) indexSize *= 2;
+	std::vector<CoefficientCacheKey> keys(entries);
+	std::vector<int64_t> lastUsed(entries, 0);
+	std::vector<int> index(entries > 0 ? indexSize : 0, -1);
+	std::lock_guard<std::mutex> guard(coefficient_cache_mutex);
+	std::swap(storage, coefficient_cache_storage);
+	coefficient_cache_keys.swap(keys);
+	coefficient_cache_last_used.swap(lastUsed);
+	coefficient_cache_index.swap(index);
+	coefficient_cache_entries = 0;
+	if(storage) freeArray(storage);
+}
+
+bool HrtfData::isUniformGrid() {
+	return uniform_grid;
+}
+
 //Create and free buffers.
 //These are used by the thread locals.
 
@@ -277,52 +466,192 @@ bool operator==(const HrtfId& a, const HrtfId& b) {
 	return memcmp(a.identity, b.identity, 16) == 0;
 }
 
+//memcmp only promises the sign, not -1 and 1.
 bool operator<(const HrtfId &a, const HrtfId& b) {
-	return memcmp(a.identity, b.identity, 16) == -1;
+	return memcmp(a.identity, b.identity, 16) < 0;
 }
 
 bool operator>(const HrtfId& a, const HrtfId& b) {
-	return memcmp(a.identity, b.identity, 16) == 1;
+	return memcmp(a.identity, b.identity, 16) > 0;
 }
 
-std::map<int, std::shared_ptr<HrtfData>> *default_hrtf_cache;
+//Datasets are shared by everything using them, and freed with the last user unless pinned.
+std::map<int, std::weak_ptr<HrtfData>> *default_hrtf_cache;
 //Tuple of (forSr, HrtfId).
-std::map<std::tuple<int, HrtfId>, std::shared_ptr<HrtfData>> *file_hrtf_cache;
+std::map<std::tuple<int, HrtfId>, std::weak_ptr<HrtfData>> *file_hrtf_cache;
+std::set<std::shared_ptr<HrtfData>> *pinned_hrtfs;
 std::mutex *hrtf_cache_mutex;
+//Settings for the coefficient caches of every dataset.
+std::atomic<int> hrtf_coefficient_cache_limit{512};
+std::atomic<float> hrtf_coefficient_cache_quantization{1.0f};
 
 void initializeHrtfCaches() {
-	default_hrtf_cache = new std::map<int, std::shared_ptr<HrtfData>>();
-	file_hrtf_cache = new std::map<std::tuple<int, HrtfId>, std::shared_ptr<HrtfData>>();
+	default_hrtf_cache = new std::map<int, std::weak_ptr<HrtfData>>();
+	file_hrtf_cache = new std::map<std::tuple<int, HrtfId>, std::weak_ptr<HrtfData>>();
+	pinned_hrtfs = new std::set<std::shared_ptr<HrtfData>>();
 	hrtf_cache_mutex = new std::mutex();
 }
 
 void shutdownHrtfCaches() {
+	delete pinned_hrtfs;
 	delete hrtf_cache_mutex;
 	delete default_hrtf_cache;
 	delete file_hrtf_cache;
 }
 
+//Call with hrtf_cache_mutex held.  Returns nullptr if the dataset isn't loaded, and forgets it if it was freed.
+template<typename MapT, typename KeyT>
+std::shared_ptr<HrtfData> findHrtf(MapT &cache, const KeyT &key) {
+	auto found = cache.find(key);
+	if(found == cache.end()) return nullptr;
+	auto h = found->second.lock();
+	if(h == nullptr) cache.erase(found);
+	return h;
+}
+
+HrtfId identifyHrtfFile(std::string path) {
+	boost::filesystem::fstream f(boost::filesystem::path(utf8ToWide(path)), boost::filesystem::fstream::in | boost::filesystem::fstream::binary);
+	if(f.good() == false) ERROR(Lav_ERROR_FILE, std::string("Could not find HRTF file ")+path);
+	auto identity = HrtfId(f);
+	f.close();
+	return identity;
+}
+
 std::shared_ptr<HrtfData> createHrtfFromString(std::string path, int forSr) {
 	if(path == "default") {
 		std::lock_guard<std::mutex> guard(*hrtf_cache_mutex);
-		if(default_hrtf_cache->count(forSr)) return default_hrtf_cache->at(forSr);
-		auto h = std::make_shared<HrtfData>();
+		auto h = findHrtf(*default_hrtf_cache, forSr);
+		if(h) return h;
+		h = std::make_shared<HrtfData>();
 		h->loadFromDefault(forSr);
 		(*default_hrtf_cache)[forSr] = h;
 		return h;
 	}
 	else {
-		boost::filesystem::fstream f(boost::filesystem::path(utf8ToWide(path)), boost::filesystem::fstream::in | boost::filesystem::fstream::binary);
-		if(f.good() == false) ERROR(Lav_ERROR_FILE, std::string("Could not find HRTF file ")+path);
-		auto identity = HrtfId(f);
-		f.close();
+		auto key = std::make_tuple(forSr, identifyHrtfFile(path));
 		std::lock_guard<std::mutex> guard(*hrtf_cache_mutex);
-		if(file_hrtf_cache->count(std::make_tuple(forSr, identity))) return file_hrtf_cache->at(std::make_tuple(forSr, identity));
-		auto h = std::make_shared<HrtfData>();
+		auto h = findHrtf(*file_hrtf_cache, key);
+		if(h) return h;
+		h = std::make_shared<HrtfData>();
 		h->loadFromFile(path, forSr);
-		(*file_hrtf_cache)[std::make_tuple(forSr, identity)] = h;
+		(*file_hrtf_cache)[key] = h;
 		return h;
 	}
 }
 
-}
\ No newline at end of file
+void pinHrtf(std::string path, int forSr) {
+	auto h = createHrtfFromString(path, forSr);
+	std::lock_guard<std::mutex> guard(*hrtf_cache_mutex);
+	pinned_hrtfs->insert(h);
+}
+
+void unpinHrtf(std::string path, int forSr) {
+	//If this was the last reference, h frees the dataset when it goes out of scope, after the lock is released.
+	std::shared_ptr<HrtfData> h;
+	if(path == "default") {
+		std::lock_guard<std::mutex> guard(*hrtf_cache_mutex);
+		h = findHrtf(*default_hrtf_cache, forSr);
+		if(h) pinned_hrtfs->erase(h);
+	}
+	else {
+		auto key = std::make_tuple(forSr, identifyHrtfFile(path));
+		std::lock_guard<std::mutex> guard(*hrtf_cache_mutex);
+		h = findHrtf(*file_hrtf_cache, key);
+		if(h) pinned_hrtfs->erase(h);
+	}
+}
+
+HrtfCacheStatistics getHrtfCacheStatistics() {
+	HrtfCacheStatistics stats;
+	std::lock_guard<std::mutex> guard(*hrtf_cache_mutex);
+	for(auto &i: *default_hrtf_cache) if(auto h = i.second.lock()) h->addCoefficientCacheStatistics(stats);
+	for(auto &i: *file_hrtf_cache) if(auto h = i.second.lock()) h->addCoefficientCacheStatistics(stats);
+	return stats;
+}
+
+void setHrtfCacheLimit(int entries) {
+	std::lock_guard<std::mutex> guard(*hrtf_cache_mutex);
+	hrtf_coefficient_cache_limit.store(entries);
+	//The caches are allocated here rather than as they fill, because they're filled from the audio thread.
+	for(auto &i: *default_hrtf_cache) if(auto h = i.second.lock()) h->resizeCoefficientCache(entries);
+	for(auto &i: *file_hrtf_cache) if(auto h = i.second.lock()) h->resizeCoefficientCache(entries);
+}
+
+int getHrtfCacheLimit() {
+	return hrtf_coefficient_cache_limit.load();
+}
+
+void setHrtfCacheQuantization(float degrees) {
+	hrtf_coefficient_cache_quantization.store(degrees);
+}
+
+float getHrtfCacheQuantization() {
+	return hrtf_coefficient_cache_quantization.load();
+}
+
+void clearHrtfCache() {
+	std::lock_guard<std::mutex> guard(*hrtf_cache_mutex);
+	for(auto &i: *default_hrtf_cache) if(auto h = i.second.lock()) h->clearCoefficientCache();
+	for(auto &i: *file_hrtf_cache) if(auto h = i.second.lock()) h->clearCoefficientCache();
+}
+
+//begin public api
+
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheGetStatistics(int* destinationHits, int* destinationMisses, int* destinationEvictions, int* destinationEntries) {
+	PUB_BEGIN
+	auto stats = getHrtfCacheStatistics();
+	*destinationHits = stats.hits;
+	*destinationMisses = stats.misses;
+	*destinationEvictions = stats.evictions;
+	*destinationEntries = stats.entries;
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheSetLimit(int entries) {
+	PUB_BEGIN
+	if(entries < 0) ERROR(Lav_ERROR_RANGE, "The HRTF cache limit cannot be negative.");
+	setHrtfCacheLimit(entries);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheGetLimit(int* destination) {
+	PUB_BEGIN
+	*destination = getHrtfCacheLimit();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheSetQuantization(float degrees) {
+	PUB_BEGIN
+	if(degrees < 0.0f) ERROR(Lav_ERROR_RANGE, "The HRTF cache quantization step cannot be negative.");
+	setHrtfCacheQuantization(degrees);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheGetQuantization(float* destination) {
+	PUB_BEGIN
+	*destination = getHrtfCacheQuantization();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfCacheClear() {
+	PUB_BEGIN
+	clearHrtfCache();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfPreload(const char* path, int sr) {
+	PUB_BEGIN
+	if(path == nullptr) ERROR(Lav_ERROR_NULL_POINTER, "Path cannot be NULL.");
+	if(sr <= 0) ERROR(Lav_ERROR_RANGE, "Sampling rate must be positive.");
+	pinHrtf(path, sr);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_hrtfUnpin(const char* path, int sr) {
+	PUB_BEGIN
+	if(path == nullptr) ERROR(Lav_ERROR_NULL_POINTER, "Path cannot be NULL.");
+	unpinHrtf(path, sr);
+	PUB_END
+}
+
+}
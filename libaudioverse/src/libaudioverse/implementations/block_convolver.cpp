@@ -8,6 +8,8 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <libaudioverse/private/kernels.hpp>
 #include <libaudioverse/private/memory.hpp>
 #include <libaudioverse/implementations/convolvers.hpp>
+#include <libaudioverse/libaudioverse.h>
+#include <libaudioverse/libaudioverse_properties.h>
 #include <algorithm>
 #include <functional>
 #include <math.h>
@@ -21,16 +23,29 @@ BlockConvolver::BlockConvolver(int blockSize): block_size(blockSize) {
 
 BlockConvolver::~BlockConvolver() {
 	if(response) freeArray(response);
+	if(previous_response) freeArray(previous_response);
 	if(history) freeArray(history);
+	if(crossfade_buffer) freeArray(crossfade_buffer);
+	if(partitioned) delete partitioned;
 }
 
-void BlockConvolver::setResponse(int length, float* newResponse) {
+void BlockConvolver::setResponse(int length, float* newResponse, bool crossfade) {
+	//A response of a different length zeros the history, so there's nothing to crossfade from.
+	crossfade = crossfade && response_length == length;
+	//If a crossfade is already pending, the previous response is still the one that was last heard.
+	//The partitioned convolver keeps its own copy.
+	if(crossfade && crossfading == false && use_fft == false) {
+		if(previous_response == nullptr) previous_response = allocArray<float>(length);
+		std::copy(response, response+length, previous_response);
+	}
 	if(response== nullptr) {
 		response=allocArray<float>(length);
 	}
 	else if(response_length != length) {
 		freeArray(response);
 		response=allocArray<float>(length);
+		if(previous_response) freeArray(previous_response);
+		previous_response = nullptr;
 	}
 	std::copy(newResponse, newResponse+length, response);
 	if(history == nullptr) {
@@ -41,18 +56,62 @@ void BlockConvolver::setResponse(int length, float* newResponse) {
 		history = allocArray<float>(block_size+length);
 	}
 	response_length= length;
+	updateStrategy(crossfade);
+	if(use_fft == false) crossfading = crossfading || crossfade;
+}
+
+void BlockConvolver::setMode(int mode) {
+	if(this->mode == mode) return;
+	this->mode = mode;
+	updateStrategy(false);
+}
+
+int BlockConvolver::getMode() {
+	return mode;
+}
+
+bool BlockConvolver::isUsingFft() {
+	return use_fft;
+}
+
+void BlockConvolver::updateStrategy(bool crossfade) {
+	bool wasUsingFft = use_fft;
+	if(mode == Lav_CONVOLUTION_MODE_DIRECT) use_fft = false;
+	else if(mode == Lav_CONVOLUTION_MODE_FFT) use_fft = true;
+	else use_fft = shouldUseFftConvolution(block_size, response_length);
+	if(use_fft) {
+		if(partitioned == nullptr) partitioned = new PartitionedConvolver(block_size);
+		partitioned->setResponse(response_length, response, crossfade);
+	}
+	//The two paths keep their history differently, so switching can't carry it over.
+	if(use_fft != wasUsingFft) reset();
 }
 
 void BlockConvolver::convolve(float* input, float* output) {
+	if(use_fft) {
+		partitioned->convolve(input, output);
+		return;
+	}
 	//First, move the history back.
 	int historyLength =response_length+block_size;
 	std::copy(history+historyLength-response_length, history+historyLength, history);
 	std::copy(input, input+block_size, history+historyLength-block_size);
-	convolutionKernel(history, block_size, output, response_length, response);
+	//The kernel only wants response_length-1 samples of history; starting at history would delay the output by a sample.
+	float* kernelInput = history+1;
+	convolutionKernel(kernelInput, block_size, output, response_length, response);
+	if(crossfading) {
+		//Both responses see the same history, so the old one carries on exactly as if it hadn't been replaced.
+		if(crossfade_buffer == nullptr) crossfade_buffer = allocArray<float>(block_size);
+		convolutionKernel(kernelInput, block_size, crossfade_buffer, response_length, previous_response);
+		crossfadeKernel(block_size, crossfade_buffer, output, output);
+		crossfading = false;
+	}
 }
 
 void BlockConvolver::reset() {
 	std::fill(history, history+block_size+response_length, 0.0f);
+	if(partitioned) partitioned->reset();
+	crossfading = false;
 }
 
 }
\ No newline at end of file
@@ -8,82 +8,195 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <libaudioverse/implementations/file_streamer.hpp>
 #include <libaudioverse/private/simulation.hpp>
 #include <libaudioverse/private/kernels.hpp>
+#include <libaudioverse/private/memory.hpp>
 #include <speex_resampler_cpp.hpp>
+#include <powercores/utilities.hpp>
 #include <algorithm>
 #include <inttypes.h>
+#include <math.h>
+#include <chrono>
+#include <mutex>
 
 namespace libaudioverse_implementation {
 
-FileStreamer::FileStreamer(std::string path, int _block_size, float _sr):
+FileStreamer::FileStreamer(std::string path, int _block_size, float _sr, double _read_ahead):
 block_size(_block_size), sr(_sr) {
 	reader.open(path.c_str());
-	duration = reader.getFrameCount()/(double)reader.getSr();
-	position_per_sample = 1.0/reader.getSr();
-	resampler = speex_resampler_cpp::createResampler(block_size, reader.getChannelCount(), reader.getSr(), sr);
-	workspace_before_resampling = allocArray<float>(block_size*reader.getChannelCount());
-	workspace_after_resampling = allocArray<float>(block_size*reader.getChannelCount());
+	file_sr = reader.getSr();
+	channels = (int)reader.getChannelCount();
+	frame_count = reader.getFrameCount();
+	duration = frame_count/(double)file_sr;
+	resampler = speex_resampler_cpp::createResampler(block_size, channels, file_sr, sr);
+	workspace_before_resampling = allocArray<float>(block_size*channels);
+	workspace_after_resampling = allocArray<float>(block_size*channels);
+	read_ahead = _read_ahead;
+	ring_capacity = framesForSeconds(read_ahead);
+	ring = allocArray<float>(ring_capacity*channels);
+	write_count.store(0);
+	read_count.store(0);
+	fill_target.store(ring_capacity);
+	reached_end.store(false);
+	is_looping_shared.store(false);
+	should_stop.store(false);
+	request_generation.store(0);
+	completed_generation.store(0);
+	requested_frame.store(0);
+	requested_capacity.store(ring_capacity);
+	underruns.store(0);
+	//Prime the ring here, so that the first blocks don't underrun while the thread starts.
+	fill();
+	io_thread = powercores::safeStartThread(&FileStreamer::ioThreadFunction, this);
 }
 
 FileStreamer::~FileStreamer() {
+	should_stop.store(true);
+	wake.notify_one();
+	io_thread.join();
+	freeArray(ring);
 	freeArray(workspace_before_resampling);
 	freeArray(workspace_after_resampling);
 }
 
 void FileStreamer::process(float** outputs) {
 	int got = 0;
+	bool starved = false;
 	float* ptr = workspace_after_resampling;
 	while(got < block_size) {
-		int gotThisIteration = resampler->write(workspace_after_resampling, block_size-got);
-		if(gotThisIteration == 0 && ended_before_resampling == false) feedResampler();
+		int gotThisIteration = resampler->write(ptr, block_size-got);
+		if(gotThisIteration == 0 && ended_before_resampling == false) {
+			if(feedResampler(starved) == false) break;
+		}
 		else if(gotThisIteration == 0) break;
 		got += gotThisIteration;
-		ptr += gotThisIteration*reader.getChannelCount();
+		ptr += gotThisIteration*channels;
 	}
-	std::fill(ptr, workspace_after_resampling+block_size*reader.getChannelCount(), 0.0f);
+	std::fill(ptr, workspace_after_resampling+block_size*channels, 0.0f);
+	if(starved) underruns.fetch_add(1, std::memory_order_relaxed);
 	if(got == 0 && ended_before_resampling) ended_after_resampling = true;
-	uninterleaveSamples(reader.getChannelCount(), block_size, workspace_after_resampling, reader.getChannelCount(), outputs);
+	uninterleaveSamples(channels, block_size, workspace_after_resampling, channels, outputs);
 }
 
-void FileStreamer::feedResampler() {
+bool FileStreamer::feedResampler(bool &starved) {
 	//If we're ended, short-circuit.
-	if(ended_before_resampling) return;
-	//First, write stuff to the workspace, of size _block_size.
-	unsigned int needed = block_size;
-	unsigned int got = 0;
-	float* ptr = workspace_before_resampling;
-	while(needed) {
-		got = reader.read(needed, ptr);
-		ptr += got*reader.getChannelCount();
-		needed -= got;
-		position += got*position_per_sample;
-		//We didn't get frames, the duration isn't 0 frames, and we're looping.
-		//Libsndfile doesn't let us ask why, and says we're supposed to just assume that this means the end.
-		if(got == 0 && reader.getFrameCount() && is_looping) {
-			position = 0.0;
+	if(ended_before_resampling) return false;
+	//If a seek is outstanding, the ring holds audio from the old position, so we play silence until the I/O thread catches up.
+	if(completed_generation.load(std::memory_order_acquire) != request_generation.load(std::memory_order_relaxed)) return false;
+	int64_t read = read_count.load(std::memory_order_relaxed);
+	int64_t available = write_count.load(std::memory_order_acquire)-read;
+	bool end = false;
+	if(available < block_size) {
+		//The I/O thread sets the flag after writing the last frames, so we have to look again after seeing it.
+		end = reached_end.load(std::memory_order_acquire);
+		available = write_count.load(std::memory_order_acquire)-read;
+	}
+	int64_t taking = std::min<int64_t>(available, block_size);
+	int64_t offset = read%ring_capacity;
+	int64_t firstPart = std::min(taking, ring_capacity-offset);
+	std::copy(ring+offset*channels, ring+(offset+firstPart)*channels, workspace_before_resampling);
+	std::copy(ring, ring+(taking-firstPart)*channels, workspace_before_resampling+firstPart*channels);
+	read_count.store(read+taking, std::memory_order_release);
+	position_in_frames += taking;
+	//Frames past the end can only exist if the I/O thread looped.
+	if(frame_count && position_in_frames > frame_count) position_in_frames %= frame_count;
+	if(taking < block_size) {
+		if(end) ended_before_resampling = true;
+		else starved = true;
+	}
+	if(available-taking < fill_target.load(std::memory_order_relaxed)/2) wake.notify_one();
+	if(taking == 0) return false;
+	std::fill(workspace_before_resampling+taking*channels, workspace_before_resampling+block_size*channels, 0.0f);
+	resampler->read(workspace_before_resampling);
+	return true;
+}
+
+void FileStreamer::ioThreadFunction() {
+	try { //A file which goes bad under us should end the stream, not terminate the app.
+		while(should_stop.load() == false) {
+			int generation = request_generation.load(std::memory_order_acquire);
+			if(generation != handled_generation) handleRequest(generation);
+			else if(write_count.load(std::memory_order_relaxed)-read_count.load(std::memory_order_acquire) < fill_target.load(std::memory_order_relaxed)/2) fill();
+			std::unique_lock<std::mutex> l(wake_mutex);
+			//The audio thread notifies without taking the mutex, so the timeout covers lost wakeups.
+			wake.wait_for(l, std::chrono::milliseconds(5));
+		}
+	}
+	catch(...) {
+		completed_generation.store(request_generation.load());
+		reached_end.store(true, std::memory_order_release);
+	}
+}
+
+void FileStreamer::fill() {
+	int64_t target = std::min(fill_target.load(std::memory_order_relaxed), ring_capacity);
+	int64_t written = write_count.load(std::memory_order_relaxed);
+	while(should_stop.load(std::memory_order_relaxed) == false && request_generation.load(std::memory_order_relaxed) == handled_generation) {
+		int64_t available = written-read_count.load(std::memory_order_acquire);
+		if(available >= target) break;
+		if(reached_end_locally) {
+			if(is_looping_shared.load() == false || frame_count == 0) break;
+			//Looping happens here, well ahead of the audio thread.
 			reader.seek(0);
+			reached_end_locally = false;
+			reached_end.store(false, std::memory_order_relaxed);
 		}
-		else if(got == 0) { //This is probably the end, and Libsndfile annoyingly doesn't make it clear.
-			ended_before_resampling = true;
-			break;
+		int64_t offset = written%ring_capacity;
+		//Read in bounded chunks so that requests and shutdown are noticed promptly.
+		unsigned int wanted = (unsigned int)std::min<int64_t>(std::min(target-available, ring_capacity-offset), 4096);
+		unsigned int got = reader.read(wanted, ring+offset*channels);
+		written += got;
+		write_count.store(written, std::memory_order_release);
+		//Libsndfile doesn't let us ask why, and says we're supposed to just assume that a short read means the end.
+		if(got == 0) {
+			reached_end_locally = true;
+			if(is_looping_shared.load() == false || frame_count == 0) reached_end.store(true, std::memory_order_release);
 		}
 	}
-	std::fill(ptr, workspace_before_resampling+block_size*reader.getChannelCount(), 0.0f);
-	//And then feed the resampler.
-	if(got) resampler->read(workspace_before_resampling);
+}
+
+void FileStreamer::handleRequest(int generation) {
+	handled_generation = generation;
+	int64_t frame = requested_frame.load(std::memory_order_relaxed);
+	int64_t capacity = requested_capacity.load(std::memory_order_relaxed);
+	//The audio thread doesn't touch the ring until we acknowledge, so it's ours to replace.
+	if(capacity != ring_capacity) {
+		freeArray(ring);
+		ring = allocArray<float>(capacity*channels);
+		ring_capacity = capacity;
+	}
+	reader.seek((unsigned int)frame);
+	reached_end_locally = false;
+	reached_end.store(false, std::memory_order_relaxed);
+	write_count.store(0, std::memory_order_relaxed);
+	read_count.store(0, std::memory_order_relaxed);
+	fill();
+	//If another request came in while we were filling, leave this one unacknowledged so the audio thread keeps waiting.
+	if(request_generation.load(std::memory_order_relaxed) == generation) completed_generation.store(generation, std::memory_order_release);
+}
+
+void FileStreamer::request(int64_t frame, int64_t capacity) {
+	requested_frame.store(frame, std::memory_order_relaxed);
+	requested_capacity.store(capacity, std::memory_order_relaxed);
+	request_generation.fetch_add(1, std::memory_order_release);
+	wake.notify_one();
+}
+
+int64_t FileStreamer::framesForSeconds(double seconds) {
+	//The audio thread takes block_size frames at a time, so anything smaller than two blocks would starve.
+	return std::max<int64_t>((int64_t)ceil(seconds*file_sr), 2*block_size);
 }
 
 void FileStreamer::setPosition(double position) {
-	position = std::min(position, duration);
-	reader.seek(reader.getSr()*position);
-	this->position = position;
+	position = std::max(std::min(position, duration), 0.0);
+	position_in_frames = std::min<int64_t>((int64_t)(position*file_sr), frame_count);
+	request(position_in_frames, requested_capacity.load(std::memory_order_relaxed));
 	ended_before_resampling = false;
 	ended_after_resampling = false;
 }
 
 double FileStreamer::getPosition() {
-	//Position is estimated using floating point math, and can drift over the technical max by up to 0.99th of a sample.
+	//Position is computed from the frames we've passed to the resampler, so it runs slightly ahead of what's audible.
 	//We clamp so that user code can pretend that it doesn't.
-	return std::min(position, duration);
+	return std::min(position_in_frames/(double)file_sr, duration);
 }
 
 double FileStreamer::getDuration() {
@@ -92,9 +205,11 @@ double FileStreamer::getDuration() {
 
 void FileStreamer::setIsLooping(bool l) {
 	is_looping = l;
+	is_looping_shared.store(l);
 	if(l) {
 		ended_before_resampling = false;
 		ended_after_resampling = false;
+		wake.notify_one();
 	}
 }
 
@@ -107,7 +222,24 @@ bool FileStreamer::getEnded() {
 }
 
 int FileStreamer::getChannels() {
-	return (int)reader.getChannelCount();
+	return channels;
+}
+
+void FileStreamer::setReadAhead(double seconds) {
+	read_ahead = seconds;
+	int64_t frames = framesForSeconds(seconds);
+	fill_target.store(frames, std::memory_order_relaxed);
+	//Shrinking only lowers the target; growing past the ring means reallocating it, which the I/O thread does as a seek to where we are.
+	if(frames > requested_capacity.load(std::memory_order_relaxed)) request(position_in_frames, frames);
+	else wake.notify_one();
+}
+
+double FileStreamer::getReadAhead() {
+	return read_ahead;
 }
 
-}
\ No newline at end of file
+int FileStreamer::getUnderruns() {
+	return underruns.load(std::memory_order_relaxed);
+}
+
+}
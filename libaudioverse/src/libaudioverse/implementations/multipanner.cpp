@@ -67,6 +67,14 @@ void Multipanner::setCrossfadeThreshold(float t) {
 	crossfade_threshold = t;
 }
 
+int Multipanner::getConvolutionMode() {
+	return hrtf_panner.getConvolutionMode();
+}
+
+void Multipanner::setConvolutionMode(int mode) {
+	hrtf_panner.setConvolutionMode(mode);
+}
+
 int Multipanner::getStrategy() {
 	return strategy;
 }
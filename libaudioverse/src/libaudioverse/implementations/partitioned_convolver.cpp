@@ -0,0 +1,115 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+#include <libaudioverse/private/memory.hpp>
+#include <libaudioverse/private/kernels.hpp>
+#include <libaudioverse/implementations/convolvers.hpp>
+#include <algorithm>
+#include <math.h>
+#include <kiss_fftr.h>
+
+namespace libaudioverse_implementation {
+
+bool shouldUseFftConvolution(int blockSize, int responseLength) {
+	//Rough operation counts.
+	//The direct kernel does 4 multiply-adds at a time; the complex multiply-adds below are scalar.
+	double direct = (double)blockSize*responseLength/4.0;
+	double fftSize = 2.0*blockSize;
+	int partitions = (responseLength+blockSize-1)/blockSize;
+	double viaFft = 2.0*fftSize*log2(fftSize)+4.0*partitions*(blockSize+1);
+	return viaFft < direct;
+}
+
+PartitionedConvolver::PartitionedConvolver(int blockSize): block_size(blockSize) {
+	//Overlap-save needs exactly twice the block size: the last block_size outputs of the circular convolution are the valid ones.
+	fft_size = 2*block_size;
+	bins = fft_size/2+1;
+	input_window = allocArray<float>(fft_size);
+	workspace = allocArray<float>(fft_size);
+	crossfade_buffer = allocArray<float>(block_size);
+	accumulator = allocArray<kiss_fft_cpx>(bins);
+	fft = kiss_fftr_alloc(fft_size, 0, nullptr, nullptr);
+	ifft = kiss_fftr_alloc(fft_size, 1, nullptr, nullptr);
+	float defaultResponse = 1.0f;
+	setResponse(1, &defaultResponse);
+}
+
+PartitionedConvolver::~PartitionedConvolver() {
+	freeArray(input_window);
+	freeArray(workspace);
+	freeArray(crossfade_buffer);
+	freeArray(accumulator);
+	if(response_spectra) freeArray(response_spectra);
+	if(previous_spectra) freeArray(previous_spectra);
+	if(input_spectra) freeArray(input_spectra);
+	kiss_fftr_free(fft);
+	kiss_fftr_free(ifft);
+}
+
+void PartitionedConvolver::setResponse(int length, float* response, bool crossfade) {
+	int neededPartitions = (length+block_size-1)/block_size;
+	if(neededPartitions != partitions) {
+		if(response_spectra) freeArray(response_spectra);
+		if(previous_spectra) freeArray(previous_spectra);
+		if(input_spectra) freeArray(input_spectra);
+		response_spectra = allocArray<kiss_fft_cpx>(neededPartitions*bins);
+		previous_spectra = allocArray<kiss_fft_cpx>(neededPartitions*bins);
+		input_spectra = allocArray<kiss_fft_cpx>(neededPartitions*bins);
+		partitions = neededPartitions;
+		reset();
+	}
+	//Keep the response that was last heard; if a crossfade is already pending, that's already in previous_spectra.
+	else if(crossfade && crossfading == false) {
+		std::swap(response_spectra, previous_spectra);
+		crossfading = true;
+	}
+	//kissfft doesn't normalize the inverse transform, so fold the scaling into the response.
+	float scale = 1.0f/fft_size;
+	for(int p = 0; p < partitions; p++) {
+		int start = p*block_size;
+		int count = std::min(block_size, length-start);
+		std::fill(workspace, workspace+fft_size, 0.0f);
+		for(int i = 0; i < count; i++) workspace[i] = response[start+i]*scale;
+		kiss_fftr(fft, workspace, response_spectra+p*bins);
+	}
+}
+
+void PartitionedConvolver::convolve(float* input, float* output) {
+	std::copy(input_window+block_size, input_window+fft_size, input_window);
+	std::copy(input, input+block_size, input_window+block_size);
+	newest = newest == 0 ? partitions-1 : newest-1;
+	kiss_fftr(fft, input_window, input_spectra+newest*bins);
+	accumulate(response_spectra, output);
+	if(crossfading) {
+		accumulate(previous_spectra, crossfade_buffer);
+		crossfadeKernel(block_size, crossfade_buffer, output, output);
+		crossfading = false;
+	}
+}
+
+void PartitionedConvolver::accumulate(kiss_fft_cpx* spectra, float* output) {
+	//Partition p of the response meets the input from p blocks ago.
+	std::fill(accumulator, accumulator+bins, kiss_fft_cpx{0.0f, 0.0f});
+	for(int p = 0; p < partitions; p++) {
+		kiss_fft_cpx* x = input_spectra+((newest+p)%partitions)*bins;
+		kiss_fft_cpx* h = spectra+p*bins;
+		for(int i = 0; i < bins; i++) {
+			accumulator[i].r += x[i].r*h[i].r-x[i].i*h[i].i;
+			accumulator[i].i += x[i].r*h[i].i+x[i].i*h[i].r;
+		}
+	}
+	kiss_fftri(ifft, accumulator, workspace);
+	std::copy(workspace+block_size, workspace+fft_size, output);
+}
+
+void PartitionedConvolver::reset() {
+	std::fill(input_window, input_window+fft_size, 0.0f);
+	std::fill(input_spectra, input_spectra+partitions*bins, kiss_fft_cpx{0.0f, 0.0f});
+	newest = 0;
+	crossfading = false;
+}
+
+}
@@ -14,6 +14,8 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <libaudioverse/private/audio_devices.hpp>
 #include <libaudioverse/private/logging.hpp>
 #include <libaudioverse/private/hrtf.hpp>
+#include <libaudioverse/private/kernel_backends.hpp>
+#include <libaudioverse/private/buffer.hpp>
 
 namespace libaudioverse_implementation {
 
@@ -33,9 +35,13 @@ InitInfo initializers[] = {
 	//Logging is implicit.
 	{"Error handling", initializeErrorModule},
 	{"Memory subsystem", initializeMemoryModule},
+	{"Kernel backends", initializeKernelBackends},
 	{"Audio backend", initializeDeviceFactory},
 	{"Metadata tables", initializeMetadata},
 	{"HRTF caches", initializeHrtfCaches},
+	{"Buffer cache", initializeBufferCache},
+	{"Buffer disk cache", initializeBufferDiskCache},
+	{"Buffer loading", initializeBufferLoading},
 };
 
 typedef void (*shutdownfunc_t)();
@@ -51,11 +57,16 @@ struct ShutdownInfo{
 //Termination never fails.
 //logging must always be last.
 ShutdownInfo shutdown_funcs[] = {
+	//Loads in progress need everything else, so they finish first.
+	{"buffer loading", shutdownBufferLoading},
 	{"Error handling subsystem", shutdownErrorModule},
 	{"memory module", shutdownMemoryModule},
+	{"kernel backends", shutdownKernelBackends},
 	//Device factory needs to go near the end because it tries to log.
 	{"audio backend", shutdownDeviceFactory},
 	{"HRTF caches", shutdownHrtfCaches},
+	{"buffer cache", shutdownBufferCache},
+	{"buffer disk cache", shutdownBufferDiskCache},
 	{"logging", shutdownLogging},
 };
 
@@ -0,0 +1,106 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+
+/**The kernels with AVX2 and FMA.
+The same as the AVX kernels, save that multiplies followed by adds are fused.
+Fused multiply-adds round once instead of twice, so results can differ from the other backends in the last bit.*/
+#include <libaudioverse/private/kernel_backends.hpp>
+
+#if defined(LIBAUDIOVERSE_USE_AVX)
+#include <immintrin.h>
+
+namespace libaudioverse_implementation {
+
+static void additionKernelAvx2(int length, float* a1, float* a2, float* dest) {
+	int neededLength = (length/8)*8;
+	for(int i = 0; i < neededLength; i+= 8) {
+		_mm256_storeu_ps(dest+i, _mm256_add_ps(_mm256_loadu_ps(a1+i), _mm256_loadu_ps(a2+i)));
+	}
+	for(int i = neededLength; i < length; i++) dest[i] = a1[i]+a2[i];
+}
+
+static void scalarAdditionKernelAvx2(int length, float c, float* a1, float* dest) {
+	int neededLength = (length/8)*8;
+	__m256 cr = _mm256_set1_ps(c);
+	for(int i = 0; i < neededLength; i+= 8) {
+		_mm256_storeu_ps(dest+i, _mm256_add_ps(_mm256_loadu_ps(a1+i), cr));
+	}
+	for(int i = neededLength; i < length; i++) dest[i] = c+a1[i];
+}
+
+static void multiplicationKernelAvx2(int length, float* a1, float* a2, float* dest) {
+	int neededLength = (length/8)*8;
+	for(int i = 0; i < neededLength; i+= 8) {
+		_mm256_storeu_ps(dest+i, _mm256_mul_ps(_mm256_loadu_ps(a1+i), _mm256_loadu_ps(a2+i)));
+	}
+	for(int i = neededLength; i < length; i++) dest[i] = a1[i]*a2[i];
+}
+
+static void scalarMultiplicationKernelAvx2(int length, float c, float* a1, float* dest) {
+	int neededLength = (length/8)*8;
+	__m256 cr = _mm256_set1_ps(c);
+	for(int i = 0; i < neededLength; i+= 8) {
+		_mm256_storeu_ps(dest+i, _mm256_mul_ps(_mm256_loadu_ps(a1+i), cr));
+	}
+	for(int i = neededLength; i < length; i++) dest[i] = c*a1[i];
+}
+
+static void multiplicationAdditionKernelAvx2(int length, float c, float* a1, float* a2, float* dest) {
+	int neededLength = (length/8)*8;
+	__m256 cr = _mm256_set1_ps(c);
+	for(int i = 0; i < neededLength; i+= 8) {
+		_mm256_storeu_ps(dest+i, _mm256_fmadd_ps(_mm256_loadu_ps(a1+i), cr, _mm256_loadu_ps(a2+i)));
+	}
+	for(int i = neededLength; i < length; i++) dest[i] = c*a1[i]+a2[i];
+}
+
+static void parallelMultiplicationAdditionKernelAvx2(int length, float c1, float c2, float c3, float c4, float* a1, float* a2, float* out) {
+	__m256 c1r = _mm256_set1_ps(c1);
+	__m256 c2r = _mm256_set1_ps(c2);
+	__m256 c3r = _mm256_set1_ps(c3);
+	__m256 c4r = _mm256_set1_ps(c4);
+	int needed = length/8*8;
+	for(int i = 0; i < needed; i+=8) {
+		//Two independent chains, so that each add doesn't wait on the one before it.
+		__m256 sum1 = _mm256_fmadd_ps(_mm256_loadu_ps(a1+i+1), c2r, _mm256_mul_ps(_mm256_loadu_ps(a1+i), c1r));
+		__m256 sum2 = _mm256_fmadd_ps(_mm256_loadu_ps(a1+i+3), c4r, _mm256_mul_ps(_mm256_loadu_ps(a1+i+2), c3r));
+		_mm256_storeu_ps(out+i, _mm256_add_ps(_mm256_add_ps(sum1, sum2), _mm256_loadu_ps(a2+i)));
+	}
+	for(int i = needed; i < length; i++) out[i] = a2[i]+a1[i]*c1+a1[i+1]*c2+a1[i+2]*c3+a1[i+3]*c4;
+}
+
+static float dotKernelAvx2(int length, const float* v1, const float* v2) {
+	__m256 accum = _mm256_setzero_ps();
+	float result = 0.0f;
+	int needed = length/8*8;
+	for(int i = 0; i < needed; i+=8) {
+		accum = _mm256_fmadd_ps(_mm256_loadu_ps(v1+i), _mm256_loadu_ps(v2+i), accum);
+	}
+	for(int i = needed; i < length; i++) result += v1[i]*v2[i];
+	//Fold the upper 4 floats onto the lower 4, then sum those as in the SSE2 kernel.
+	__m128 half = _mm_add_ps(_mm256_castps256_ps128(accum), _mm256_extractf128_ps(accum, 1));
+	half = _mm_add_ps(half, _mm_movehl_ps(half, half));
+	half = _mm_add_ss(half, _mm_shuffle_ps(half, half, 1));
+	float tmp;
+	_mm_store_ss(&tmp, half);
+	return result+tmp;
+}
+
+const KernelBackend avx2_kernel_backend = {
+	"avx2",
+	additionKernelAvx2,
+	scalarAdditionKernelAvx2,
+	multiplicationKernelAvx2,
+	scalarMultiplicationKernelAvx2,
+	multiplicationAdditionKernelAvx2,
+	parallelMultiplicationAdditionKernelAvx2,
+	dotKernelAvx2,
+};
+
+}
+
+#endif
@@ -0,0 +1,185 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+
+/**Picks a kernel backend for this processor, and forwards the kernels in kernels.hpp to it.*/
+#include <libaudioverse/libaudioverse.h>
+#include <libaudioverse/private/kernels.hpp>
+#include <libaudioverse/private/kernel_backends.hpp>
+#include <libaudioverse/private/error.hpp>
+#include <libaudioverse/private/macros.hpp>
+#include <libaudioverse/private/logging.hpp>
+#include <atomic>
+#include <vector>
+#include <string>
+#include <string.h>
+#if defined(_MSC_VER)
+#include <intrin.h>
+#elif defined(__i386__) || defined(__x86_64__)
+#include <cpuid.h>
+#endif
+
+namespace libaudioverse_implementation {
+
+class CpuFeatures {
+	public:
+	bool sse2 = false, avx = false, avx2 = false, fma = false;
+};
+
+#if defined(_MSC_VER) || defined(__i386__) || defined(__x86_64__)
+
+static void cpuid(unsigned int leaf, unsigned int subleaf, unsigned int registers[4]) {
+	#if defined(_MSC_VER)
+	int r[4];
+	__cpuidex(r, (int)leaf, (int)subleaf);
+	for(int i = 0; i < 4; i++) registers[i] = (unsigned int)r[i];
+	#else
+	__cpuid_count(leaf, subleaf, registers[0], registers[1], registers[2], registers[3]);
+	#endif
+}
+
+//Which register state the OS saves on context switches.  Only valid if cpuid reports OSXSAVE.
+static unsigned long long xgetbv0() {
+	#if defined(_MSC_VER)
+	return _xgetbv(0);
+	#else
+	unsigned int eax, edx;
+	__asm__ volatile("xgetbv" : "=a"(eax), "=d"(edx) : "c"(0));
+	return ((unsigned long long)edx << 32) | eax;
+	#endif
+}
+
+CpuFeatures detectCpuFeatures() {
+	CpuFeatures features;
+	unsigned int r[4];
+	cpuid(0, 0, r);
+	unsigned int maxLeaf = r[0];
+	if(maxLeaf < 1) return features;
+	cpuid(1, 0, r);
+	features.sse2 = (r[3] & (1 << 26)) != 0;
+	bool osxsave = (r[2] & (1 << 27)) != 0;
+	//The processor supporting AVX isn't enough: the OS must also save the upper halves of the registers.
+	bool avxState = osxsave && (xgetbv0() & 6) == 6;
+	features.avx = avxState && (r[2] & (1 << 28)) != 0;
+	features.fma = features.avx && (r[2] & (1 << 12)) != 0;
+	if(maxLeaf >= 7) {
+		cpuid(7, 0, r);
+		features.avx2 = features.avx && (r[1] & (1 << 5)) != 0;
+	}
+	return features;
+}
+
+#else
+
+CpuFeatures detectCpuFeatures() {
+	return CpuFeatures();
+}
+
+#endif
+
+std::vector<const KernelBackend*> *supported_kernel_backends;
+std::atomic<const KernelBackend*> current_kernel_backend{&scalar_kernel_backend};
+
+void initializeKernelBackends() {
+	auto features = detectCpuFeatures();
+	supported_kernel_backends = new std::vector<const KernelBackend*>();
+	supported_kernel_backends->push_back(&scalar_kernel_backend);
+	#if defined(LIBAUDIOVERSE_USE_SSE2)
+	if(features.sse2) supported_kernel_backends->push_back(&sse2_kernel_backend);
+	#endif
+	#if defined(LIBAUDIOVERSE_USE_AVX)
+	if(features.avx) supported_kernel_backends->push_back(&avx_kernel_backend);
+	if(features.avx2 && features.fma) supported_kernel_backends->push_back(&avx2_kernel_backend);
+	#endif
+	current_kernel_backend.store(supported_kernel_backends->back());
+	logDebug("Using the %s kernels.", supported_kernel_backends->back()->name);
+}
+
+void shutdownKernelBackends() {
+	current_kernel_backend.store(&scalar_kernel_backend);
+	delete supported_kernel_backends;
+}
+
+int getSupportedKernelBackendCount() {
+	return supported_kernel_backends->size();
+}
+
+const KernelBackend* getSupportedKernelBackend(int index) {
+	return (*supported_kernel_backends)[index];
+}
+
+const KernelBackend* getKernelBackend() {
+	return current_kernel_backend.load(std::memory_order_relaxed);
+}
+
+void setKernelBackend(const char* name) {
+	for(auto b: *supported_kernel_backends) {
+		if(strcmp(b->name, name) == 0) {
+			//The backends compute the same thing, so it's fine for this to happen in the middle of a block.
+			current_kernel_backend.store(b);
+			return;
+		}
+	}
+	ERROR(Lav_ERROR_RANGE, std::string("Kernel backend ")+name+" doesn't exist or isn't supported by this processor.");
+}
+
+void additionKernel(int length, float* a1, float* a2, float* dest) {
+	getKernelBackend()->addition(length, a1, a2, dest);
+}
+
+void scalarAdditionKernel(int length, float c, float* a1, float* dest) {
+	getKernelBackend()->scalarAddition(length, c, a1, dest);
+}
+
+void multiplicationKernel(int length, float* a1, float* a2, float* dest) {
+	getKernelBackend()->multiplication(length, a1, a2, dest);
+}
+
+void scalarMultiplicationKernel(int length, float c, float* a1, float* dest) {
+	getKernelBackend()->scalarMultiplication(length, c, a1, dest);
+}
+
+void multiplicationAdditionKernel(int length, float c, float* a1, float* a2, float* dest) {
+	getKernelBackend()->multiplicationAddition(length, c, a1, a2, dest);
+}
+
+void parallelMultiplicationAdditionKernel(int length, float c1, float c2, float c3, float c4, float* a1, float* a2, float* out) {
+	getKernelBackend()->parallelMultiplicationAddition(length, c1, c2, c3, c4, a1, a2, out);
+}
+
+float dotKernel(int length, const float* v1, const float* v2) {
+	return getKernelBackend()->dot(length, v1, v2);
+}
+
+//begin public api
+
+Lav_PUBLIC_FUNCTION LavError Lav_kernelsGetBackendCount(int* destination) {
+	PUB_BEGIN
+	*destination = getSupportedKernelBackendCount();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_kernelsGetBackendName(int index, const char** destination) {
+	PUB_BEGIN
+	if(index < 0 || index >= getSupportedKernelBackendCount()) ERROR(Lav_ERROR_RANGE, "Invalid kernel backend index.");
+	*destination = getSupportedKernelBackend(index)->name;
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_kernelsGetBackend(const char** destination) {
+	PUB_BEGIN
+	*destination = getKernelBackend()->name;
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_kernelsSetBackend(const char* name) {
+	PUB_BEGIN
+	if(name == nullptr) ERROR(Lav_ERROR_NULL_POINTER, "Name cannot be NULL.");
+	setKernelBackend(name);
+	PUB_END
+}
+
+}
@@ -28,16 +28,11 @@ void convolutionKernel(float* input, int outputSampleCount, float* output, int r
 	}
 }
 
-void crossfadeConvolutionKernel(float* input, unsigned int outputSampleCount, float* output, unsigned int responseLength, float* from, float* to) {
-	float delta = 1.0f/outputSampleCount;
-	for(unsigned int i = 0; i < outputSampleCount; i++) {
-		float weight1 = 1.0f-delta*i;
-		float weight2 = i*delta;
-		float samp = 0.0f;
-		for(unsigned int j = 0; j < responseLength; j++) {
-			samp += input[i + j] * (weight1*from[responseLength-j-1] + weight2*to[responseLength-j-1]);
-		}
-	output[i] = samp;
+void crossfadeKernel(int length, float* from, float* to, float* dest) {
+	float delta = 1.0f/length;
+	for(int i = 0; i < length; i++) {
+		float weight = i*delta;
+		dest[i] = from[i]+weight*(to[i]-from[i]);
 	}
 }
 
@@ -0,0 +1,57 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+
+/**The kernels in plain C++, for processors without SIMD extensions we know how to use.*/
+#include <libaudioverse/private/kernel_backends.hpp>
+
+namespace libaudioverse_implementation {
+
+static void additionKernelScalar(int length, float* a1, float* a2, float* dest) {
+	for(int i = 0; i < length; i++) dest[i]=a1[i]+a2[i];
+}
+
+static void scalarAdditionKernelScalar(int length, float c, float* a1, float* dest) {
+	for(int i=0; i < length; i++) dest[i]=c+a1[i];
+}
+
+static void multiplicationKernelScalar(int length, float* a1, float* a2, float* dest) {
+	for(int i = 0; i < length; i++) dest[i]=a1[i]*a2[i];
+}
+
+static void scalarMultiplicationKernelScalar(int length, float c, float* a1, float* dest) {
+	for(int i = 0; i < length; i++) dest[i]=c*a1[i];
+}
+
+static void multiplicationAdditionKernelScalar(int length, float c, float* a1, float *a2, float* dest) {
+	for(int i = 0; i < length; i++) dest[i]=c*a1[i]+a2[i];
+}
+
+static void parallelMultiplicationAdditionKernelScalar(int length, float c1, float c2, float c3, float c4, float* a1, float* a2, float* out) {
+	float *a11 = a1, *a12 = a1+1, *a13 = a1+2, *a14 = a1+3;
+	for(int i = 0; i < length; i++) {
+		out[i] = a2[i]+a11[i]*c1+a12[i]*c2+a13[i]*c3+a14[i]*c4;
+	}
+}
+
+static float dotKernelScalar(int length, const float* v1, const float* v2) {
+	float retval=0.0f;
+	for(int i= 0; i < length; i++) retval += v1[i]*v2[i];
+	return retval;
+}
+
+const KernelBackend scalar_kernel_backend = {
+	"scalar",
+	additionKernelScalar,
+	scalarAdditionKernelScalar,
+	multiplicationKernelScalar,
+	scalarMultiplicationKernelScalar,
+	multiplicationAdditionKernelScalar,
+	parallelMultiplicationAdditionKernelScalar,
+	dotKernelScalar,
+};
+
+}
@@ -0,0 +1,139 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+
+/**The kernels with SSE2, 4 floats at a time.*/
+#include <libaudioverse/private/kernel_backends.hpp>
+
+#if defined(LIBAUDIOVERSE_USE_SSE2)
+#include <mmintrin.h>
+#include <emmintrin.h>
+#include <xmmintrin.h>
+
+namespace libaudioverse_implementation {
+
+static void additionKernelSse2(int length, float* a1, float* a2, float* dest) {
+	int neededLength = (length/4)*4;
+	__m128 a1r, a2r;
+	for(int i = 0; i < neededLength; i+= 4) {
+		a1r = _mm_loadu_ps(a1+i);
+		a2r = _mm_loadu_ps(a2+i);
+		a2r=_mm_add_ps(a1r, a2r);
+		_mm_storeu_ps(dest+i, a2r);
+	}
+	for(int i = neededLength; i < length; i++) dest[i] = a1[i]+a2[i];
+}
+
+static void scalarAdditionKernelSse2(int length, float c, float* a1, float* dest) {
+	__m128 cr = _mm_load1_ps(&c);
+	int neededLength = (length/4)*4;
+	for(int i = 0; i < neededLength; i+=4) {
+		__m128 r1=_mm_loadu_ps(a1+i);
+		r1 = _mm_add_ps(r1, cr);
+		_mm_storeu_ps(dest+i, r1);
+	}
+	for(int i = neededLength; i < length; i++) dest[i] = c+a1[i];
+}
+
+static void multiplicationKernelSse2(int length, float* a1, float* a2, float* dest) {
+	int neededLength = (length/4)*4;
+	__m128 a1r, a2r;
+	for(int i = 0; i < neededLength; i+= 4) {
+		a1r = _mm_loadu_ps(a1+i);
+		a2r = _mm_loadu_ps(a2+i);
+		a2r=_mm_mul_ps(a1r, a2r);
+		_mm_storeu_ps(dest+i, a2r);
+	}
+	for(int i = neededLength; i < length; i++) dest[i] = a1[i]*a2[i];
+}
+
+static void scalarMultiplicationKernelSse2(int length, float c, float* a1, float* dest) {
+	int neededLength = (length/4)*4;
+	__m128 a1r, cr;
+	cr = _mm_load1_ps(&c);
+	for(int i = 0; i < neededLength; i+= 4) {
+		a1r = _mm_loadu_ps(a1+i);
+		a1r=_mm_mul_ps(a1r, cr);
+		_mm_storeu_ps(dest+i, a1r);
+	}
+	for(int i = neededLength; i < length; i++) dest[i] = c*a1[i];
+}
+
+static void multiplicationAdditionKernelSse2(int length, float c, float* a1, float* a2, float* dest) {
+	int neededLength = (length/4)*4;
+	__m128 cr = _mm_load1_ps(&c);
+	for(int i = 0; i < neededLength; i+=4) {
+		__m128 a1r, a2r;
+		a1r = _mm_loadu_ps(a1+i);
+		a2r = _mm_loadu_ps(a2+i);
+		a2r = _mm_add_ps(a2r, _mm_mul_ps(a1r, cr));
+		_mm_storeu_ps(dest+i, a2r);
+	}
+	for(int i = neededLength; i < length; i++) dest[i] = c*a1[i]+a2[i];
+}
+
+static void parallelMultiplicationAdditionKernelSse2(int length, float c1, float c2, float c3, float c4, float* a1, float* a2, float* out) {
+	__m128 c1r = _mm_set1_ps(c1);
+	__m128 c2r = _mm_set1_ps(c2);
+	__m128 c3r = _mm_set1_ps(c3);
+	__m128 c4r = _mm_set1_ps(c4);
+	int needed = length/4*4;
+	for(int i = 0; i < needed; i+=4) {
+		__m128 a1r = _mm_loadu_ps(a1+i);
+		__m128 a2r = _mm_loadu_ps(a1+i+1);
+		__m128 a3r = _mm_loadu_ps(a1+i+2);
+		__m128 a4r = _mm_loadu_ps(a1+i+3);
+		a1r = _mm_mul_ps(a1r, c1r);
+		a2r = _mm_mul_ps(a2r, c2r);
+		a3r = _mm_mul_ps(a3r, c3r);
+		a4r = _mm_mul_ps(a4r, c4r);
+		//Reuse these to avoid having to move registers around and stuff, in theory.
+		//In practice the compiler might optimize this, but possibly not always, and it's not hard to do it ourselves.
+		a1r = _mm_add_ps(a1r, a2r);
+		a3r = _mm_add_ps(a3r, a4r);
+		a2r = _mm_add_ps(a1r, a3r);
+		a4r = _mm_loadu_ps(a2+i);
+		_mm_storeu_ps(out+i, _mm_add_ps(a2r, a4r));
+	}
+	for(int i = needed; i < length; i++) out[i] = a2[i]+a1[i]*c1+a1[i+1]*c2+a1[i+2]*c3+a1[i+3]*c4;
+}
+
+static float dotKernelSse2(int length, const float* v1, const float* v2) {
+	__m128 accum = _mm_setzero_ps();
+	float result = 0.0f;
+	for(int i= 0; i < length/4*4; i+=4) {
+		accum = _mm_add_ps(accum, _mm_mul_ps(_mm_loadu_ps(v1+i), _mm_loadu_ps(v2+i)));
+	}
+	for(int i =length/4*4; i < length; i++) result += v1[i]*v2[i];
+	//This next sequence gets accum[0] to be the sum of the floats in accum, so we can store it into result.
+	//First, add the lower two to the upper two.
+	//_mm_movehl_ps swaps the uppoer and lower halves, when called with the same argument twice.
+	accum=_mm_add_ps(accum, _mm_movehl_ps(accum, accum));
+	//Next, we want to add the lower two floats of accum.
+	//_mm_shuffle_ps looks at the bits in an 8-bit integer.
+	//When the argument is the same, The first two bits are where to read from for the lowest float, etc.
+	//The result is to replace the lowest float in accum with the second-lowest float in accum.
+	accum=_mm_add_ss(accum, _mm_shuffle_ps(accum, accum, 1));
+	//extract.
+	float tmp;
+	_mm_store_ss(&tmp, accum);
+	return result+tmp;
+}
+
+const KernelBackend sse2_kernel_backend = {
+	"sse2",
+	additionKernelSse2,
+	scalarAdditionKernelSse2,
+	multiplicationKernelSse2,
+	scalarMultiplicationKernelSse2,
+	multiplicationAdditionKernelSse2,
+	parallelMultiplicationAdditionKernelSse2,
+	dotKernelSse2,
+};
+
+}
+
+#endif
@@ -19,8 +19,10 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <libaudioverse/private/buffer.hpp>
 #include <libaudioverse/private/dependency_computation.hpp>
 #include <algorithm>
+#include <chrono>
 #include <memory>
 #include <stdlib.h>
+#include <math.h>
 #include <string.h>
 #include <set>
 #include <vector>
@@ -100,6 +102,16 @@ void Node::tick() {
 	last_processed = simulation->getTickCount();
 	bool paused = getState() == Lav_NODESTATE_PAUSED;
 	if(paused) return;
+	bool inputsSilent = silence_tail >= 0 && simulation->getSilenceSkipping() && areInputsSilent();
+	if(inputsSilent && isQuiescent()) {
+		//Like being paused, except that our outputs are zero instead of whatever they were.
+		//We don't tick properties, so writes made while we're skipped still show up as modifications when we wake up.
+		if(output_silent == false) zeroOutputBuffers();
+		output_silent = true;
+		skipped_ticks++;
+		return;
+	}
+	output_silent = false;
 	//If we're paused, then OutputConnectiona dds zeros.
 	//Consequently, we don't do this in that case.
 	if(should_zero_output_buffers) 	zeroOutputBuffers();
@@ -118,6 +130,48 @@ void Node::tick() {
 	applyMul();
 	applyAdd();
 	is_processing = false;
+	processed_ticks++;
+	if(silence_tail >= 0) {
+		silent_input_samples = inputsSilent ? silent_input_samples+block_size : 0;
+		//Only worth looking at the outputs if we might skip next time.
+		last_output_quiet = inputsSilent && silent_input_samples >= silence_tail && areOutputsQuiet();
+	}
+}
+
+void Node::setSilenceTail(int samples) {
+	silence_tail = samples;
+}
+
+bool Node::areInputsSilent() {
+	bool silent = true;
+	auto check = [&] (std::shared_ptr<Node> n) {
+		if(n->getState() != Lav_NODESTATE_PAUSED && n->isOutputSilent() == false) silent = false;
+	};
+	for(int i = 0; i < getInputConnectionCount() && silent; i++) getInputConnection(i)->visitInputs(check);
+	for(auto &p: properties) {
+		if(silent == false) break;
+		//Automation changes our output without any input, so it counts as sound.
+		//So do writes: setting a buffer's position restarts it, for example.
+		if(p.second.isAutomated() || p.second.hasPendingModification()) return false;
+		//Only float and double properties can have nodes connected.
+		auto conn = p.second.getInputConnection();
+		if(conn) conn->visitInputs(check);
+	}
+	return silent;
+}
+
+bool Node::isQuiescent() {
+	return silent_input_samples >= silence_tail && last_output_quiet;
+}
+
+bool Node::areOutputsQuiet() {
+	float** outputs = getOutputBufferArray();
+	for(int i = 0; i < getOutputBufferCount(); i++) {
+		for(int j = 0; j < block_size; j++) {
+			if(fabsf(outputs[i][j]) > 1e-5f) return false;
+		}
+	}
+	return true;
 }
 
 void Node::applyMul() {
@@ -349,6 +403,12 @@ void Node::unlock() {
 void Node::reset() {
 }
 
+void Node::bufferDataChanged(std::shared_ptr<Buffer> buffer) {
+	for(auto &i: properties) {
+		if(i.second.getType() == Lav_PROPERTYTYPE_BUFFER && i.second.getBufferValue() == buffer) i.second.firePostChangedCallback();
+	}
+}
+
 //protected resize function.
 void Node::resize(int newInputCount, int newOutputCount) {
 	int oldInputCount = input_buffers.size();
@@ -373,7 +433,20 @@ void Node::resize(int newInputCount, int newOutputCount) {
 }
 
 void Node::execute() {
+	if(simulation->isProfiling() == false) {
+		tick();
+		return;
+	}
+	auto start = std::chrono::steady_clock::now();
 	tick();
+	int64_t elapsed = std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now()-start).count();
+	profile.calls++;
+	profile.total_time += elapsed;
+	if(elapsed > profile.max_time) profile.max_time = elapsed;
+}
+
+void Node::recordProfiledTick(int tickCount) {
+	if(last_processed != tickCount) profile.culled++;
 }
 
 bool Node::canCull() {
@@ -464,28 +537,48 @@ Lav_PUBLIC_FUNCTION LavError Lav_nodeReset(LavHandle nodeHandle) {
 //this is properties.
 //this is here because properties do not "know" about objects and only objects have properties; also, it made properties.cpp have to "know" about simulations and objects.
 
+//Finds a property, erroring if it isn't of type t.
+Property& getPropertyOfType(std::shared_ptr<Node> node, int slot, int t) {
+	auto &prop = node->getProperty(slot);
+	if(prop.getType() != t) {
+		auto _t = prop.getType();
+		std::string msg = "Property is a ";
+		if(_t == Lav_PROPERTYTYPE_INT) msg+="int";
+		else if(_t == Lav_PROPERTYTYPE_FLOAT) msg += "float";
+		else if(_t == Lav_PROPERTYTYPE_DOUBLE) msg += "double";
+		else if(_t == Lav_PROPERTYTYPE_STRING) msg += "string";
+		else if(_t == Lav_PROPERTYTYPE_FLOAT3) msg += "float3";
+		else if(_t == Lav_PROPERTYTYPE_FLOAT6) msg += "float6";
+		else if(_t == Lav_PROPERTYTYPE_INT_ARRAY) msg += "int array";
+		else if(_t == Lav_PROPERTYTYPE_FLOAT_ARRAY) msg += "float array";
+		else if(_t == Lav_PROPERTYTYPE_BUFFER) msg += "buffer";
+		msg += " property.";
+		ERROR(Lav_ERROR_TYPE_MISMATCH, msg);
+	}
+	return prop;
+}
+
 //this works for getters and setters to lock the object and set a variable prop to be a pointer-like thing to a property.
 #define PROP_PREAMBLE(n, s, t) auto node_ptr = incomingObject<Node>(n);\
 LOCK(*node_ptr);\
-auto &prop = node_ptr->getProperty((s));\
-if(prop.getType() != (t)) {\
-auto _t = prop.getType();\
-std::string msg = "Property is a ";\
-if(_t == Lav_PROPERTYTYPE_INT) msg+="int";\
-else if(_t == Lav_PROPERTYTYPE_FLOAT) msg += "float";\
-else if(_t == Lav_PROPERTYTYPE_DOUBLE) msg += "double";\
-else if(_t == Lav_PROPERTYTYPE_STRING) msg += "string";\
-else if(_t == Lav_PROPERTYTYPE_FLOAT3) msg += "float3";\
-else if(_t == Lav_PROPERTYTYPE_FLOAT6) msg += "float6";\
-else if(_t == Lav_PROPERTYTYPE_INT_ARRAY) msg += "int array";\
-else if(_t == Lav_PROPERTYTYPE_FLOAT_ARRAY) msg += "float array";\
-else if(_t == Lav_PROPERTYTYPE_BUFFER) msg += "buffer";\
-msg += " property.";\
-ERROR(Lav_ERROR_TYPE_MISMATCH, msg);\
-}
+auto &prop = getPropertyOfType(node_ptr, (s), (t));
 
 #define READONLY_CHECK if(prop.isReadOnly()) ERROR(Lav_ERROR_PROPERTY_IS_READ_ONLY, "Attempt to write a read-only property.");
 
+void PropertyWrite::apply() {
+	auto node_ptr = node.lock();
+	if(node_ptr == nullptr) ERROR(Lav_ERROR_INVALID_HANDLE, "The node was deleted.");
+	auto &prop = getPropertyOfType(node_ptr, slot, type);
+	READONLY_CHECK
+	switch(type) {
+		case Lav_PROPERTYTYPE_INT: prop.setIntValue(int_value); break;
+		case Lav_PROPERTYTYPE_FLOAT: prop.setFloatValue(float_values[0]); break;
+		case Lav_PROPERTYTYPE_DOUBLE: prop.setDoubleValue(double_value); break;
+		case Lav_PROPERTYTYPE_FLOAT3: prop.setFloat3Value(float_values, false); break;
+		case Lav_PROPERTYTYPE_FLOAT6: prop.setFloat6Value(float_values, false); break;
+	}
+}
+
 Lav_PUBLIC_FUNCTION LavError Lav_nodeResetProperty(LavHandle nodeHandle, int slot) {
 	PUB_BEGIN
 	auto node_ptr = incomingObject<Node>(nodeHandle);
@@ -498,25 +591,28 @@ Lav_PUBLIC_FUNCTION LavError Lav_nodeResetProperty(LavHandle nodeHandle, int slo
 
 Lav_PUBLIC_FUNCTION LavError Lav_nodeSetIntProperty(LavHandle nodeHandle, int slot, int value) {
 	PUB_BEGIN
-	PROP_PREAMBLE(nodeHandle, slot, Lav_PROPERTYTYPE_INT);
-	READONLY_CHECK
-	prop.setIntValue(value);
+	auto node_ptr = incomingObject<Node>(nodeHandle);
+	PropertyWrite write(node_ptr, slot, Lav_PROPERTYTYPE_INT);
+	write.int_value = value;
+	node_ptr->getSimulation()->writeProperty(write);
 	PUB_END
 }
 
 Lav_PUBLIC_FUNCTION LavError Lav_nodeSetFloatProperty(LavHandle nodeHandle, int slot, float value) {
 	PUB_BEGIN
-	PROP_PREAMBLE(nodeHandle, slot, Lav_PROPERTYTYPE_FLOAT);
-	READONLY_CHECK
-	prop.setFloatValue(value);
+	auto node_ptr = incomingObject<Node>(nodeHandle);
+	PropertyWrite write(node_ptr, slot, Lav_PROPERTYTYPE_FLOAT);
+	write.float_values[0] = value;
+	node_ptr->getSimulation()->writeProperty(write);
 	PUB_END
 }
 
 Lav_PUBLIC_FUNCTION LavError Lav_nodeSetDoubleProperty(LavHandle nodeHandle, int slot, double value) {
 	PUB_BEGIN
-	PROP_PREAMBLE(nodeHandle, slot, Lav_PROPERTYTYPE_DOUBLE);
-	READONLY_CHECK
-	prop.setDoubleValue(value);
+	auto node_ptr = incomingObject<Node>(nodeHandle);
+	PropertyWrite write(node_ptr, slot, Lav_PROPERTYTYPE_DOUBLE);
+	write.double_value = value;
+	node_ptr->getSimulation()->writeProperty(write);
 	PUB_END
 }
 
@@ -530,17 +626,26 @@ Lav_PUBLIC_FUNCTION LavError Lav_nodeSetStringProperty(LavHandle nodeHandle, int
 
 Lav_PUBLIC_FUNCTION LavError Lav_nodeSetFloat3Property(LavHandle nodeHandle, int slot, float v1, float v2, float v3) {
 	PUB_BEGIN
-	PROP_PREAMBLE(nodeHandle, slot, Lav_PROPERTYTYPE_FLOAT3);
-	READONLY_CHECK
-	prop.setFloat3Value(v1, v2, v3);
+	auto node_ptr = incomingObject<Node>(nodeHandle);
+	PropertyWrite write(node_ptr, slot, Lav_PROPERTYTYPE_FLOAT3);
+	write.float_values[0] = v1;
+	write.float_values[1] = v2;
+	write.float_values[2] = v3;
+	node_ptr->getSimulation()->writeProperty(write);
 	PUB_END
 }
 
 Lav_PUBLIC_FUNCTION LavError Lav_nodeSetFloat6Property(LavHandle nodeHandle, int slot, float v1, float v2, float v3, float v4, float v5, float v6) {
 	PUB_BEGIN
-	PROP_PREAMBLE(nodeHandle, slot, Lav_PROPERTYTYPE_FLOAT6);
-	READONLY_CHECK
-	prop.setFloat6Value(v1, v2, v3, v4, v5, v6);
+	auto node_ptr = incomingObject<Node>(nodeHandle);
+	PropertyWrite write(node_ptr, slot, Lav_PROPERTYTYPE_FLOAT6);
+	write.float_values[0] = v1;
+	write.float_values[1] = v2;
+	write.float_values[2] = v3;
+	write.float_values[3] = v4;
+	write.float_values[4] = v5;
+	write.float_values[5] = v6;
+	node_ptr->getSimulation()->writeProperty(write);
 	PUB_END
 }
 
@@ -25,6 +25,7 @@ panner(simulation->getBlockSize(), simulation->getSr()) {
 	appendOutputConnection(0, 0);
 	auto cb = [&](){recomputeChannelMap();};
 	getProperty(Lav_PANNER_CHANNEL_MAP).setPostChangedCallback(cb);
+	setSilenceTail(0);
 }
 
 std::shared_ptr<Node>createAmplitudePannerNode(std::shared_ptr<Simulation> simulation) {
@@ -27,6 +27,7 @@ bank(simulation->getSr()) {
 	appendInputConnection(0, channels);
 	appendOutputConnection(0, channels);
 	setShouldZeroOutputBuffers(false);
+	setSilenceTail(0);
 }
 
 std::shared_ptr<Node> createBiquadNode(std::shared_ptr<Simulation> simulation, unsigned int channels) {
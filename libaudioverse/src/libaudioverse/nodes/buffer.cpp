@@ -18,6 +18,7 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <libaudioverse/private/constants.hpp>
 #include <libaudioverse/private/buffer.hpp>
 #include <limits>
+#include <algorithm>
 #include <vector>
 #include <memory>
 
@@ -28,6 +29,7 @@ player(simulation->getBlockSize(), simulation->getSr()) {
 	appendOutputConnection(0, 1);
 	getProperty(Lav_BUFFER_BUFFER).setPostChangedCallback([&] () {bufferChanged();});
 	end_callback = std::make_shared<Callback<void()>>();
+	setSilenceTail(0);
 }
 
 std::shared_ptr<Node> createBufferNode(std::shared_ptr<Simulation> simulation) {
@@ -55,16 +57,19 @@ void BufferNode::bufferChanged() {
 
 void BufferNode::positionChanged() {
 	player.setPosition(getProperty(Lav_BUFFER_POSITION).getDoubleValue());
+	stopped = false;
 }
 
 void BufferNode::process() {
 	auto buff = getProperty(Lav_BUFFER_BUFFER).getBufferValue();
 	if(buff == nullptr) return;
-	if(werePropertiesModified(this, Lav_BUFFER_POSITION)) player.setPosition(getProperty(Lav_BUFFER_POSITION).getDoubleValue());
+	//Setting the position restarts a stopped node, as it does an ended one.
+	if(werePropertiesModified(this, Lav_BUFFER_POSITION)) positionChanged();
 	if(werePropertiesModified(this, Lav_BUFFER_RATE)) player.setRate(getProperty(Lav_BUFFER_RATE).getDoubleValue());
 	if(werePropertiesModified(this, Lav_BUFFER_LOOPING)) player.setIsLooping(getProperty(Lav_BUFFER_LOOPING).getIntValue() != 0);
 	int prevEndedCount = player.getEndedCount();
-	player.process(buff->getChannels(), &output_buffers[0]);
+	if(scheduled_start >= 0 || scheduled_stop >= 0) processScheduled(buff->getChannels());
+	else if(stopped == false) player.process(buff->getChannels(), &output_buffers[0]);
 	getProperty(Lav_BUFFER_POSITION).setDoubleValue(player.getPosition());
 	for(int i = player.getEndedCount(); i > prevEndedCount; i--) {
 		simulation->enqueueTask([=] () {(*end_callback)();});
@@ -72,6 +77,50 @@ void BufferNode::process() {
 	getProperty(Lav_BUFFER_ENDED_COUNT).setIntValue(player.getEndedCount());
 }
 
+bool BufferNode::isQuiescent() {
+	if(scheduled_start >= 0) return false;
+	return stopped || player.isEnded();
+}
+
+void BufferNode::processScheduled(int channels) {
+	while(segment_outputs.size() < (unsigned int)channels) segment_outputs.push_back(nullptr);
+	int64_t blockStart = (int64_t)llround(simulation->getCurrentTime()*simulation->getSr());
+	int64_t blockEnd = blockStart+block_size;
+	int done = 0;
+	while(done < block_size) {
+		int64_t now = blockStart+done;
+		//Anything scheduled in the past happens at the start of this block.
+		//Stops go first so that starting and stopping at the same time leaves us playing.
+		if(scheduled_stop >= 0 && scheduled_stop <= now) {
+			stopped = true;
+			scheduled_stop = -1;
+		}
+		if(scheduled_start >= 0 && scheduled_start <= now) {
+			player.setPosition(scheduled_start_offset);
+			stopped = false;
+			scheduled_start = -1;
+		}
+		int64_t next = blockEnd;
+		if(scheduled_stop >= 0) next = std::min(next, scheduled_stop);
+		if(scheduled_start >= 0) next = std::min(next, scheduled_start);
+		int frames = (int)(next-now);
+		if(stopped == false) {
+			for(int i = 0; i < channels; i++) segment_outputs[i] = output_buffers[i]+done;
+			player.process(channels, &segment_outputs[0], frames);
+		}
+		done += frames;
+	}
+}
+
+void BufferNode::playAt(double time, double offset) {
+	scheduled_start = (int64_t)llround(time*simulation->getSr());
+	scheduled_start_offset = offset;
+}
+
+void BufferNode::stopAt(double time) {
+	scheduled_stop = (int64_t)llround(time*simulation->getSr());
+}
+
 //begin public api
 Lav_PUBLIC_FUNCTION LavError Lav_createBufferNode(LavHandle simulationHandle, LavHandle* destination) {
 	PUB_BEGIN
@@ -92,4 +141,23 @@ Lav_PUBLIC_FUNCTION LavError Lav_bufferNodeSetEndCallback(LavHandle nodeHandle,
 	PUB_END
 }
 
+Lav_PUBLIC_FUNCTION LavError Lav_bufferNodePlayAt(LavHandle nodeHandle, double time, double offset) {
+	PUB_BEGIN
+	auto n = incomingObject<BufferNode>(nodeHandle);
+	if(time < 0.0) ERROR(Lav_ERROR_RANGE, "Time must be positive.");
+	if(offset < 0.0) ERROR(Lav_ERROR_RANGE, "Offset must be positive.");
+	LOCK(*n);
+	n->playAt(time, offset);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_bufferNodeStopAt(LavHandle nodeHandle, double time) {
+	PUB_BEGIN
+	auto n = incomingObject<BufferNode>(nodeHandle);
+	if(time < 0.0) ERROR(Lav_ERROR_RANGE, "Time must be positive.");
+	LOCK(*n);
+	n->stopAt(time);
+	PUB_END
+}
+
 }
\ No newline at end of file
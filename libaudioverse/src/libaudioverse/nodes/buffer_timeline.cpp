@@ -18,16 +18,28 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <libaudioverse/private/buffer.hpp>
 #include <libaudioverse/private/helper_templates.hpp>
 #include <libaudioverse/implementations/buffer_player.hpp>
+#include <libaudioverse/implementations/hrtf_panner.hpp>
+#include <libaudioverse/private/hrtf.hpp>
+#include <algorithm>
 #include <iterator>
 #include <vector>
+#include <string.h>
 
 namespace libaudioverse_implementation {
 
+TimelineVoice::~TimelineVoice() {
+	delete player;
+	delete panner;
+}
+
 BufferTimelineNode::BufferTimelineNode(std::shared_ptr<Simulation> simulation, int channels): Node(Lav_OBJTYPE_BUFFER_TIMELINE_NODE, simulation, 0, channels) {
 	if(channels <= 0) ERROR(Lav_ERROR_RANGE, "Channels must be greater than 0.");
 	appendOutputConnection(0, channels);
 	output_channels= channels;
 	for(int i = 0; i < channels; i++) workspace.push_back(allocArray<float>(simulation->getBlockSize()));
+	workspace_offsets.resize(channels);
+	mono_workspace = allocArray<float>(simulation->getBlockSize());
+	getProperty(Lav_BUFFER_TIMELINE_MAX_VOICES).setPostChangedCallback([&] () {maxVoicesChanged();});
 }
 
 std::shared_ptr<Node> createBufferTimelineNode(std::shared_ptr<Simulation> simulation, int channels) {
@@ -36,36 +48,211 @@ std::shared_ptr<Node> createBufferTimelineNode(std::shared_ptr<Simulation> simul
 
 BufferTimelineNode::~BufferTimelineNode() {
 	for(auto &i: workspace) freeArray(i);
-	for(auto &i: scheduled_buffers) delete i.second;
+	freeArray(mono_workspace);
+	for(auto &i: scheduled_voices) delete i.second;
+	for(auto i: playing_voices) delete i;
+	for(auto i: free_panners) delete i;
 }
 
 void BufferTimelineNode::process() {
-	filter(scheduled_buffers, [&](auto &val)->bool {
-		if(val.first > time) return true;
-		if(val.second->getEndedCount()) {
-			delete val.second;
-			return false;
-		}
-		//Otherwise, add and keep.
-		val.second->process(output_channels, &workspace[0]);
-		for(int i = 0; i < output_channels; i++) additionKernel(block_size, workspace[i], output_buffers[i], output_buffers[i]);
-		return true;
+	startVoices();
+	filter(playing_voices, [&](TimelineVoice* voice)->bool {
+		if(renderVoice(voice) == false) return true;
+		finishVoice(voice);
+		return false;
 	});
+	getProperty(Lav_BUFFER_TIMELINE_VOICE_COUNT).setIntValue(playing_voices.size());
+	getProperty(Lav_BUFFER_TIMELINE_STOLEN_VOICE_COUNT).setIntValue(stolen_voices);
 	time+=block_size/simulation->getSr();
 }
 
-void BufferTimelineNode::scheduleBuffer(double time, float delta, std::shared_ptr<Buffer> buffer) {
+void BufferTimelineNode::startVoices() {
+	float sr = simulation->getSr();
+	double blockEnd = time+block_size/sr;
+	int maxVoices = getProperty(Lav_BUFFER_TIMELINE_MAX_VOICES).getIntValue();
+	while(scheduled_voices.size() && scheduled_voices.begin()->first < blockEnd) {
+		auto first = scheduled_voices.begin();
+		auto voice = first->second;
+		voice->start_offset = std::min(std::max((int)((first->first-time)*sr), 0), block_size-1);
+		scheduled_voices.erase(first);
+		if(maxVoices == 0) {
+			stolen_voices++;
+			delete voice;
+			continue;
+		}
+		if(maxVoices > 0) {
+			int unstolen = 0;
+			for(auto i: playing_voices) unstolen += i->stolen == false;
+			for(; unstolen >= maxVoices; unstolen--) stealVoice();
+		}
+		playing_voices.push_back(voice);
+	}
+}
+
+void BufferTimelineNode::stealVoice() {
+	int strategy = getProperty(Lav_BUFFER_TIMELINE_VOICE_STEALING).getIntValue();
+	//playing_voices is in the order voices started, so the first is the oldest.
+	auto victim = playing_voices.end();
+	for(auto i = playing_voices.begin(); i != playing_voices.end(); i++) {
+		if((*i)->stolen) continue;
+		if(victim == playing_voices.end()) victim = i;
+		if(strategy == Lav_VOICE_STEALING_OLDEST) break;
+		if((*i)->level < (*victim)->level) victim = i;
+	}
+	if(victim == playing_voices.end()) return;
+	stolen_voices++;
+	//Voices which haven't been heard yet can go now.  Otherwise, fade them out to avoid a click.
+	if((*victim)->has_played) (*victim)->stolen = true;
+	else {
+		finishVoice(*victim);
+		playing_voices.erase(victim);
+	}
+}
+
+bool BufferTimelineNode::renderVoice(TimelineVoice* voice) {
+	int offset = voice->start_offset;
+	int frames = block_size-offset;
+	if(hrtf) {
+		if(voice->tail_remaining < 0) {
+			memset(mono_workspace, 0, sizeof(float)*offset);
+			float* dest = mono_workspace+offset;
+			voice->player->process(1, &dest, frames);
+		}
+		else memset(mono_workspace, 0, sizeof(float)*block_size);
+		if(voice->panner == nullptr) {
+			voice->panner = acquirePanner();
+			voice->panner->setAzimuth(voice->azimuth);
+			voice->panner->setElevation(voice->elevation);
+		}
+		voice->panner->pan(mono_workspace, workspace[0], workspace[1]);
+	}
+	else {
+		for(int i = 0; i < output_channels; i++) {
+			memset(workspace[i], 0, sizeof(float)*offset);
+			workspace_offsets[i] = workspace[i]+offset;
+		}
+		voice->player->process(output_channels, &workspace_offsets[0], frames);
+	}
+	float peak = 0.0f;
+	for(int i = 0; i < output_channels; i++) {
+		for(int j = 0; j < block_size; j++) peak = std::max(peak, fabsf(workspace[i][j]));
+	}
+	voice->level = peak*voice->gain;
+	if(voice->stolen) {
+		float step = voice->gain/block_size;
+		for(int i = 0; i < output_channels; i++) {
+			for(int j = 0; j < block_size; j++) output_buffers[i][j] += workspace[i][j]*(voice->gain-step*(j+1));
+		}
+	}
+	else {
+		for(int i = 0; i < output_channels; i++) multiplicationAdditionKernel(block_size, voice->gain, workspace[i], output_buffers[i], output_buffers[i]);
+	}
+	voice->start_offset = 0;
+	voice->has_played = true;
+	if(voice->stolen) return true;
+	if(voice->player->getEndedCount() == 0) return false;
+	if(hrtf == nullptr) return true;
+	//The panner keeps sounding for the length of the response after its input stops, so feed it silence until then.
+	if(voice->tail_remaining < 0) voice->tail_remaining = hrtf->getLength();
+	else voice->tail_remaining -= block_size;
+	return voice->tail_remaining <= 0;
+}
+
+void BufferTimelineNode::finishVoice(TimelineVoice* voice) {
+	if(voice->panner) free_panners.push_back(voice->panner);
+	voice->panner = nullptr;
+	delete voice;
+}
+
+HrtfPanner* BufferTimelineNode::acquirePanner() {
+	HrtfPanner* panner;
+	if(free_panners.size()) {
+		panner = free_panners.back();
+		free_panners.pop_back();
+	}
+	else {
+		panner = new HrtfPanner(block_size, simulation->getSr(), hrtf);
+		//Voices never move, and a reused panner's history belongs to someone else.
+		panner->setShouldCrossfade(false);
+	}
+	panner->reset();
+	return panner;
+}
+
+void BufferTimelineNode::scheduleBuffer(double time, float delta, std::shared_ptr<Buffer> buffer, float gain, float azimuth, float elevation) {
 	time+=this->time; //time is relative to the node's internal time.
+	auto voice = new TimelineVoice();
 	//The buffer player handles the buffer's use count.
-	auto player = new BufferPlayer(simulation->getBlockSize(), simulation->getSr());
-	player->setBuffer(buffer);
-	player->setRate(delta);
-	scheduled_buffers.insert(decltype(scheduled_buffers)::value_type(time, player));
+	voice->player = new BufferPlayer(simulation->getBlockSize(), simulation->getSr());
+	voice->player->setBuffer(buffer);
+	voice->player->setRate(delta);
+	voice->gain = gain;
+	voice->level = gain;
+	voice->azimuth = azimuth;
+	voice->elevation = elevation;
+	scheduled_voices.insert(decltype(scheduled_voices)::value_type(time, voice));
+}
+
+void BufferTimelineNode::setHrtf(std::shared_ptr<HrtfData> hrtf) {
+	if(output_channels != 2) ERROR(Lav_ERROR_RANGE, "HRTF panning needs a node with 2 channels.");
+	for(auto i: free_panners) delete i;
+	free_panners.clear();
+	//Playing voices pick up new panners on their next block.
+	for(auto i: playing_voices) {
+		delete i->panner;
+		i->panner = nullptr;
+	}
+	this->hrtf = hrtf;
+	allocatePanners();
+}
+
+void BufferTimelineNode::maxVoicesChanged() {
+	//With queued property writes, this runs on the audio thread.  So make the panners in the background.
+	std::weak_ptr<Node> weak = std::static_pointer_cast<Node>(shared_from_this());
+	simulation->enqueueTask([weak] () {
+		auto n = std::static_pointer_cast<BufferTimelineNode>(weak.lock());
+		if(n) n->allocatePanners();
+	});
+}
+
+void BufferTimelineNode::allocatePanners() {
+	std::shared_ptr<HrtfData> dataset;
+	int needed = 0;
+	{
+		LOCK(*simulation);
+		dataset = hrtf;
+		if(dataset == nullptr) return;
+		int maxVoices = getProperty(Lav_BUFFER_TIMELINE_MAX_VOICES).getIntValue();
+		int inUse = 0;
+		for(auto i: playing_voices) inUse += i->panner != nullptr;
+		needed = maxVoices-inUse-(int)free_panners.size();
+	}
+	if(needed <= 0) return;
+	//Making panners is slow, so don't hold the lock while we do it.
+	std::vector<HrtfPanner*> panners;
+	for(int i = 0; i < needed; i++) {
+		panners.push_back(new HrtfPanner(block_size, simulation->getSr(), dataset));
+		panners.back()->setShouldCrossfade(false);
+	}
+	{
+		LOCK(*simulation);
+		//Only if the dataset didn't change while we worked.
+		if(hrtf == dataset) {
+			int maxVoices = getProperty(Lav_BUFFER_TIMELINE_MAX_VOICES).getIntValue();
+			//So that finishing voices doesn't allocate either.
+			free_panners.reserve(std::max<int>(maxVoices, free_panners.size()+panners.size()));
+			free_panners.insert(free_panners.end(), panners.begin(), panners.end());
+			panners.clear();
+		}
+	}
+	for(auto i: panners) delete i;
 }
 
 void BufferTimelineNode::reset() {
-	for(auto &i: scheduled_buffers) delete i.second;
-	scheduled_buffers.clear();
+	for(auto &i: scheduled_voices) delete i.second;
+	scheduled_voices.clear();
+	for(auto i: playing_voices) finishVoice(i);
+	playing_voices.clear();
 }
 
 //begin public API.
@@ -92,4 +279,38 @@ Lav_PUBLIC_FUNCTION LavError Lav_bufferTimelineNodeScheduleBuffer(LavHandle node
 	PUB_END
 }
 
-}
\ No newline at end of file
+Lav_PUBLIC_FUNCTION LavError Lav_bufferTimelineNodeScheduleMany(LavHandle nodeHandle, int count, LavHandle* bufferHandles, double* times, float* pitchBends, float* gains, float* azimuths, float* elevations) {
+	PUB_BEGIN
+	auto n = incomingObject<BufferTimelineNode>(nodeHandle);
+	if(count < 0) ERROR(Lav_ERROR_RANGE, "Count must not be negative.");
+	if(count > 0 && (bufferHandles == nullptr || times == nullptr)) ERROR(Lav_ERROR_NULL_POINTER, "Buffers and times are required.");
+	//Check everything first, so that nothing is scheduled if anything is wrong.
+	std::vector<std::shared_ptr<Buffer>> buffers;
+	buffers.reserve(count);
+	for(int i = 0; i < count; i++) {
+		buffers.push_back(incomingObject<Buffer>(bufferHandles[i]));
+		if(times[i] < 0.0) ERROR(Lav_ERROR_RANGE, "Times must not be negative.");
+		if(pitchBends && pitchBends[i] < 0.0f) ERROR(Lav_ERROR_RANGE, "Pitch bends must not be negative.");
+		if(gains && gains[i] < 0.0f) ERROR(Lav_ERROR_RANGE, "Gains must not be negative.");
+		if(elevations && (elevations[i] < -90.0f || elevations[i] > 90.0f)) ERROR(Lav_ERROR_RANGE, "Elevations must be between -90 and 90.");
+	}
+	LOCK(*n);
+	if((azimuths || elevations) && n->hasHrtf() == false) ERROR(Lav_ERROR_RANGE, "Azimuths and elevations need an HRTF.  See Lav_bufferTimelineNodeSetHrtf.");
+	for(int i = 0; i < count; i++) {
+		n->scheduleBuffer(times[i], pitchBends ? pitchBends[i] : 1.0f, buffers[i], gains ? gains[i] : 1.0f, azimuths ? azimuths[i] : 0.0f, elevations ? elevations[i] : 0.0f);
+	}
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_bufferTimelineNodeSetHrtf(LavHandle nodeHandle, const char* hrtfPath) {
+	PUB_BEGIN
+	auto n = incomingObject<BufferTimelineNode>(nodeHandle);
+	auto simulation = n->getSimulation();
+	//Loading can take a while, so do it before locking.
+	auto hrtf = createHrtfFromString(hrtfPath, simulation->getSr());
+	LOCK(*n);
+	n->setHrtf(hrtf);
+	PUB_END
+}
+
+}
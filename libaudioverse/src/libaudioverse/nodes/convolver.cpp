@@ -29,6 +29,7 @@ ConvolverNode::ConvolverNode(std::shared_ptr<Simulation> simulation, int channel
 	convolvers=new BlockConvolver*[channels]();
 	for(int i= 0; i < channels; i++) convolvers[i] = new BlockConvolver(simulation->getBlockSize());
 	setShouldZeroOutputBuffers(false);
+	setSilenceTail(0);
 }
 
 std::shared_ptr<Node> createConvolverNode(std::shared_ptr<Simulation> simulation, int channels) {
@@ -42,6 +43,10 @@ ConvolverNode::~ConvolverNode() {
 
 void ConvolverNode::process() {
 	if(werePropertiesModified(this, Lav_CONVOLVER_IMPULSE_RESPONSE)) setImpulseResponse();
+	if(werePropertiesModified(this, Lav_CONVOLVER_CONVOLUTION_MODE)) {
+		int mode = getProperty(Lav_CONVOLVER_CONVOLUTION_MODE).getIntValue();
+		for(int i = 0; i < channels; i++) convolvers[i]->setMode(mode);
+	}
 	for(int i= 0; i < channels; i++) convolvers[i]->convolve(input_buffers[i], output_buffers[i]);
 }
 
@@ -49,6 +54,7 @@ void ConvolverNode::setImpulseResponse() {
 	auto ir=getProperty(Lav_CONVOLVER_IMPULSE_RESPONSE).getFloatArrayPtr();
 	int len =getProperty(Lav_CONVOLVER_IMPULSE_RESPONSE).getFloatArrayLength();
 	for(int i = 0; i < channels; i++) convolvers[i]->setResponse(len, ir);
+	setSilenceTail(len);
 }
 
 //begin public api
@@ -25,6 +25,7 @@ DcBlockerNode::DcBlockerNode(std::shared_ptr<Simulation> simulation, int channel
 	blockers = new DcBlocker*[channels];
 	for(int i = 0; i < channels; i++) blockers[i] = new DcBlocker(simulation->getSr());
 	setShouldZeroOutputBuffers(false);
+	setSilenceTail(0);
 }
 
 std::shared_ptr<Node> createDcBlockerNode(std::shared_ptr<Simulation> simulation, int channels) {
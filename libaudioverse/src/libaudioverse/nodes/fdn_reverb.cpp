@@ -63,6 +63,8 @@ FdnReverbNode::FdnReverbNode(std::shared_ptr<Simulation> sim): Node(Lav_OBJTYPE_
 	appendOutputConnection(0, 4);
 	getProperty(Lav_FDN_REVERB_CUTOFF_FREQUENCY).setFloatRange(0.0f, sr/2.0);
 	setShouldZeroOutputBuffers(false);
+	//The delay lines hold a second.
+	setSilenceTail((int)sr);
 }
 
 std::shared_ptr<Node> createFdnReverbNode(std::shared_ptr<Simulation> simulation) {
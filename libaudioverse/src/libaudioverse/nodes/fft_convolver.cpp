@@ -19,6 +19,7 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <libaudioverse/private/kernels.hpp>
 #include <libaudioverse/implementations/convolvers.hpp>
 #include <string>
+#include <algorithm>
 
 namespace libaudioverse_implementation {
 
@@ -29,6 +30,7 @@ FftConvolverNode::FftConvolverNode(std::shared_ptr<Simulation> simulation, int c
 	appendOutputConnection(0, channels);
 	convolvers=new FftConvolver*[channels]();
 	for(int i= 0; i < channels; i++) convolvers[i] = new FftConvolver(simulation->getBlockSize());
+	setSilenceTail(0);
 }
 
 std::shared_ptr<Node> createFftConvolverNode(std::shared_ptr<Simulation> simulation, int channels) {
@@ -51,6 +53,9 @@ void FftConvolverNode::setResponse(int channel, int length, float* response) {
 	if(length < 1) ERROR(Lav_ERROR_RANGE, "Response must be at least one sample.");
 	convolvers[channel]->setResponse(length, response);
 	convolvers[channel]->reset();
+	//The FFT convolver can hold a block of input on top of the response.
+	//Channels can have different lengths, so keep the longest.
+	setSilenceTail(std::max(silence_tail, length+block_size));
 }
 
 void FftConvolverNode::setResponseFromFile(std::string path, int fileChannel, int convolverChannel) {
@@ -34,8 +34,10 @@ std::shared_ptr<Node> createFileStreamerNode(std::shared_ptr<Simulation> simulat
 void FileStreamerNode::process() {
 	if(werePropertiesModified(this, Lav_FILE_STREAMER_POSITION)) streamer.setPosition(getProperty(Lav_FILE_STREAMER_POSITION).getDoubleValue());
 	if(werePropertiesModified(this, Lav_FILE_STREAMER_LOOPING)) streamer.setIsLooping(getProperty(Lav_FILE_STREAMER_LOOPING).getIntValue() != 0);
+	if(werePropertiesModified(this, Lav_FILE_STREAMER_READ_AHEAD)) streamer.setReadAhead(getProperty(Lav_FILE_STREAMER_READ_AHEAD).getDoubleValue());
 	streamer.process(&output_buffers[0]);
 	getProperty(Lav_FILE_STREAMER_POSITION).setDoubleValue(streamer.getPosition());
+	getProperty(Lav_FILE_STREAMER_UNDERRUNS).setIntValue(streamer.getUnderruns());
 	if(streamer.getEnded()) {
 		getProperty(Lav_FILE_STREAMER_ENDED).setIntValue(1);
 		simulation->enqueueTask([=] () {(*end_callback)();});
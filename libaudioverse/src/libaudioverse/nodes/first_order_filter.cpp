@@ -25,6 +25,7 @@ bank(simulation->getSr()) {
 	appendInputConnection(0, channels);
 	appendOutputConnection(0, channels);
 	setShouldZeroOutputBuffers(false);
+	setSilenceTail(0);
 }
 
 std::shared_ptr<Node> createFirstOrderFilterNode(std::shared_ptr<Simulation> simulation, int channels) {
@@ -19,6 +19,7 @@ namespace libaudioverse_implementation {
 
 GainNode::GainNode(std::shared_ptr<Simulation> sim): Node(Lav_OBJTYPE_GAIN_NODE, sim, 0, 0) {
 	setShouldZeroOutputBuffers(false);
+	setSilenceTail(0);
 }
 
 std::shared_ptr<Node> createGainNode(std::shared_ptr<Simulation> simulation) {
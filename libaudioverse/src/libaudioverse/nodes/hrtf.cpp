@@ -24,6 +24,7 @@ HrtfNode::HrtfNode(std::shared_ptr<Simulation> simulation, std::shared_ptr<HrtfD
 panner(simulation->getBlockSize(), simulation->getSr(), hrtf) {
 	appendInputConnection(0, 1);
 	appendOutputConnection(0, 2);
+	setSilenceTail(hrtf->getLength());
 }
 
 std::shared_ptr<Node>createHrtfNode(std::shared_ptr<Simulation>simulation, std::shared_ptr<HrtfData> hrtf) {
@@ -34,6 +35,7 @@ void HrtfNode::process() {
 	panner.setAzimuth(getProperty(Lav_PANNER_AZIMUTH).getFloatValue());
 	panner.setElevation(getProperty(Lav_PANNER_ELEVATION).getFloatValue());
 	panner.setShouldCrossfade(getProperty(Lav_PANNER_SHOULD_CROSSFADE).getIntValue() == 1);
+	panner.setConvolutionMode(getProperty(Lav_PANNER_CONVOLUTION_MODE).getIntValue());
 	panner.pan(input_buffers[0], output_buffers[0], output_buffers[1]);
 }
 
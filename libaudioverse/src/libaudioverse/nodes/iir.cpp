@@ -28,6 +28,7 @@ IirNode::IirNode(std::shared_ptr<Simulation> simulation, int channels): Node(Lav
 	appendInputConnection(0, channels);
 	appendOutputConnection(0, channels);
 	setShouldZeroOutputBuffers(false);
+	setSilenceTail(0);
 }
 
 std::shared_ptr<Node> createIirNode(std::shared_ptr<Simulation> simulation, int channels) {
@@ -62,6 +62,7 @@ void MultipannerNode::process() {
 	if(werePropertiesModified(this, Lav_PANNER_ELEVATION)) panner.setElevation(getProperty(Lav_PANNER_ELEVATION).getFloatValue());
 	if(werePropertiesModified(this, Lav_PANNER_SHOULD_CROSSFADE)) panner.setShouldCrossfade(getProperty(Lav_PANNER_SHOULD_CROSSFADE).getIntValue() == 1);
 	if(werePropertiesModified(this, Lav_PANNER_STRATEGY)) panner.setStrategy(getProperty(Lav_PANNER_STRATEGY).getIntValue());
+	if(werePropertiesModified(this, Lav_PANNER_CONVOLUTION_MODE)) panner.setConvolutionMode(getProperty(Lav_PANNER_CONVOLUTION_MODE).getIntValue());
 	panner.process(input_buffers[0], &output_buffers[0]);
 }
 
@@ -12,6 +12,9 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <vector>
 #include <memory>
 #include <algorithm>
+#include <chrono>
+#include <math.h>
+#include <thread>
 
 namespace libaudioverse_implementation {
 
@@ -21,76 +24,249 @@ Planner::Planner() {
 Planner::~Planner() {
 }
 
+//Monotonic nanoseconds.
+inline int64_t plannerNow() {
+	return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now().time_since_epoch()).count();
+}
+
+inline int histogramBucket(int64_t nanoseconds) {
+	int64_t microseconds = nanoseconds/1000;
+	int bucket = 0;
+	while(microseconds > 0 && bucket < PLANNER_HISTOGRAM_BUCKETS-1) {
+		microseconds >>= 1;
+		bucket++;
+	}
+	return bucket;
+}
+
+void PlannerStatistics::reset() {
+	ticks = replans = culled_jobs = 0;
+	time = barrier_wait_time = 0.0;
+	for(auto &b: bins) b = PlannerBinStatistics();
+	for(int i = 0; i < PLANNER_HISTOGRAM_BUCKETS; i++) width_histogram[i] = bin_time_histogram[i] = barrier_wait_histogram[i] = 0;
+}
+
+void PlannerBinTiming::reset() {
+	busy.store(0, std::memory_order_relaxed);
+	first_start.store(INT64_MAX, std::memory_order_relaxed);
+	last_end.store(0, std::memory_order_relaxed);
+}
+
+void PlannerBinTiming::record(int64_t start, int64_t end, int64_t busyTime) {
+	busy.fetch_add(busyTime, std::memory_order_relaxed);
+	int64_t old = first_start.load(std::memory_order_relaxed);
+	while(start < old && first_start.compare_exchange_weak(old, start, std::memory_order_relaxed));
+	old = last_end.load(std::memory_order_relaxed);
+	while(end > old && last_end.compare_exchange_weak(old, end, std::memory_order_relaxed));
+}
+
 void Planner::execute(std::shared_ptr<Job> start, int threads) {
+	int64_t tickStart = plannerNow();
 	if(last_start.lock() != start) invalidatePlan();
 	if(is_valid == false) replan(start);
 	else initializeStrongPlan(); //Try to get it from the cache.
 	//We might invalidate because of a dead weak pointer, but this can only happen once.
 	if(is_valid == false) replan(start);
-	if(threads == 1) {
-		runJobsSync();
-	}
-	else {
-		if(started_thread_pool == false) {
-			thread_pool.setThreadCount(threads);
-			thread_pool.start();
-			started_thread_pool = true;
-			last_thread_count = threads;
-		}
-		if(last_thread_count != threads) {
-			thread_pool.setThreadCount(threads);
-			last_thread_count = threads;
-		}
-		runJobsAsync();
-	}
+	ordered.clear();
+	for(auto &bin: plan) ordered.insert(ordered.end(), bin.second.begin(), bin.second.end());
+	ticks_since_schedule++;
+	if(schedule_is_valid == false || schedule_has_unmeasured_jobs || threads != scheduled_request || ticks_since_schedule >= PLANNER_RESCHEDULE_INTERVAL) reschedule(threads);
+	if(scheduled_threads > 1) ensureThreadPool(scheduled_threads);
+	runSchedule();
+	ordered.clear();
 	clearStrongPlan();
 	last_start = start;
+	statistics.ticks++;
+	statistics.threads = scheduled_threads;
+	statistics.time += (plannerNow()-tickStart)/1e9;
 }
 
-void jobExecutor(std::shared_ptr<Job> &j) {
+int64_t jobExecutor(std::shared_ptr<Job> &j) {
+	int64_t start = plannerNow();
 	j->execute();
 	j->job_recorded = false;
+	int64_t elapsed = plannerNow()-start;
+	//A moving average, so that the schedule follows changes in cost without chasing every spike.
+	if(j->cost_estimate == 0) j->cost_estimate = elapsed;
+	else j->cost_estimate += (elapsed-j->cost_estimate)/8;
+	return elapsed;
 }
 
-void Planner::runJobsSync() {
-	becomeAudioThread();
+int Planner::chooseThreadCount() {
+	int64_t best = 1;
+	for(auto &bin: plan) {
+		int64_t cost = 0;
+		for(auto &j: bin.second) cost += j->cost_estimate;
+		best = std::max<int64_t>(best, std::min<int64_t>(bin.second.size(), cost/PLANNER_MIN_CHUNK_COST));
+	}
+	int hardware = std::thread::hardware_concurrency();
+	if(hardware > 0) best = std::min<int64_t>(best, hardware);
+	return (int)best;
+}
+
+PlannerStage& Planner::appendStage(int chunks) {
+	if(next_stage_count == (int)next_schedule.size()) next_schedule.emplace_back();
+	auto &stage = next_schedule[next_stage_count++];
+	stage.jobs = 0;
+	stage.chunks.resize(chunks);
+	for(auto &c: stage.chunks) c.clear();
+	return stage;
+}
+
+void Planner::fillParallelStage(PlannerStage &stage, std::vector<std::shared_ptr<Job>> &bin, int firstIndex) {
+	//Longest job first, each to the least loaded chunk.
+	stage_order.resize(bin.size());
+	for(unsigned int i = 0; i < bin.size(); i++) stage_order[i] = i;
+	std::sort(stage_order.begin(), stage_order.end(), [&] (int a, int b) {return bin[a]->cost_estimate > bin[b]->cost_estimate;});
+	stage.jobs = bin.size();
+	chunk_loads.assign(stage.chunks.size(), 0);
+	for(int i: stage_order) {
+		int lightest = std::min_element(chunk_loads.begin(), chunk_loads.end())-chunk_loads.begin();
+		stage.chunks[lightest].push_back(firstIndex+i);
+		chunk_loads[lightest] += bin[i]->cost_estimate;
+	}
+}
+
+int64_t Planner::estimateScheduleCost(std::vector<PlannerStage> &stages, int count) {
+	int64_t total = 0;
+	for(int s = 0; s < count; s++) {
+		int64_t slowest = 0;
+		for(auto &chunk: stages[s].chunks) {
+			int64_t cost = 0;
+			for(int i: chunk) cost += ordered[i]->cost_estimate;
+			slowest = std::max(slowest, cost);
+		}
+		total += slowest;
+	}
+	return total;
+}
+
+void Planner::reschedule(int requestedThreads) {
+	int threads = requestedThreads == 0 ? chooseThreadCount() : requestedThreads;
+	next_stage_count = 0;
+	schedule_has_unmeasured_jobs = false;
+	PlannerStage* serial = nullptr;
+	int index = 0;
 	for(auto &bin: plan) {
+		int64_t cost = 0;
 		for(auto &j: bin.second) {
-			jobExecutor(j);
+			cost += j->cost_estimate;
+			if(j->cost_estimate == 0) schedule_has_unmeasured_jobs = true;
+		}
+		int64_t chunks = std::min<int64_t>(std::min<int64_t>(threads, bin.second.size()), cost/PLANNER_MIN_CHUNK_COST);
+		if(chunks <= 1) {
+			if(serial == nullptr) serial = &appendStage(1);
+			for(unsigned int i = 0; i < bin.second.size(); i++) serial->chunks[0].push_back(index+i);
+			serial->jobs += bin.second.size();
 		}
+		else {
+			//Appending can move the stages, so forget the serial stage first.
+			serial = nullptr;
+			fillParallelStage(appendStage((int)chunks), bin.second, index);
+		}
+		index += bin.second.size();
 	}
-	//We are potentially sharing this thread with someone else. It is important that we don't accidentally give them high priority too.
-	unbecomeAudioThread();
+	//Keeping the old schedule keeps its statistics, so only swap if the stages changed shape or the new one is clearly faster.
+	bool changed = schedule_is_valid == false || next_stage_count != scheduled_stages;
+	bool reshuffled = false;
+	for(int s = 0; s < next_stage_count && changed == false; s++) {
+		changed = next_schedule[s].jobs != schedule[s].jobs || next_schedule[s].chunks.size() != schedule[s].chunks.size();
+		reshuffled = reshuffled || next_schedule[s].chunks != schedule[s].chunks;
+	}
+	if(changed == false && reshuffled) {
+		int64_t oldCost = estimateScheduleCost(schedule, scheduled_stages);
+		int64_t newCost = estimateScheduleCost(next_schedule, next_stage_count);
+		changed = newCost < oldCost-oldCost/PLANNER_RESCHEDULE_GAIN;
+	}
+	if(changed) {
+		std::swap(schedule, next_schedule);
+		scheduled_stages = next_stage_count;
+		statistics.bins.assign(scheduled_stages, PlannerBinStatistics());
+		while((int)bin_timings.size() < scheduled_stages) bin_timings.emplace_back(new PlannerBinTiming());
+	}
+	schedule_is_valid = true;
+	ticks_since_schedule = 0;
+	scheduled_request = requestedThreads;
+	scheduled_threads = threads;
 }
 
-void Planner::runJobsAsync() {
+void Planner::ensureThreadPool(int threads) {
+	//The calling thread runs one chunk of every stage, so the pool needs one less.
+	int workers = threads-1;
+	if(started_thread_pool && last_thread_count == workers) return;
+	thread_pool.setThreadCount(workers);
+	if(started_thread_pool == false) {
+		thread_pool.start();
+		started_thread_pool = true;
+	}
+	last_thread_count = workers;
 	//becomeAudioThread is no-op if called multiple times.
-	//Putting it here greatly simplifies thread pool startup logic.
 	thread_pool.submitJobToAllThreads(becomeAudioThread);
-	for(auto &bin: plan) {
-		thread_pool.map(jobExecutor, bin.second.begin(), bin.second.end());
-		thread_pool.submitBarrier();
+}
+
+void Planner::runChunk(std::vector<int> *chunk, PlannerBinTiming* timing) {
+	int64_t start = plannerNow(), busy = 0;
+	for(int i: *chunk) busy += jobExecutor(ordered[i]);
+	timing->record(start, plannerNow(), busy);
+}
+
+void Planner::recordBin(int index, int jobs, int64_t wallTime, int64_t busyTime, int threads) {
+	if(jobs == 0) return;
+	auto &b = statistics.bins[index];
+	double time = wallTime/1e9;
+	int64_t idle = std::max<int64_t>(0, wallTime*threads-busyTime);
+	b.ticks++;
+	b.jobs = jobs;
+	b.time += time;
+	b.max_time = std::max(b.max_time, time);
+	b.barrier_wait_time += idle/1e9;
+	statistics.barrier_wait_time += idle/1e9;
+	statistics.width_histogram[std::min(jobs, PLANNER_HISTOGRAM_BUCKETS-1)]++;
+	statistics.bin_time_histogram[histogramBucket(wallTime)]++;
+	statistics.barrier_wait_histogram[histogramBucket(idle)]++;
+}
+
+void Planner::runSchedule() {
+	becomeAudioThread();
+	for(int s = 0; s < scheduled_stages; s++) {
+		auto &stage = schedule[s];
+		auto timing = bin_timings[s].get();
+		timing->reset();
+		chunk_futures.clear();
+		for(unsigned int c = 1; c < stage.chunks.size(); c++) {
+			auto chunk = &stage.chunks[c];
+			chunk_futures.push_back(thread_pool.submitJobWithResult([this, chunk, timing] () {runChunk(chunk, timing);}));
+		}
+		runChunk(&stage.chunks[0], timing);
+		for(auto &f: chunk_futures) f.wait();
+		recordBin(s, stage.jobs, timing->last_end.load()-timing->first_start.load(), timing->busy.load(), stage.chunks.size());
 	}
-	//At this point, submit a meaningless job that does nothing.
-	//This lets us synchronize with the end of this batch.
-	auto future = thread_pool.submitJobWithResult([](){});
-	future.wait();
-	//And that's it.
+	//We are potentially sharing this thread with someone else. It is important that we don't accidentally give them high priority too.
+	unbecomeAudioThread();
+}
+
+void Planner::resetStatistics() {
+	statistics.reset();
 }
 
 void Planner::invalidatePlan() {
 	is_valid = false;
+	schedule_is_valid = false;
 }
 
 //Actually do the planning below here:
 //Small helper  function, which needn't know about the class (thus avoiding capture requirements).
-inline void binner(std::shared_ptr<Job> job, int tag, std::map<int, std::vector<std::shared_ptr<Job>>> &destination) {
+inline void binner(std::shared_ptr<Job> job, int tag, std::map<int, std::vector<std::shared_ptr<Job>>> &destination, std::set<Job*> &culled) {
 	//if the job is recorded or cullable, we can skip out.
-	if(job->job_recorded || job->canCull()) return;
+	if(job->job_recorded) return;
+	if(job->canCull()) {
+		culled.insert(job.get());
+		return;
+	}
 	//Visit our dependencies first.  We want this to make sure we're in the lowest bin we have to be in.
 	//Consider a graph, a->b, a->c->b.
 	//If we're called on b as a's dependency and record, then it won't happen before c.
-	visitDependencies(job, binner, tag-1, destination);
+	visitDependencies(job, binner, tag-1, destination, culled);
 	//The job may have just been recorded.  if it was, we can abort.
 	if(job->job_recorded) return;
 	//We know it can't be culled because this never changes. So put it in.
@@ -101,7 +277,8 @@ inline void binner(std::shared_ptr<Job> job, int tag, std::map<int, std::vector<
 void Planner::replan(std::shared_ptr<Job> start) {
 	logDebug("Replanning.");
 	//Fill the vector with the jobs.
-	binner(start, 0, plan);
+	std::set<Job*> culled;
+	binner(start, 0, plan, culled);
 	is_valid = true;
 	//Put in weak_plan, the cache.
 	//We do two loops because we really don't want to keep deleting and recreating the vectors.
@@ -112,6 +289,9 @@ void Planner::replan(std::shared_ptr<Job> start) {
 	for(auto &bin: plan) {
 		weak_plan[bin.first].assign(bin.second.begin(), bin.second.end());
 	}
+	statistics.replans++;
+	statistics.culled_jobs = culled.size();
+	schedule_is_valid = false;
 }
 
 void Planner::clearStrongPlan() {
@@ -485,6 +485,14 @@ void Property::setBufferValue(std::shared_ptr<Buffer> b, bool avoidCallbacks) {
 	if(avoidCallbacks == false) firePostChangedCallback();
 }
 
+bool Property::hasPendingModification() {
+	return last_modified > last_ticked;
+}
+
+bool Property::isAutomated() {
+	return automators.empty() == false;
+}
+
 bool Property::needsARate() {
 	//This is not reliable until the property is ticked, which shouldn't be a problem.
 	return allows_arate && should_use_value_buffer;
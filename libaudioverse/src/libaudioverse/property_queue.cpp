@@ -0,0 +1,56 @@
+/**Copyright (C) Austin Hicks, 2014-2016
+This file is part of Libaudioverse, a library for realtime audio applications.
+This code is dual-licensed.  It is released under the terms of the Mozilla Public License version 2.0 or the Gnu General Public License version 3 or later.
+You may use this code under the terms of either license at your option.
+A copy of both licenses may be found in license.gpl and license.mpl at the root of this repository.
+If these files are unavailable to you, see either http://www.gnu.org/licenses/ (GPL V3 or later) or https://www.mozilla.org/en-US/MPL/2.0/ (MPL 2.0).*/
+#include <libaudioverse/private/property_queue.hpp>
+#include <atomic>
+#include <stddef.h>
+#include <stdint.h>
+
+namespace libaudioverse_implementation {
+
+PropertyWriteQueue::PropertyWriteQueue(size_t capacity) {
+	cells = new Cell[capacity];
+	mask = capacity-1;
+	for(size_t i = 0; i < capacity; i++) cells[i].sequence.store(i, std::memory_order_relaxed);
+}
+
+PropertyWriteQueue::~PropertyWriteQueue() {
+	delete[] cells;
+}
+
+bool PropertyWriteQueue::push(const PropertyWrite &write) {
+	size_t position = push_position.load(std::memory_order_relaxed);
+	Cell* cell;
+	while(true) {
+		cell = &cells[position&mask];
+		size_t sequence = cell->sequence.load(std::memory_order_acquire);
+		intptr_t difference = (intptr_t)sequence-(intptr_t)position;
+		if(difference == 0) {
+			//The cell is free for this lap.  Claim it, unless another producer beat us to it.
+			if(push_position.compare_exchange_weak(position, position+1, std::memory_order_relaxed)) break;
+		}
+		//The consumer hasn't emptied this cell from the last lap, so we're full.
+		else if(difference < 0) return false;
+		else position = push_position.load(std::memory_order_relaxed);
+	}
+	cell->write = write;
+	cell->sequence.store(position+1, std::memory_order_release);
+	return true;
+}
+
+bool PropertyWriteQueue::pop(PropertyWrite &destination) {
+	Cell* cell = &cells[pop_position&mask];
+	size_t sequence = cell->sequence.load(std::memory_order_acquire);
+	//Either empty, or a producer has claimed the cell but not finished writing it.
+	if(sequence != pop_position+1) return false;
+	destination = cell->write;
+	cell->write.node.reset();
+	cell->sequence.store(pop_position+mask+1, std::memory_order_release);
+	pop_position++;
+	return true;
+}
+
+}
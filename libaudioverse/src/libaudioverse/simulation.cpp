@@ -20,6 +20,7 @@ If these files are unavailable to you, see either http://www.gnu.org/licenses/ (
 #include <powercores/utilities.hpp>
 #include <audio_io/audio_io.hpp>
 #include <stdlib.h>
+#include <math.h>
 #include <functional>
 #include <algorithm>
 #include <iterator>
@@ -62,6 +63,7 @@ Simulation::~Simulation() {
 
 //Yes, this uses goto. Yes, goto is evil. We need a single point of exit.
 void Simulation::getBlock(float* out, unsigned int channels, bool mayApplyMixingMatrix) {
+	applyQueuedPropertyWrites();
 	if(out == nullptr || channels == 0) {
 		memset(out, 0, sizeof(float)*channels*block_size);
 		goto end;
@@ -81,6 +83,12 @@ void Simulation::getBlock(float* out, unsigned int channels, bool mayApplyMixing
 	}
 	//Use the planner.
 	planner->execute(std::dynamic_pointer_cast<Job>(shared_from_this()), threads);
+	if(profiling) {
+		for(auto &i: nodes) {
+			auto n = i.lock();
+			if(n) n->recordProfiledTick(tick_count);
+		}
+	}
 	//write, applying mixing matrices as needed.
 	final_output_connection->addNodeless(&final_outputs[0], true);
 	//interleave the samples.
@@ -106,13 +114,98 @@ void Simulation::getBlock(float* out, unsigned int channels, bool mayApplyMixing
 	}, getCurrentTime());
 }
 
+void Simulation::setPropertyQueueEnabled(bool enabled) {
+	property_queue_enabled.store(enabled);
+	//Nothing else will drain the queue if we're not being ticked, and the writes should land before any that come after this.
+	if(enabled == false) {
+		LOCK(*this);
+		applyQueuedPropertyWrites();
+	}
+}
+
+void Simulation::writeProperty(const PropertyWrite &write) {
+	if(isPropertyQueueEnabled()) {
+		std::unique_lock<std::recursive_mutex> guard(mutex, std::try_to_lock);
+		if(guard.owns_lock()) {
+			//Nothing is in the way. Earlier writes may still be queued, and they have to land first.
+			applyQueuedPropertyWrites();
+			PropertyWrite(write).apply();
+			return;
+		}
+		if(property_queue.push(write)) {
+			queued_property_writes++;
+			return;
+		}
+		//Full, so wait like everyone else.
+	}
+	LOCK(*this);
+	applyQueuedPropertyWrites();
+	PropertyWrite(write).apply();
+}
+
+void Simulation::applyQueuedPropertyWrites() {
+	PropertyWrite write;
+	while(property_queue.pop(write)) {
+		//Whoever queued this is long gone, so errors can only be counted.
+		try {
+			write.apply();
+			applied_property_writes++;
+		}
+		catch(ErrorException &e) {
+			rejected_property_writes++;
+			logDebug("Simulation: dropping queued write to property %i: %s", write.slot, e.message.c_str());
+		}
+	}
+}
+
+void Simulation::resetProfile() {
+	for(auto &i: nodes) {
+		auto n = i.lock();
+		if(n) n->getProfile() = NodeProfile();
+	}
+}
+
+void Simulation::getSilenceStatistics(int64_t &skipped, int64_t &processed) {
+	skipped = 0;
+	processed = 0;
+	for(auto &i: nodes) {
+		auto n = i.lock();
+		if(n == nullptr) continue;
+		skipped += n->getSkippedTickCount();
+		processed += n->getProcessedTickCount();
+	}
+}
+
+void Simulation::resetSilenceStatistics() {
+	for(auto &i: nodes) {
+		auto n = i.lock();
+		if(n) n->resetSilenceStatistics();
+	}
+}
+
+int Simulation::snapshotProfile() {
+	profile_snapshot.clear();
+	for(auto &i: nodes) {
+		auto n = i.lock();
+		if(n) profile_snapshot.emplace_back(n, n->getProfile());
+	}
+	return profile_snapshot.size();
+}
+
+std::tuple<std::shared_ptr<Node>, NodeProfile> Simulation::getProfileSnapshotEntry(int index) {
+	if(index < 0 || index >= (int)profile_snapshot.size()) ERROR(Lav_ERROR_RANGE, "Invalid profile entry.");
+	auto &entry = profile_snapshot[index];
+	return std::make_tuple(std::get<0>(entry).lock(), std::get<1>(entry));
+}
+
 void Simulation::doMaintenance() {
 	killDeadWeakPointers(nodes);
 	killDeadWeakPointers(will_tick_nodes);
 }
 
-void Simulation::setOutputDevice(int index, int channels) {
+void Simulation::setOutputDevice(int index, int channels, double minLatency, double startLatency, double maxLatency) {
 	if(index < -1) ERROR(Lav_ERROR_RANGE, "Index -1 is default; all other negative numbers are invalid.");
+	if(minLatency < 0.0 || startLatency < minLatency || maxLatency < startLatency) ERROR(Lav_ERROR_RANGE, "Latencies must satisfy 0 <= minimum <= start <= maximum.");
 	if(output_device) {
 		output_device->stop();
 	}
@@ -131,7 +224,7 @@ void Simulation::setOutputDevice(int index, int channels) {
 		}
 	};
 	try {
-		output_device =factory->createDevice(cb, index, channels, getSr(), getBlockSize(), 0.0, 0.1, 0.2);
+		output_device =factory->createDevice(cb, index, channels, getSr(), getBlockSize(), (float)minLatency, (float)startLatency, (float)maxLatency);
 		if(output_device == nullptr) ERROR(Lav_ERROR_CANNOT_INIT_AUDIO, "Device could not be created.");
 	}
 	catch(std::exception &e) {
@@ -143,6 +236,16 @@ void Simulation::clearOutputDevice() {
 	output_device=nullptr;
 }
 
+audio_io::OutputDeviceStatistics Simulation::snapshotLatencyStatistics() {
+	latency_snapshot = output_device ? output_device->getStatistics() : audio_io::OutputDeviceStatistics();
+	return latency_snapshot;
+}
+
+double Simulation::getLatencySnapshotCallbackTime(int index) {
+	if(index < 0 || index >= (int)latency_snapshot.callback_times.size()) ERROR(Lav_ERROR_RANGE, "Invalid callback index.");
+	return latency_snapshot.callback_times[index];
+}
+
 std::shared_ptr<InputConnection> Simulation::getFinalOutputConnection() {
 	return final_output_connection;
 }
@@ -161,6 +264,13 @@ void Simulation::associateNode(std::shared_ptr<Node> node) {
 	nodes.insert(std::weak_ptr<Node>(node));
 }
 
+void Simulation::bufferDataChanged(std::shared_ptr<Buffer> buffer) {
+	for(auto &i: nodes) {
+		auto n = i.lock();
+		if(n) n->bufferDataChanged(buffer);
+	}
+}
+
 void Simulation::registerNodeForWillTick(std::shared_ptr<Node> node) {
 	will_tick_nodes.insert(node);
 }
@@ -253,6 +363,18 @@ Lav_PUBLIC_FUNCTION LavError Lav_simulationGetBlock(LavHandle simulationHandle,
 	PUB_END
 }
 
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetBlocks(LavHandle simulationHandle, unsigned int channels, int mayApplyMixingMatrix, unsigned int blocks, float* destination) {
+	PUB_BEGIN
+	auto simulation = incomingObject<Simulation>(simulationHandle);
+	unsigned int blockSize = simulation->getBlockSize();
+	for(unsigned int i = 0; i < blocks; i++) {
+		//Lock per block, so that other threads can get in between blocks of a long render.
+		LOCK(*simulation);
+		simulation->getBlock(destination+i*blockSize*channels, channels, mayApplyMixingMatrix != 0);
+	}
+	PUB_END
+}
+
 Lav_PUBLIC_FUNCTION LavError Lav_simulationGetBlockSize(LavHandle simulationHandle, int* destination) {
 	PUB_BEGIN
 	auto simulation =incomingObject<Simulation>(simulationHandle);
@@ -261,6 +383,14 @@ Lav_PUBLIC_FUNCTION LavError Lav_simulationGetBlockSize(LavHandle simulationHand
 	PUB_END
 }
 
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetCurrentTime(LavHandle simulationHandle, double* destination) {
+	PUB_BEGIN
+	auto simulation =incomingObject<Simulation>(simulationHandle);
+	LOCK(*simulation);
+	*destination = simulation->getCurrentTime();
+	PUB_END
+}
+
 Lav_PUBLIC_FUNCTION LavError Lav_simulationGetSr(LavHandle simulationHandle, int* destination) {
 	PUB_BEGIN
 	auto simulation =incomingObject<Simulation>(simulationHandle);
@@ -269,9 +399,8 @@ Lav_PUBLIC_FUNCTION LavError Lav_simulationGetSr(LavHandle simulationHandle, int
 	PUB_END
 }
 
-Lav_PUBLIC_FUNCTION LavError Lav_simulationSetOutputDevice(LavHandle simulationHandle, const char* device, int channels) {
-	PUB_BEGIN
-	auto sim = incomingObject<Simulation>(simulationHandle);
+//Device strings are "default" or an index.
+int deviceIndexFromString(const char* device) {
 	int index;
 	auto device_string = std::string(device);
 	if(device_string == "default") {
@@ -287,11 +416,26 @@ Lav_PUBLIC_FUNCTION LavError Lav_simulationSetOutputDevice(LavHandle simulationH
 		}
 		if(processed == 0) {ERROR(Lav_ERROR_NO_SUCH_DEVICE, "Identifier string is invalid.");}
 	}
+	return index;
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSetOutputDevice(LavHandle simulationHandle, const char* device, int channels) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	int index = deviceIndexFromString(device);
 	//This is threadsafe and needs to be entered properly so it can make sure we dont' deadlock in audio_io.
 	sim->setOutputDevice(index, channels);
 	PUB_END
 }
 
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSetOutputDeviceWithLatency(LavHandle simulationHandle, const char* device, int channels, double minLatency, double startLatency, double maxLatency) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	int index = deviceIndexFromString(device);
+	sim->setOutputDevice(index, channels, minLatency, startLatency, maxLatency);
+	PUB_END
+}
+
 Lav_PUBLIC_FUNCTION LavError Lav_simulationClearOutputDevice(LavHandle simulationHandle) {
 	PUB_BEGIN
 	auto sim = incomingObject<Simulation>(simulationHandle);
@@ -300,6 +444,53 @@ Lav_PUBLIC_FUNCTION LavError Lav_simulationClearOutputDevice(LavHandle simulatio
 	PUB_END
 }
 
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetLatencyStatistics(LavHandle simulationHandle, double* destinationLatency, int* destinationLatencyBlocks, double* destinationMinLatency, double* destinationMaxLatency, int* destinationUnderruns, int* destinationCallbacks) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	auto stats = sim->snapshotLatencyStatistics();
+	*destinationLatency = stats.predicted_latency;
+	//Whole blocks of the simulation, rounding up, since a partial block still has to be computed.
+	*destinationLatencyBlocks = (int)ceil(stats.predicted_latency*sim->getSr()/sim->getBlockSize());
+	*destinationMinLatency = stats.min_latency;
+	*destinationMaxLatency = stats.max_latency;
+	*destinationUnderruns = stats.underruns;
+	*destinationCallbacks = (int)stats.callback_times.size();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetCallbackTime(LavHandle simulationHandle, int index, double* destination) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	*destination = sim->getLatencySnapshotCallbackTime(index);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSetPropertyQueueEnabled(LavHandle simulationHandle, int enabled) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	sim->setPropertyQueueEnabled(enabled != 0);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetPropertyQueueEnabled(LavHandle simulationHandle, int* destination) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	*destination = sim->isPropertyQueueEnabled();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetPropertyQueueStatistics(LavHandle simulationHandle, int* destinationQueued, int* destinationApplied, int* destinationRejected) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	*destinationQueued = (int)sim->getQueuedPropertyWrites();
+	*destinationApplied = (int)sim->getAppliedPropertyWrites();
+	*destinationRejected = (int)sim->getRejectedPropertyWrites();
+	PUB_END
+}
+
 Lav_PUBLIC_FUNCTION LavError Lav_simulationLock(LavHandle simulationHandle) {
 	PUB_BEGIN
 	auto simulation = incomingObject<Simulation>(simulationHandle);
@@ -330,7 +521,7 @@ Lav_PUBLIC_FUNCTION LavError Lav_simulationWriteFile(LavHandle simulationHandle,
 
 Lav_PUBLIC_FUNCTION LavError Lav_simulationSetThreads(LavHandle simulationHandle, int threads) {
 	PUB_BEGIN
-	if(threads < 1) ERROR(Lav_ERROR_RANGE, "Cannot run simulation with less than one thread.");
+	if(threads < 0) ERROR(Lav_ERROR_RANGE, "Thread count must be 0 for automatic, or at least 1.");
 	auto sim = incomingObject<Simulation>(simulationHandle);
 	LOCK(*sim);
 	sim->setThreads(threads);
@@ -345,6 +536,153 @@ Lav_PUBLIC_FUNCTION LavError Lav_simulationGetThreads(LavHandle simulationHandle
 	PUB_END
 }
 
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetPlannerStatistics(LavHandle simulationHandle, int* destinationTicks, int* destinationReplans, int* destinationBins, int* destinationCulledJobs, int* destinationThreads, double* destinationTime, double* destinationBarrierWaitTime) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	auto &stats = sim->getPlanner()->getStatistics();
+	*destinationTicks = stats.ticks;
+	*destinationReplans = stats.replans;
+	*destinationBins = stats.bins.size();
+	*destinationCulledJobs = stats.culled_jobs;
+	*destinationThreads = stats.threads;
+	*destinationTime = stats.time;
+	*destinationBarrierWaitTime = stats.barrier_wait_time;
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetPlannerBinStatistics(LavHandle simulationHandle, int bin, int* destinationTicks, int* destinationJobs, double* destinationTime, double* destinationMaxTime, double* destinationBarrierWaitTime) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	auto &bins = sim->getPlanner()->getStatistics().bins;
+	if(bin < 0 || bin >= (int)bins.size()) ERROR(Lav_ERROR_RANGE, "Invalid bin index.");
+	auto &b = bins[bin];
+	*destinationTicks = b.ticks;
+	*destinationJobs = b.jobs;
+	*destinationTime = b.time;
+	*destinationMaxTime = b.max_time;
+	*destinationBarrierWaitTime = b.barrier_wait_time;
+	PUB_END
+}
+
+int* plannerHistogram(PlannerStatistics &stats, int histogram) {
+	switch(histogram) {
+		case Lav_PLANNER_HISTOGRAM_WIDTH: return stats.width_histogram;
+		case Lav_PLANNER_HISTOGRAM_TIME: return stats.bin_time_histogram;
+		case Lav_PLANNER_HISTOGRAM_BARRIER_WAIT: return stats.barrier_wait_histogram;
+		default: ERROR(Lav_ERROR_RANGE, "Invalid histogram.");
+	}
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetPlannerHistogramLength(LavHandle simulationHandle, int histogram, int* destination) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	plannerHistogram(sim->getPlanner()->getStatistics(), histogram);
+	*destination = PLANNER_HISTOGRAM_BUCKETS;
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationReadPlannerHistogram(LavHandle simulationHandle, int histogram, int index, int* destination) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	auto h = plannerHistogram(sim->getPlanner()->getStatistics(), histogram);
+	if(index < 0 || index >= PLANNER_HISTOGRAM_BUCKETS) ERROR(Lav_ERROR_RANGE, "Invalid histogram bucket.");
+	*destination = h[index];
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationResetPlannerStatistics(LavHandle simulationHandle) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	sim->getPlanner()->resetStatistics();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSetProfiling(LavHandle simulationHandle, int profiling) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	sim->setProfiling(profiling != 0);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetProfiling(LavHandle simulationHandle, int* destination) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	*destination = sim->isProfiling();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationResetProfile(LavHandle simulationHandle) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	sim->resetProfile();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSetSilenceSkipping(LavHandle simulationHandle, int skipping) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	sim->setSilenceSkipping(skipping != 0);
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetSilenceSkipping(LavHandle simulationHandle, int* destination) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	*destination = sim->getSilenceSkipping();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetSilenceStatistics(LavHandle simulationHandle, int* destinationSkipped, int* destinationProcessed) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	int64_t skipped, processed;
+	sim->getSilenceStatistics(skipped, processed);
+	*destinationSkipped = (int)skipped;
+	*destinationProcessed = (int)processed;
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationResetSilenceStatistics(LavHandle simulationHandle) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	sim->resetSilenceStatistics();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationSnapshotProfile(LavHandle simulationHandle, int* destination) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	*destination = sim->snapshotProfile();
+	PUB_END
+}
+
+Lav_PUBLIC_FUNCTION LavError Lav_simulationGetProfileEntry(LavHandle simulationHandle, int index, LavHandle* destinationNode, int* destinationCalls, int* destinationCulled, double* destinationTotalTime, double* destinationMaxTime) {
+	PUB_BEGIN
+	auto sim = incomingObject<Simulation>(simulationHandle);
+	LOCK(*sim);
+	auto entry = sim->getProfileSnapshotEntry(index);
+	auto &profile = std::get<1>(entry);
+	*destinationNode = outgoingObject(std::get<0>(entry));
+	*destinationCalls = (int)profile.calls;
+	*destinationCulled = (int)profile.culled;
+	*destinationTotalTime = profile.total_time/1e9;
+	*destinationMaxTime = profile.max_time/1e9;
+	PUB_END
+}
+
 Lav_PUBLIC_FUNCTION LavError Lav_simulationCallIn(LavHandle simulationHandle, double when, int inAudioThread, LavTimeCallback cb, void* userdata) {
 	PUB_BEGIN
 	auto sim = incomingObject<Simulation>(simulationHandle);